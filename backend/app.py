@@ -4,8 +4,10 @@ from logging.handlers import RotatingFileHandler
 from flask import Flask, jsonify
 
 from extensions import db, migrate, cors
-from config import config
-from views import register_view_creation
+from config import Config, config
+from views import register_legacy_view_cleanup
+from commands import register_commands
+from services.api_cache import init_api_cache
 
 
 def setup_logging(app):
@@ -43,6 +45,7 @@ def register_blueprints(app):
         years_bp,
         constructors_bp,
         ai_bp,
+        seasons_bp,
     )
 
     app.register_blueprint(drivers_bp, url_prefix="/api/drivers")
@@ -52,6 +55,7 @@ def register_blueprints(app):
     app.register_blueprint(years_bp, url_prefix="/api/years")
     app.register_blueprint(constructors_bp, url_prefix="/api/constructors")
     app.register_blueprint(ai_bp, url_prefix="/api/ai")
+    app.register_blueprint(seasons_bp, url_prefix="/api/seasons")
 
 
 def create_app(config_data=None):
@@ -59,6 +63,10 @@ def create_app(config_data=None):
     app = Flask(__name__)
 
     if config_data and isinstance(config_data, dict):
+        # Settings left out of the mapping keep their defaults from config.py
+        app.config.from_object(
+            config["testing"] if config_data.get("TESTING") else Config
+        )
         app.config.from_mapping(config_data)
     else:
         config_name = config_data or os.environ.get("FLASK_ENV", "default")
@@ -81,8 +89,14 @@ def create_app(config_data=None):
     # Register blueprints
     register_blueprints(app)
 
-    # Register view creation event listener
-    register_view_creation(app)
+    # Cache read-only API responses until the next sync
+    init_api_cache(app)
+
+    # Drop the standings views of older databases before creating tables
+    register_legacy_view_cleanup(app)
+
+    # Register CLI commands
+    register_commands(app)
 
     @app.route("/")
     def home():
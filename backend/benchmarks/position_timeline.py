@@ -0,0 +1,104 @@
+"""
+Micro-benchmark for reading a driver session's position timeline.
+
+Compares loading Position rows through the ORM against decoding the packed
+PositionTimeline, and reports the stored size of each. Run from the backend
+directory:
+
+    python -m benchmarks.position_timeline --samples 20000
+"""
+
+import argparse
+import random
+import timeit
+from datetime import datetime, timedelta
+
+from app import create_app
+from extensions import db
+from models import Driver, DriverSession, Position, PositionTimeline, Session
+from services.position_timeline import build_position_timelines, decode_timeline
+from services.session_service import get_session_positions
+
+
+def seed(samples):
+    """Stores one driver session whose position changes at every sample."""
+    driver = Driver(driver_number=1, full_name="Benchmark Driver")
+    session = Session(
+        session_key=1,
+        session_name="Race",
+        session_type="Race",
+        date_start=datetime(2024, 3, 2),
+        meeting_key=1,
+        year=2024,
+    )
+    db.session.add_all([driver, session])
+    db.session.flush()
+    driver_session = DriverSession(driver_id=driver.id, session_id=session.id)
+    db.session.add(driver_session)
+    db.session.flush()
+
+    date = datetime(2024, 3, 2, 15)
+    position = 1
+    rows = []
+    for _ in range(samples):
+        date += timedelta(milliseconds=random.randint(200, 5000))
+        position = position % 20 + 1
+        rows.append(
+            {"driver_session_id": driver_session.id, "date": date, "position": position}
+        )
+    db.session.execute(db.insert(Position), rows)
+    db.session.commit()
+    return driver_session.id
+
+
+def read_rows(driver_session_id):
+    positions = (
+        Position.query.filter_by(driver_session_id=driver_session_id)
+        .order_by(Position.date)
+        .all()
+    )
+    return [p.to_dict() for p in positions]
+
+
+def read_timeline(driver_session_id):
+    timeline = PositionTimeline.query.filter_by(
+        driver_session_id=driver_session_id
+    ).first()
+    return decode_timeline(timeline)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--samples", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    app = create_app({"TESTING": True, "SQLALCHEMY_DATABASE_URI": "sqlite://"})
+    with app.app_context():
+        db.create_all()
+        driver_session_id = seed(args.samples)
+        from_rows = read_rows(driver_session_id)
+        build_position_timelines([driver_session_id])
+        assert get_session_positions(driver_session_id)["positions"] == from_rows
+
+        timeline = PositionTimeline.query.one()
+        packed = len(timeline.ids) + len(timeline.offsets) + len(timeline.positions)
+        # id, driver_session_id, date text and position per Position row
+        row_bytes = sum(8 + 8 + len(str(p["date"])) + 8 for p in from_rows)
+        print(f"{args.samples:,} samples")
+        print(f"size        rows ~{row_bytes:,} B  timeline {packed:,} B")
+
+        results = {}
+        for name, func in (("rows", read_rows), ("timeline", read_timeline)):
+            best = min(
+                timeit.repeat(
+                    lambda: func(driver_session_id), number=1, repeat=args.repeat
+                )
+            )
+            results[name] = best
+            print(f"{name:<11} {best * 1000:8.1f} ms")
+        print(f"speedup     {results['rows'] / results['timeline']:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Micro-benchmark for decoding OpenF1 position timestamps.
+
+Compares the original per-record parse against TimestampDecoder on a
+synthetic window shaped like real position data, where every driver reports
+at the same instants. Run from the backend directory:
+
+    python -m benchmarks.timestamps --drivers 20 --samples 4000
+"""
+
+import argparse
+import timeit
+from datetime import datetime, timedelta, timezone
+
+from services.sync_service import make_aware
+from services.timestamps import TimestampDecoder
+
+
+def make_window(drivers, samples):
+    """Returns position-style timestamp strings, one per driver per sample."""
+    start = datetime(2024, 3, 2, 15, 0, tzinfo=timezone.utc)
+    instants = [
+        (start + timedelta(milliseconds=250 * i)).isoformat().replace("+00:00", "Z")
+        for i in range(samples)
+    ]
+    return [instant for instant in instants for _ in range(drivers)]
+
+
+def decode_per_record(values):
+    """The per-record path the ingest loop used before TimestampDecoder."""
+    return [
+        make_aware(datetime.fromisoformat(value.replace("Z", "+00:00")))
+        for value in values
+    ]
+
+
+def decode_batched(values):
+    return TimestampDecoder().decode_many(values)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--drivers", type=int, default=20)
+    parser.add_argument("--samples", type=int, default=4000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    values = make_window(args.drivers, args.samples)
+    assert decode_per_record(values) == decode_batched(values)
+
+    print(f"{len(values):,} timestamps, {args.samples:,} distinct")
+    results = {}
+    for name, func in (("per-record", decode_per_record), ("batched", decode_batched)):
+        best = min(timeit.repeat(lambda: func(values), number=1, repeat=args.repeat))
+        results[name] = best
+        print(f"{name:<11} {best * 1000:8.1f} ms  {len(values) / best:>12,.0f} /sec")
+    print(f"speedup     {results['per-record'] / results['batched']:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
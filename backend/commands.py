@@ -0,0 +1,273 @@
+"""Flask CLI commands"""
+
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy import event
+
+from extensions import db
+from models import DriverSession, Session, YearData
+from services.api_cache import invalidate_year
+from services.bundle_service import store_season_bundle
+from services.export_service import export_encodings, export_static
+from services.overview_service import (
+    refresh_all_season_summaries,
+    refresh_season_summary,
+)
+from services.position_timeline import build_position_timelines
+from services.rate_limiter import SharedTokenBucket
+from services.standings_service import refresh_all_standings, refresh_standings
+from services.results_service import derive_session_results, sessions_for_year
+from services.sync_service import (
+    compact_positions,
+    refresh_sessions,
+    run_sync_for_year,
+)
+
+f1_cli = AppGroup("f1", help="F1 data management commands.")
+
+# Seconds a backfill worker waits on a locked SQLite database
+SQLITE_BUSY_TIMEOUT_MS = 60000
+
+# Flask app owned by the current backfill worker process
+_worker_app = None
+
+
+def _init_backfill_worker(config_name, bucket, write_lock, max_in_flight):
+    """
+    Creates a Flask app in a backfill worker process and hands it the
+    shared request budget and database write lock.
+    """
+    global _worker_app
+    from app import create_app
+
+    _worker_app = create_app(config_name)
+    _worker_app.config["OPENF1_SHARED_BUCKET"] = bucket
+    _worker_app.config["OPENF1_MAX_IN_FLIGHT"] = max_in_flight
+    _worker_app.config["SYNC_DB_WRITE_LOCK"] = write_lock
+
+    with _worker_app.app_context():
+        if db.engine.dialect.name == "sqlite":
+
+            @event.listens_for(db.engine, "connect")
+            def _set_busy_timeout(dbapi_connection, connection_record):
+                cursor = dbapi_connection.cursor()
+                cursor.execute(f"PRAGMA busy_timeout = {SQLITE_BUSY_TIMEOUT_MS}")
+                cursor.close()
+
+
+def _backfill_year(year):
+    """Runs one season's sync in a worker process and times it."""
+    started = time.perf_counter()
+    with _worker_app.app_context():
+        try:
+            result = asyncio.run(run_sync_for_year(year))
+            return {
+                "year": year,
+                "status": result.get("status", "completed"),
+                "seconds": time.perf_counter() - started,
+                "rows": result.get("rows", {}),
+            }
+        except Exception as e:
+            return {
+                "year": year,
+                "status": "error",
+                "seconds": time.perf_counter() - started,
+                "error": str(e),
+            }
+
+
+def _invalidate(year=None):
+    """
+    Marks the data of a season, or of every season when no year is given,
+    as changed, so running servers stop serving what they built from it.
+    """
+    if year:
+        years = [year]
+    else:
+        years = [synced for (synced,) in db.session.query(YearData.year)]
+    for changed_year in years:
+        invalidate_year(changed_year)
+    if not years:
+        invalidate_year()
+
+
+def _format_summary_line(summary):
+    rows = summary.get("rows", {})
+    positions = rows.get("positions", 0)
+    laps = rows.get("laps", 0)
+    seconds = summary["seconds"]
+    rate = (positions + laps) / seconds if seconds > 0 else 0
+    line = (
+        f"{summary['year']}  {summary['status']:<9}  {seconds:8.1f}s  "
+        f"{positions:>9} positions  {laps:>7} laps  {rate:>9,.0f} rows/sec"
+    )
+    if summary.get("error"):
+        line += f"  ({summary['error']})"
+    return line
+
+
+@f1_cli.command("backfill")
+@click.option("--from", "from_year", type=int, required=True, help="First season.")
+@click.option("--to", "to_year", type=int, required=True, help="Last season.")
+@click.option(
+    "--workers", type=int, default=2, show_default=True, help="Worker processes."
+)
+def backfill_command(from_year, to_year, workers):
+    """Sync every season in a range using a pool of worker processes."""
+    if from_year > to_year:
+        raise click.BadParameter("--from must not be after --to")
+    if workers < 1:
+        raise click.BadParameter("--workers must be at least 1")
+
+    years = list(range(from_year, to_year + 1))
+    workers = min(workers, len(years))
+    config = current_app.config
+    ctx = multiprocessing.get_context("spawn")
+
+    # One request budget and one write lock shared by every worker
+    bucket = SharedTokenBucket(config["OPENF1_REQUESTS_PER_SECOND"], ctx=ctx)
+    write_lock = ctx.Lock()
+    max_in_flight = max(1, config["OPENF1_MAX_IN_FLIGHT"] // workers)
+    config_name = os.environ.get("FLASK_ENV", "default")
+
+    click.echo(f"Backfilling {from_year}-{to_year} with {workers} workers...")
+    started = time.perf_counter()
+    summaries = []
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=ctx,
+        initializer=_init_backfill_worker,
+        initargs=(config_name, bucket, write_lock, max_in_flight),
+    ) as executor:
+        futures = [executor.submit(_backfill_year, year) for year in years]
+        for future in as_completed(futures):
+            summary = future.result()
+            summaries.append(summary)
+            click.echo(_format_summary_line(summary))
+
+    click.echo("")
+    click.echo("Summary:")
+    for summary in sorted(summaries, key=lambda s: s["year"]):
+        click.echo(_format_summary_line(summary))
+    failed = [s["year"] for s in summaries if s["status"] != "completed"]
+    click.echo(f"Finished in {time.perf_counter() - started:.1f}s")
+    if failed:
+        raise click.ClickException(f"Sync failed for: {', '.join(map(str, failed))}")
+
+
+@f1_cli.command("derive-results")
+@click.option("--year", type=int, required=True, help="Season to derive.")
+def derive_results_command(year):
+    """
+    Re-derive final positions and fastest laps for a whole season, then
+    the standings and season bundle built from them.
+    """
+    derived = derive_session_results(sessions_for_year(year))
+    drivers = refresh_standings(year)
+    _invalidate(year)
+    store_season_bundle(year)
+    click.echo(f"Derived results for {derived} sessions in {year}")
+    click.echo(f"{year}: {drivers} drivers in the standings")
+
+
+@f1_cli.command("compact-positions")
+@click.option("--year", type=int, help="Only compact this season.")
+def compact_positions_command(year):
+    """Drop stored position samples that repeat the previous position."""
+    before, after = compact_positions(year)
+    _invalidate(year)
+    removed = before - after
+    share = removed / before * 100 if before else 0
+    scope = f" for {year}" if year else ""
+    click.echo(f"Position rows{scope}: {before:,} before, {after:,} after")
+    click.echo(f"Removed {removed:,} rows ({share:.1f}%)")
+
+
+@f1_cli.command("build-timelines")
+@click.option("--year", type=int, help="Only rebuild this season.")
+def build_timelines_command(year):
+    """Rebuild the packed position timelines from stored positions."""
+    query = db.session.query(DriverSession.id)
+    if year:
+        query = query.join(Session).filter(Session.year == year)
+    built = build_position_timelines(ds_id for (ds_id,) in query)
+    _invalidate(year)
+    click.echo(f"Built {built} position timelines")
+
+
+@f1_cli.command("refresh-standings")
+@click.option("--year", type=int, help="Only refresh this season.")
+def refresh_standings_command(year):
+    """Rebuild the materialized standings tables."""
+    refreshed = {year: refresh_standings(year)} if year else refresh_all_standings()
+    _invalidate(year)
+    for refreshed_year, drivers in refreshed.items():
+        click.echo(f"{refreshed_year}: {drivers} drivers in the standings")
+
+
+@f1_cli.command("refresh-overview")
+@click.option("--year", type=int, help="Only refresh this season.")
+def refresh_overview_command(year):
+    """Rebuild the stored overview summaries and season counts."""
+    if year:
+        refreshed = {year: refresh_season_summary(year)}
+    else:
+        refreshed = refresh_all_season_summaries()
+    _invalidate(year)
+    for refreshed_year, summary in refreshed.items():
+        click.echo(
+            f"{refreshed_year}: {summary['total_sessions']} sessions, "
+            f"{summary['total_drivers']} drivers"
+        )
+
+
+@f1_cli.command("refresh-sessions")
+@click.option("--year", type=int, help="Only refresh this season.")
+def refresh_sessions_command(year):
+    """Re-fetch session details, such as end times, from OpenF1."""
+    if year:
+        years = [year]
+    else:
+        synced = YearData.query.filter(YearData.last_synced.isnot(None))
+        years = [year_data.year for year_data in synced.order_by(YearData.year)]
+    for refreshed_year in years:
+        counts = asyncio.run(refresh_sessions(refreshed_year))
+        _invalidate(refreshed_year)
+        click.echo(
+            f"{refreshed_year}: {counts['updated']} sessions updated, "
+            f"{counts['inserted']} added"
+        )
+
+
+@f1_cli.command("export-static")
+@click.argument("outdir", type=click.Path(file_okay=False))
+@click.option("--force", is_flag=True, help="Re-render every season.")
+def export_static_command(outdir, force):
+    """Pre-render the read API into static, compressed JSON files."""
+    if "br" not in export_encodings():
+        click.secho(
+            "Warning: the brotli package is not installed, so no .br copies "
+            "are written. Run `poetry install` to add it.",
+            err=True,
+            fg="yellow",
+        )
+    summary = export_static(outdir, force=force)
+    for key in ("exported", "skipped", "removed"):
+        if summary[key]:
+            click.echo(f"{key.capitalize()}: {', '.join(map(str, summary[key]))}")
+    click.echo(
+        f"Wrote {summary['files']} files to {outdir} "
+        f"({', '.join(['json', *export_encodings()])})"
+    )
+
+
+def register_commands(app):
+    """Register the f1 command group with the Flask CLI"""
+    app.cli.add_command(f1_cli)
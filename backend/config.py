@@ -14,6 +14,31 @@ class Config:
     OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
     OPENAI_MODEL = "gpt-4o"
     OPENF1_BASE_URL = "https://api.openf1.org/v1"
+    # Number of background sync jobs allowed to run at the same time
+    SYNC_JOB_WORKERS = 1
+    # Seconds without progress after which a sync left "in progress" is
+    # considered dead, e.g. after a restart, and may be resumed
+    SYNC_STALE_SECONDS = 15 * 60
+    # Max fetched windows buffered between the sync fetchers and the DB writer
+    SYNC_QUEUE_SIZE = 4
+    # Shared OpenF1 request budget used by every request in a sync
+    OPENF1_REQUESTS_PER_SECOND = 3
+    OPENF1_MAX_IN_FLIGHT = 4
+    # On-disk OpenF1 response cache: off, readwrite or replay (cache only)
+    OPENF1_CACHE_DIR = os.path.join(basedir, "instance", "openf1_cache")
+    OPENF1_CACHE_MODE = os.environ.get("OPENF1_CACHE_MODE", "readwrite")
+    # Per-endpoint TTLs (seconds) for the current season; past seasons never expire
+    OPENF1_CACHE_TTL = {"sessions": 3600, "drivers": 3600, "position": 300, "laps": 300}
+    # Position ingest: "changes" keeps only samples where a driver's position
+    # changes, "full" keeps every sample
+    POSITION_STORAGE_MODE = os.environ.get("POSITION_STORAGE_MODE", "changes")
+    # Cache of read-only API responses and service results, invalidated per
+    # season by sync. "memory" is per process; "sqlite" shares one cache file
+    # between every worker process on the host
+    API_CACHE_ENABLED = True
+    API_CACHE_BACKEND = os.environ.get("API_CACHE_BACKEND", "memory")
+    API_CACHE_PATH = os.path.join(basedir, "instance", "api_cache.sqlite3")
+    API_CACHE_MAX_BYTES = 64 * 1024 * 1024
 
     @staticmethod
     def init_app(app):
@@ -36,6 +61,7 @@ class TestingConfig(Config):
     # Use in-memory database for tests
     SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
     WTF_CSRF_ENABLED = False  # Disable CSRF forms in testing
+    API_CACHE_ENABLED = False  # Tests opt in to the API cache
 
 
 class ProductionConfig(Config):
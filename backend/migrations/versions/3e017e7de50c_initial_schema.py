@@ -0,0 +1,268 @@
+"""Initial schema
+
+Revision ID: 3e017e7de50c
+Revises:
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "3e017e7de50c"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# Databases created before migrations were added came from db.create_all,
+# with the standings as views. Tables and indexes they already have are
+# left alone, and the views are replaced by the standings tables.
+LEGACY_VIEWS = ("constructor_stats", "driver_stats", "driver_session_stats")
+
+INDEXES = (
+    ("ix_session_year_date_start", "session", ["year", "date_start"]),
+    ("ix_session_date_start", "session", ["date_start"]),
+    ("ix_driver_session_session_driver", "driver_session", ["session_id", "driver_id"]),
+    ("ix_constructor_stats_year_position", "constructor_stats", ["year", "position"]),
+    ("ix_driver_stats_year_position", "driver_stats", ["year", "position"]),
+    (
+        "ix_driver_session_stats_driver_year",
+        "driver_session_stats",
+        ["driver_number", "year"],
+    ),
+)
+
+
+def upgrade():
+    views = set(sa.inspect(op.get_bind()).get_view_names())
+    for name in LEGACY_VIEWS:
+        if name in views:
+            op.execute(f"DROP VIEW {name}")
+
+    op.create_table(
+        "driver",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("driver_number", sa.Integer(), nullable=False),
+        sa.Column("full_name", sa.String(length=100), nullable=False),
+        sa.Column("team_name", sa.String(length=50), nullable=True),
+        sa.Column("team_colour", sa.String(length=7), nullable=True),
+        sa.Column("country_code", sa.String(length=3), nullable=True),
+        sa.Column("headshot_url", sa.String(length=255), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("driver_number"),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "session",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("session_key", sa.Integer(), nullable=False),
+        sa.Column("session_name", sa.String(length=50), nullable=False),
+        sa.Column("date_start", sa.DateTime(), nullable=False),
+        sa.Column("date_end", sa.DateTime(), nullable=True),
+        sa.Column("gmt_offset", sa.String(length=10), nullable=True),
+        sa.Column("session_type", sa.String(length=20), nullable=False),
+        sa.Column("meeting_key", sa.Integer(), nullable=False),
+        sa.Column("location", sa.String(length=100), nullable=True),
+        sa.Column("country_name", sa.String(length=50), nullable=True),
+        sa.Column("circuit_short_name", sa.String(length=50), nullable=True),
+        sa.Column("year", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("session_key"),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "driver_session",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("driver_id", sa.Integer(), nullable=False),
+        sa.Column("session_id", sa.Integer(), nullable=False),
+        sa.Column("final_position", sa.Integer(), nullable=True),
+        sa.Column("fastest_lap", sa.Boolean(), nullable=True),
+        sa.ForeignKeyConstraint(["driver_id"], ["driver.id"]),
+        sa.ForeignKeyConstraint(["session_id"], ["session.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("driver_id", "session_id"),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "position",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("driver_session_id", sa.Integer(), nullable=False),
+        sa.Column("date", sa.DateTime(), nullable=False),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["driver_session_id"], ["driver_session.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "lap",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("driver_session_id", sa.Integer(), nullable=False),
+        sa.Column("lap_number", sa.Integer(), nullable=False),
+        sa.Column("lap_time", sa.Float(), nullable=True),
+        sa.Column("lap_time_string", sa.String(length=20), nullable=True),
+        sa.Column("is_fastest", sa.Boolean(), nullable=True),
+        sa.ForeignKeyConstraint(["driver_session_id"], ["driver_session.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("driver_session_id", "lap_number"),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "position_timeline",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("driver_session_id", sa.Integer(), nullable=False),
+        sa.Column("start_ms", sa.BigInteger(), nullable=False),
+        sa.Column("sample_count", sa.Integer(), nullable=False),
+        sa.Column("ids", sa.LargeBinary(), nullable=False),
+        sa.Column("offsets", sa.LargeBinary(), nullable=False),
+        sa.Column("positions", sa.LargeBinary(), nullable=False),
+        sa.ForeignKeyConstraint(["driver_session_id"], ["driver_session.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("driver_session_id"),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "year_data",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("year", sa.Integer(), nullable=False),
+        sa.Column("sync_status", sa.String(length=20), nullable=True),
+        sa.Column("sync_progress", sa.Integer(), nullable=True),
+        sa.Column("sync_message", sa.String(length=200), nullable=True),
+        sa.Column("last_synced", sa.DateTime(), nullable=True),
+        sa.Column("last_incremental_sync", sa.DateTime(), nullable=True),
+        sa.Column("drivers_count", sa.Integer(), nullable=True),
+        sa.Column("sessions_count", sa.Integer(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("year"),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "sync_checkpoint",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("year", sa.Integer(), nullable=False),
+        sa.Column("endpoint", sa.String(length=20), nullable=False),
+        sa.Column("window_start", sa.DateTime(), nullable=False),
+        sa.Column("window_end", sa.DateTime(), nullable=False),
+        sa.Column("row_count", sa.Integer(), nullable=True),
+        sa.Column("payload_hash", sa.String(length=64), nullable=True),
+        sa.Column("completed_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("year", "endpoint", "window_start", "window_end"),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "sync_job",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("year", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=True),
+        sa.Column("phase", sa.String(length=100), nullable=True),
+        sa.Column("progress", sa.Integer(), nullable=True),
+        sa.Column("message", sa.String(length=200), nullable=True),
+        sa.Column("row_counts", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "season_summary",
+        sa.Column("year", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("total_drivers", sa.Integer(), nullable=False),
+        sa.Column("active_drivers", sa.Integer(), nullable=False),
+        sa.Column("total_sessions", sa.Integer(), nullable=False),
+        sa.Column("latest_session_name", sa.String(length=50), nullable=True),
+        sa.Column("latest_session_location", sa.String(length=100), nullable=True),
+        sa.Column("latest_session_date", sa.DateTime(), nullable=True),
+        sa.Column("refreshed_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("year"),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "season_bundle",
+        sa.Column("year", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("etag", sa.String(length=40), nullable=False),
+        sa.Column("content", sa.LargeBinary(), nullable=False),
+        sa.Column("size", sa.Integer(), nullable=False),
+        sa.Column("built_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("year"),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "constructor_stats",
+        sa.Column("team_name", sa.String(length=50), nullable=False),
+        sa.Column("team_colour", sa.String(length=7), nullable=True),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.Column("points", sa.Integer(), nullable=True),
+        sa.Column("podiums", sa.Integer(), nullable=True),
+        sa.Column("wins", sa.Integer(), nullable=True),
+        sa.Column("fastest_laps", sa.Integer(), nullable=True),
+        sa.Column("races", sa.Integer(), nullable=True),
+        sa.Column("year", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("team_name", "year"),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "driver_stats",
+        sa.Column("driver_number", sa.Integer(), nullable=False),
+        sa.Column("full_name", sa.String(length=100), nullable=False),
+        sa.Column("team_name", sa.String(length=50), nullable=True),
+        sa.Column("team_colour", sa.String(length=7), nullable=True),
+        sa.Column("races", sa.Integer(), nullable=True),
+        sa.Column("country_code", sa.String(length=3), nullable=True),
+        sa.Column("headshot_url", sa.String(length=255), nullable=True),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.Column("podiums", sa.Integer(), nullable=True),
+        sa.Column("wins", sa.Integer(), nullable=True),
+        sa.Column("fastest_laps", sa.Integer(), nullable=True),
+        sa.Column("points", sa.Integer(), nullable=True),
+        sa.Column("average_position", sa.Float(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("year", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("driver_number", "year"),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "driver_session_stats",
+        sa.Column("driver_number", sa.Integer(), nullable=False),
+        sa.Column("full_name", sa.String(length=100), nullable=False),
+        sa.Column("team_name", sa.String(length=50), nullable=True),
+        sa.Column("session_name", sa.String(length=50), nullable=False),
+        sa.Column("session_type", sa.String(length=20), nullable=False),
+        sa.Column("location", sa.String(length=100), nullable=True),
+        sa.Column("date_start", sa.DateTime(), nullable=False),
+        sa.Column("final_position", sa.Integer(), nullable=True),
+        sa.Column("fastest_lap", sa.Boolean(), nullable=True),
+        sa.Column("points", sa.Integer(), nullable=True),
+        sa.Column("year", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint(
+            "driver_number", "session_name", "session_type", "date_start", "year"
+        ),
+        if_not_exists=True,
+    )
+
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
+    for table in (
+        "driver_session_stats",
+        "driver_stats",
+        "constructor_stats",
+        "season_bundle",
+        "season_summary",
+        "sync_job",
+        "sync_checkpoint",
+        "year_data",
+        "position_timeline",
+        "lap",
+        "position",
+        "driver_session",
+        "session",
+        "driver",
+    ):
+        op.drop_table(table)
@@ -0,0 +1,46 @@
+"""Remove duplicate position samples and make them unique
+
+Revision ID: 7c4d2e9a1b05
+Revises: 3e017e7de50c
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "7c4d2e9a1b05"
+down_revision = "3e017e7de50c"
+branch_labels = None
+depends_on = None
+
+# Databases synced before the key existed stored each sample again on every
+# resync. The earliest copy of each (driver_session_id, date) is kept.
+DUPLICATES = """
+    SELECT driver_session_id FROM position
+    GROUP BY driver_session_id, date
+    HAVING COUNT(*) > 1
+"""
+
+
+def upgrade():
+    # Timelines may point at removed copies; driver sessions without one
+    # are read from their position rows until `flask f1 build-timelines`
+    op.execute(
+        f"DELETE FROM position_timeline WHERE driver_session_id IN ({DUPLICATES})"
+    )
+    op.execute(
+        "DELETE FROM position WHERE id NOT IN "
+        "(SELECT MIN(id) FROM position GROUP BY driver_session_id, date)"
+    )
+    op.create_index(
+        "uq_position_driver_session_date",
+        "position",
+        ["driver_session_id", "date"],
+        unique=True,
+        if_not_exists=True,
+    )
+
+
+def downgrade():
+    op.drop_index("uq_position_driver_session_date", table_name="position")
@@ -0,0 +1,36 @@
+"""Add a data generation to each season
+
+Revision ID: 9b1f3c6e2a47
+Revises: 7c4d2e9a1b05
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "9b1f3c6e2a47"
+down_revision = "7c4d2e9a1b05"
+branch_labels = None
+depends_on = None
+
+COLUMNS = (
+    sa.Column("data_generation", sa.Integer(), nullable=False, server_default="0"),
+    sa.Column("data_changed_at", sa.DateTime(), nullable=True),
+)
+
+
+def upgrade():
+    # Databases created by db.create_all may already have the columns
+    columns = sa.inspect(op.get_bind()).get_columns("year_data")
+    existing = {column["name"] for column in columns}
+    for column in COLUMNS:
+        if column.name not in existing:
+            op.add_column("year_data", column)
+
+
+def downgrade():
+    with op.batch_alter_table("year_data") as batch_op:
+        for column in reversed(COLUMNS):
+            batch_op.drop_column(column.name)
@@ -0,0 +1,29 @@
+"""Record the data version each season bundle was built from
+
+Revision ID: c5e8a1d4f203
+Revises: 9b1f3c6e2a47
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "c5e8a1d4f203"
+down_revision = "9b1f3c6e2a47"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Databases created by db.create_all may already have the column. Bundles
+    # stored without a version are rebuilt on their next request.
+    columns = sa.inspect(op.get_bind()).get_columns("season_bundle")
+    if "data_version" not in {column["name"] for column in columns}:
+        op.add_column("season_bundle", sa.Column("data_version", sa.String(length=40)))
+
+
+def downgrade():
+    with op.batch_alter_table("season_bundle") as batch_op:
+        batch_op.drop_column("data_version")
@@ -0,0 +1,29 @@
+"""Add a sync heartbeat to each season
+
+Revision ID: d7b3e9f1a6c2
+Revises: c5e8a1d4f203
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "d7b3e9f1a6c2"
+down_revision = "c5e8a1d4f203"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Databases created by db.create_all may already have the column. Syncs
+    # left in progress without a heartbeat are treated as interrupted.
+    columns = sa.inspect(op.get_bind()).get_columns("year_data")
+    if "sync_heartbeat" not in {column["name"] for column in columns}:
+        op.add_column("year_data", sa.Column("sync_heartbeat", sa.DateTime()))
+
+
+def downgrade():
+    with op.batch_alter_table("year_data") as batch_op:
+        batch_op.drop_column("sync_heartbeat")
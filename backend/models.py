@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from extensions import db
 
 
@@ -46,6 +48,11 @@ class Session(db.Model):
         "DriverSession", back_populates="session", cascade="all, delete-orphan"
     )
 
+    __table_args__ = (
+        db.Index("ix_session_year_date_start", "year", "date_start"),
+        db.Index("ix_session_date_start", "date_start"),
+    )
+
     def to_dict(self):
         return {
             "id": self.id,
@@ -78,8 +85,17 @@ class DriverSession(db.Model):
     laps = db.relationship(
         "Lap", back_populates="driver_session", cascade="all, delete-orphan"
     )
+    position_timeline = db.relationship(
+        "PositionTimeline",
+        back_populates="driver_session",
+        uselist=False,
+        cascade="all, delete-orphan",
+    )
 
-    __table_args__ = (db.UniqueConstraint("driver_id", "session_id"),)
+    __table_args__ = (
+        db.UniqueConstraint("driver_id", "session_id"),
+        db.Index("ix_driver_session_session_driver", "session_id", "driver_id"),
+    )
 
     def to_dict(self):
         return {
@@ -101,6 +117,13 @@ class Position(db.Model):
 
     driver_session = db.relationship("DriverSession", back_populates="positions")
 
+    # Created by its own migration, which first removes duplicate samples
+    __table_args__ = (
+        db.Index(
+            "uq_position_driver_session_date", "driver_session_id", "date", unique=True
+        ),
+    )
+
     def to_dict(self):
         return {
             "id": self.id,
@@ -125,6 +148,30 @@ class Lap(db.Model):
     __table_args__ = (db.UniqueConstraint("driver_session_id", "lap_number"),)
 
 
+class PositionTimeline(db.Model):
+    """
+    A driver session's position changes packed into little-endian arrays:
+    position ids as uint32, millisecond offsets from the previous sample
+    as uint32 and positions as uint8.
+    """
+
+    __tablename__ = "position_timeline"
+
+    id = db.Column(db.Integer, primary_key=True)
+    driver_session_id = db.Column(
+        db.Integer, db.ForeignKey("driver_session.id"), unique=True, nullable=False
+    )
+    start_ms = db.Column(db.BigInteger, nullable=False)
+    sample_count = db.Column(db.Integer, nullable=False)
+    ids = db.Column(db.LargeBinary, nullable=False)
+    offsets = db.Column(db.LargeBinary, nullable=False)
+    positions = db.Column(db.LargeBinary, nullable=False)
+
+    driver_session = db.relationship(
+        "DriverSession", back_populates="position_timeline"
+    )
+
+
 class YearData(db.Model):
     __tablename__ = "year_data"
 
@@ -135,10 +182,18 @@ class YearData(db.Model):
     )  # not_started, in_progress, completed, error, incomplete
     sync_progress = db.Column(db.Integer, default=0)
     sync_message = db.Column(db.String(200))
+    # Refreshed while a sync runs, so one left in progress by a dead process
+    # can be told apart from a live one
+    sync_heartbeat = db.Column(db.DateTime)
     last_synced = db.Column(db.DateTime)
     last_incremental_sync = db.Column(db.DateTime)
     drivers_count = db.Column(db.Integer)
     sessions_count = db.Column(db.Integer)
+    # Bumped, with the time, whenever the served data of the season changes
+    data_generation = db.Column(
+        db.Integer, nullable=False, default=0, server_default="0"
+    )
+    data_changed_at = db.Column(db.DateTime)
 
     def to_dict(self):
         return {
@@ -158,9 +213,118 @@ class YearData(db.Model):
         }
 
 
+class SyncCheckpoint(db.Model):
+    __tablename__ = "sync_checkpoint"
+
+    id = db.Column(db.Integer, primary_key=True)
+    year = db.Column(db.Integer, nullable=False)
+    endpoint = db.Column(db.String(20), nullable=False)
+    window_start = db.Column(db.DateTime, nullable=False)
+    window_end = db.Column(db.DateTime, nullable=False)
+    row_count = db.Column(db.Integer, default=0)
+    payload_hash = db.Column(db.String(64))
+    completed_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.UniqueConstraint("year", "endpoint", "window_start", "window_end"),
+    )
+
+
+class SyncJob(db.Model):
+    __tablename__ = "sync_job"
+
+    id = db.Column(db.Integer, primary_key=True)
+    year = db.Column(db.Integer, nullable=False)
+    status = db.Column(
+        db.String(20), default="queued"
+    )  # queued, running, completed, error
+    phase = db.Column(db.String(100))
+    progress = db.Column(db.Integer, default=0)
+    message = db.Column(db.String(200))
+    row_counts = db.Column(db.JSON)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+
+    def to_dict(self):
+        duration = None
+        if self.started_at:
+            end = self.finished_at or datetime.utcnow()
+            duration = (end - self.started_at).total_seconds()
+        return {
+            "id": self.id,
+            "year": self.year,
+            "status": self.status,
+            "phase": self.phase,
+            "progress": self.progress,
+            "message": self.message,
+            "row_counts": self.row_counts,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "duration_seconds": duration,
+        }
+
+
+class SeasonSummary(db.Model):
+    """
+    Precomputed overview of one season, or of every season under year 0,
+    refreshed at the end of each sync.
+    """
+
+    __tablename__ = "season_summary"
+
+    year = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    total_drivers = db.Column(db.Integer, nullable=False, default=0)
+    active_drivers = db.Column(db.Integer, nullable=False, default=0)
+    total_sessions = db.Column(db.Integer, nullable=False, default=0)
+    latest_session_name = db.Column(db.String(50))
+    latest_session_location = db.Column(db.String(100))
+    latest_session_date = db.Column(db.DateTime)
+    refreshed_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def to_dict(self):
+        latest_session = None
+        if self.latest_session_name:
+            date = self.latest_session_date
+            latest_session = {
+                "name": self.latest_session_name,
+                "location": self.latest_session_location,
+                "date": date.isoformat() if date else None,
+            }
+        return {
+            "total_drivers": self.total_drivers,
+            "active_drivers": self.active_drivers,
+            "total_sessions": self.total_sessions,
+            "latest_session": latest_session,
+            "year": self.year or None,
+        }
+
+
+class SeasonBundle(db.Model):
+    """
+    Everything the dashboard loads for one season, serialized once and
+    stored gzip-compressed, so it can be served without re-encoding.
+    """
+
+    __tablename__ = "season_bundle"
+
+    year = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    etag = db.Column(db.String(40), nullable=False)
+    content = db.Column(db.LargeBinary, nullable=False)
+    size = db.Column(db.Integer, nullable=False)
+    # bundle_service.bundle_version of the data the bundle was built from
+    data_version = db.Column(db.String(40))
+    built_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
 class ConstructorStats(db.Model):
+    """Materialized constructor standings, refreshed per season after sync."""
+
     __tablename__ = "constructor_stats"
-    __table_args__ = {"info": dict(is_view=True)}
+    __table_args__ = (
+        db.Index("ix_constructor_stats_year_position", "year", "position"),
+    )
 
     team_name = db.Column(db.String(50), nullable=False, primary_key=True)
     team_colour = db.Column(db.String(7), nullable=True)
@@ -187,8 +351,10 @@ class ConstructorStats(db.Model):
 
 
 class DriverStats(db.Model):
+    """Materialized driver standings, refreshed per season after sync."""
+
     __tablename__ = "driver_stats"
-    __table_args__ = {"info": dict(is_view=True)}
+    __table_args__ = (db.Index("ix_driver_stats_year_position", "year", "position"),)
 
     driver_number = db.Column(db.Integer, nullable=False, primary_key=True)
     full_name = db.Column(db.String(100), nullable=False)
@@ -227,8 +393,12 @@ class DriverStats(db.Model):
 
 
 class DriverSessionStats(db.Model):
+    """Materialized per-session driver results, refreshed per season after sync."""
+
     __tablename__ = "driver_session_stats"
-    __table_args__ = {"info": dict(is_view=True)}
+    __table_args__ = (
+        db.Index("ix_driver_session_stats_driver_year", "driver_number", "year"),
+    )
 
     driver_number = db.Column(db.Integer, nullable=False, primary_key=True)
     full_name = db.Column(db.String(100), nullable=False)
@@ -1,6 +1,9 @@
 from flask import jsonify, request
 from . import constructors_bp
 from services import constructor_service
+from utils import add_conditional_get
+
+constructors_bp = add_conditional_get(constructors_bp)
 
 
 @constructors_bp.route("/", methods=["GET"])
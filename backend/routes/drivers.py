@@ -1,10 +1,10 @@
 from flask import jsonify, request
 
 from services import driver_service
-from utils import add_cors_headers
+from utils import add_conditional_get, add_cors_headers
 from . import drivers_bp
 
-drivers_bp = add_cors_headers(drivers_bp)
+drivers_bp = add_conditional_get(add_cors_headers(drivers_bp))
 
 
 @drivers_bp.route("/", methods=["GET"])
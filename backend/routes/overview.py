@@ -1,9 +1,9 @@
 from flask import jsonify, request
 from services import overview_service
-from utils import add_cors_headers
+from utils import add_conditional_get, add_cors_headers
 from . import overview_bp
 
-overview_bp = add_cors_headers(overview_bp)
+overview_bp = add_conditional_get(add_cors_headers(overview_bp))
 
 
 @overview_bp.route("/", methods=["GET"])
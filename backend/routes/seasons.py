@@ -0,0 +1,41 @@
+import gzip
+from datetime import timezone
+
+from flask import Response, jsonify, request
+
+from services import bundle_service
+from utils import add_cors_headers
+from . import seasons_bp
+
+seasons_bp = add_cors_headers(seasons_bp)
+
+
+@seasons_bp.route("/<int:year>/bundle", methods=["GET"])
+def get_season_bundle(year):
+    """
+    Returns the overview, drivers, constructors, sessions and years of a
+    season in one response, from bytes encoded when the season last synced.
+    """
+    try:
+        bundle = bundle_service.get_season_bundle(year)
+        if not bundle:
+            return jsonify({"error": "No data found for this season"}), 404
+
+        # The stored bytes are served as is to clients accepting gzip, so
+        # the ETag is weak: both encodings share it
+        response = Response(mimetype="application/json")
+        response.set_etag(bundle.etag, weak=True)
+        response.last_modified = bundle.built_at.replace(tzinfo=timezone.utc)
+        response.vary.add("Accept-Encoding")
+        if request.if_none_match.contains_weak(bundle.etag):
+            response.status_code = 304
+            return response
+
+        if "gzip" in request.accept_encodings:
+            response.set_data(bundle.content)
+            response.headers["Content-Encoding"] = "gzip"
+        else:
+            response.set_data(gzip.decompress(bundle.content))
+        return response
+    except Exception:
+        return jsonify({"error": "An internal error occurred"}), 500
@@ -1,8 +1,17 @@
-from flask import jsonify, request
+import json
 
-from services import session_service
+from flask import Response, jsonify, request, stream_with_context
+
+from services import replay_service, session_service
+from services.position_timeline import pack_columns
+from utils import add_conditional_get
 from . import sessions_bp
 
+sessions_bp = add_conditional_get(sessions_bp)
+
+POSITION_FORMATS = ("json", "ndjson", "columns", "binary")
+BINARY_POSITIONS_MIMETYPE = "application/vnd.f1stats.positions"
+
 
 @sessions_bp.route("/", methods=["GET"])
 def get_sessions():
@@ -17,13 +26,79 @@ def get_sessions():
 
 @sessions_bp.route("/<int:session_id>/positions", methods=["GET"])
 def get_session_positions(session_id):
-    """Get position data for a specific session."""
+    """
+    Get position data for a specific session.
+    ``?after=<date>&limit=<n>`` returns one page, with the cursor of the next
+    page in ``next_after``. ``?format=`` picks the encoding: ``json`` rows,
+    ``ndjson`` streamed rows, ``columns`` JSON arrays or ``binary``.
+    """
     try:
-        position_data = session_service.get_session_positions(session_id)
+        after = session_service.parse_position_cursor(request.args.get("after"))
+        output = request.args.get("format", "json")
+        if output not in POSITION_FORMATS:
+            raise ValueError(f"Unknown format: {output}")
+        if output == "ndjson":
+            return _stream_positions(session_id, after)
+
+        limit = None
+        if "after" in request.args or "limit" in request.args:
+            limit = request.args.get(
+                "limit", session_service.POSITIONS_PAGE_SIZE, type=int
+            )
+
+        if output in ("columns", "binary"):
+            position_data = session_service.get_session_position_columns(
+                session_id, after, limit
+            )
+        elif limit is not None:
+            position_data = session_service.get_session_positions_page(
+                session_id, after, limit
+            )
+        else:
+            position_data = session_service.get_session_positions(session_id)
         if not position_data:
             return jsonify({"error": "Session not found"}), 404
+        if output == "binary":
+            return _binary_positions(session_id, position_data)
         return jsonify(position_data)
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
     except Exception:
         return jsonify({"error": "An internal error occurred"}), 500
+
+
+@sessions_bp.route("/<int:session_key>/replay", methods=["GET"])
+def get_session_replay(session_key):
+    """
+    Get every driver's position in a session, keyed by OpenF1 session_key,
+    resampled to one frame per ``?step=`` (default ``1s``).
+    """
+    try:
+        step_ms = replay_service.parse_step(request.args.get("step"))
+        replay = replay_service.get_session_replay(session_key, step_ms)
+        if not replay:
+            return jsonify({"error": "Session not found"}), 404
+        return jsonify(replay)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception:
+        return jsonify({"error": "An internal error occurred"}), 500
+
+
+def _stream_positions(session_id, after):
+    positions = session_service.stream_session_positions(session_id, after)
+    if positions is None:
+        return jsonify({"error": "Session not found"}), 404
+    lines = (json.dumps(position) + "\n" for position in positions)
+    return Response(stream_with_context(lines), mimetype="application/x-ndjson")
+
+
+def _binary_positions(session_id, position_data):
+    columns = position_data["positions"]
+    response = Response(
+        pack_columns(session_id, columns["id"], columns["date"], columns["position"]),
+        mimetype=BINARY_POSITIONS_MIMETYPE,
+    )
+    if position_data["next_after"]:
+        response.headers["X-Next-After"] = position_data["next_after"]
+    return response
@@ -1,21 +1,38 @@
 from flask import jsonify
 from . import sync_bp
-from services.sync_service import run_sync_for_year
+from services import job_service
+from services.api_cache import clear_api_cache, invalidate_year
+from services.sync_service import clear_checkpoints
 from models import YearData, db, Lap, Session, DriverSession
+from utils import add_conditional_get
+
+# Job progress is not tracked by the season sync state, so sync responses
+# are validated by a hash of their body
+sync_bp = add_conditional_get(sync_bp, versioned=False)
 
 
 @sync_bp.route("/data/<int:year>", methods=["POST"])
-async def sync_f1_data_route(year):
+def sync_f1_data_route(year):
     """
-    Route to trigger the F1 data synchronization for a given year.
+    Route to queue the F1 data synchronization for a given year.
+    Returns the job id immediately; poll /jobs/<id> for progress.
     """
     try:
-        result = await run_sync_for_year(year)
-        return jsonify(result), 200
+        job = job_service.enqueue_sync_job(year)
+        return jsonify(job), 202
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
+@sync_bp.route("/jobs/<int:job_id>", methods=["GET"])
+def get_sync_job(job_id):
+    """Get the status, timings and row counts of a sync job"""
+    job = job_service.get_sync_job(job_id)
+    if not job:
+        return jsonify({"error": "Sync job not found"}), 404
+    return jsonify(job)
+
+
 @sync_bp.route("/status/<int:year>", methods=["GET"])
 def get_sync_status(year):
     """Get the current sync status for a year"""
@@ -39,6 +56,7 @@ def reset_database():
     try:
         db.drop_all()
         db.create_all()
+        clear_api_cache()
         return jsonify({"success": True, "message": "Database reset successfully."})
     except Exception as e:
         return jsonify({"error": f"Failed to reset database: {e}"}), 500
@@ -67,6 +85,10 @@ def clear_lap_data(year):
             year_data.last_incremental_sync = None
             db.session.commit()
 
+        # Make the next sync fetch every lap window again
+        clear_checkpoints(year, "laps")
+        invalidate_year(year)
+
         return jsonify(
             {
                 "success": True,
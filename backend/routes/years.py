@@ -1,7 +1,10 @@
 from flask import jsonify
 from services import year_service
+from utils import add_conditional_get
 from . import years_bp
 
+years_bp = add_conditional_get(years_bp)
+
 
 @years_bp.route("/", methods=["GET"])
 def get_available_years():
@@ -0,0 +1,106 @@
+import inspect
+import json
+from functools import wraps
+
+from flask import current_app, has_app_context
+
+from services.cache_backends import MemoryCacheBackend, SQLiteCacheBackend
+from services.year_service import (
+    bump_data_generation,
+    forget_data_versions,
+    get_current_data_version,
+)
+
+
+def init_api_cache(app):
+    """
+    Installs the API cache backend selected by API_CACHE_BACKEND on an
+    app, unless API_CACHE_ENABLED is off.
+    """
+    app.teardown_request(forget_data_versions)
+    if not app.config["API_CACHE_ENABLED"]:
+        return
+
+    backend = app.config["API_CACHE_BACKEND"]
+    max_bytes = app.config["API_CACHE_MAX_BYTES"]
+    if backend == "memory":
+        app.extensions["api_cache"] = MemoryCacheBackend(max_bytes)
+    elif backend == "sqlite":
+        app.extensions["api_cache"] = SQLiteCacheBackend(
+            app.config["API_CACHE_PATH"], max_bytes
+        )
+    else:
+        raise ValueError(f"Unknown API cache backend: {backend}")
+
+
+def get_api_cache():
+    """Returns the current app's cache backend, or None if it is off."""
+    if not has_app_context():
+        return None
+    return current_app.extensions.get("api_cache")
+
+
+def invalidate_year(year=None):
+    """
+    Marks a season's data as changed: its data generation is bumped, so
+    its ETags change, and the cached results built from it are dropped.
+    Without a year only the results spanning every season are.
+    """
+    if year is not None:
+        bump_data_generation(year)
+    cache = get_api_cache()
+    if cache is not None:
+        cache.bump(year)
+
+
+def clear_api_cache():
+    """Drops every cached result."""
+    cache = get_api_cache()
+    if cache is not None:
+        cache.clear()
+
+
+def _versioned(cache, key, year):
+    """
+    Appends the stored data version of a season to the keys of a cache
+    other processes cannot bump. Commands bump that version in the
+    database instead, so entries built before they changed the data stop
+    matching. It is read once per request. Shared caches are bumped
+    directly and need no read.
+    """
+    if cache.shared:
+        return key
+    return f"{key}@{get_current_data_version(year)[0]}"
+
+
+def cached_result(func):
+    """
+    Caches a service function's JSON-serializable result, keyed by the
+    function, its arguments and the data version of the season. The season
+    is taken from a ``year`` argument; functions without one are
+    invalidated by every change to any season.
+    """
+    signature = inspect.signature(func)
+    name = f"{func.__module__}.{func.__qualname__}"
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        cache = get_api_cache()
+        if cache is None:
+            return func(*args, **kwargs)
+
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        year = bound.arguments.get("year")
+        arguments = json.dumps(bound.arguments, sort_keys=True, default=str)
+        key = _versioned(cache, f"result:{name}:{arguments}", year)
+        cached = cache.get(key, year)
+        if cached is not None:
+            return json.loads(cached)
+
+        generation = cache.generation(year)
+        result = func(*args, **kwargs)
+        cache.set(key, year, json.dumps(result).encode("utf-8"), generation)
+        return result
+
+    return wrapper
@@ -0,0 +1,113 @@
+import gzip
+import hashlib
+import json
+from datetime import datetime
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import defer
+
+from extensions import db
+from models import SeasonBundle, Session, YearData
+from services import (
+    constructor_service,
+    driver_service,
+    overview_service,
+    session_service,
+    year_service,
+)
+from services.api_cache import cached_result
+
+# gzip level used for stored bundles; they are compressed once per sync
+BUNDLE_COMPRESSION_LEVEL = 9
+
+
+def build_season_bundle(year):
+    """
+    Collects the overview, driver and constructor standings, sessions and
+    years of a season, as their own endpoints return them.
+    """
+    return {
+        "year": year,
+        "overview": overview_service.get_stats_summary(year),
+        "drivers": driver_service.get_driver_stats(year),
+        "constructors": constructor_service.get_constructors_by_year(year),
+        "sessions": session_service.get_all_sessions(year),
+        "years": year_service.get_available_years_with_details(),
+    }
+
+
+@cached_result
+def _season_states():
+    """
+    Returns ``[year, data_generation, last_synced, drivers_count,
+    sessions_count]`` for every season, the data bundles are built from.
+    """
+    rows = db.session.query(
+        YearData.year,
+        YearData.data_generation,
+        YearData.last_synced,
+        YearData.drivers_count,
+        YearData.sessions_count,
+    ).order_by(YearData.year)
+    return [
+        [year, generation, last_synced.isoformat() if last_synced else None, *counts]
+        for year, generation, last_synced, *counts in rows
+    ]
+
+
+def bundle_version(year):
+    """
+    Hashes what a season's bundle is built from: the season's data
+    generation, bumped by syncs and commands that change its data, and the
+    sync dates and counts of every season, embedded as the years list.
+    Served from the API cache, so checking a stored bundle reads nothing
+    else from the database.
+    """
+    states = _season_states()
+    generation = next((state[1] for state in states if state[0] == year), None)
+    years = [[state[0], *state[2:]] for state in states]
+    state = json.dumps([generation, years])
+    return hashlib.sha1(state.encode()).hexdigest()
+
+
+def store_season_bundle(year):
+    """
+    Serializes and compresses a season's bundle and stores it, along with
+    the version of the data it was built from. Bundles of other seasons are
+    left alone; they are rebuilt on request once their version is stale.
+    Returns the stored bundle, or None if the season has no sessions.
+    """
+    if not Session.query.filter_by(year=year).first():
+        return None
+
+    version = bundle_version(year)
+    body = json.dumps(build_season_bundle(year), separators=(",", ":")).encode()
+    bundle = SeasonBundle(
+        year=year,
+        etag=hashlib.sha1(body).hexdigest(),
+        content=gzip.compress(body, BUNDLE_COMPRESSION_LEVEL, mtime=0),
+        size=len(body),
+        data_version=version,
+        built_at=datetime.utcnow(),
+    )
+    try:
+        bundle = db.session.merge(bundle)
+        db.session.commit()
+    except IntegrityError:
+        # Another request built the same bundle between our lookup and insert
+        db.session.rollback()
+        bundle = db.session.get(SeasonBundle, year)
+    return bundle
+
+
+def get_season_bundle(year):
+    """
+    Returns a season's stored bundle, building it first if it is missing
+    or was built from older data, or None if the season has no sessions.
+    Its compressed content is only loaded from the database when first
+    accessed.
+    """
+    bundle = db.session.get(SeasonBundle, year, options=[defer(SeasonBundle.content)])
+    if bundle and bundle.data_version == bundle_version(year):
+        return bundle
+    return store_season_bundle(year)
@@ -0,0 +1,263 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+
+class CacheBackend:
+    """
+    Storage for cached service results.
+
+    Values are bytes stored under string keys. Every entry records the
+    generation of the season it was built from; ``bump(year)`` moves that
+    season to a new generation so its entries stop matching. Entries not
+    tied to a season use the ``None`` generation, which every bump
+    advances, since any sync can change them.
+
+    ``shared`` backends keep their generations where every process sees
+    them, so a bump from a CLI command reaches running servers.
+    """
+
+    shared = False
+
+    def get(self, key, year):
+        """Returns the value stored under a key, or None if missing or stale."""
+        raise NotImplementedError
+
+    def set(self, key, year, value, generation=None):
+        """
+        Stores a value. Pass the generation read before building the value,
+        so a value built while a sync finished is not stored as current.
+        """
+        raise NotImplementedError
+
+    def generation(self, year):
+        raise NotImplementedError
+
+    def bump(self, year=None):
+        """Invalidates a season's entries and every entry not tied to a season."""
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+
+class MemoryCacheBackend(CacheBackend):
+    """In-process LRU cache, capped by the total size of its values."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, year):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            generation, value = entry
+            if generation != self.generation(year):
+                self._evict(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, year, value, generation=None):
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            if generation is None:
+                generation = self.generation(year)
+            if generation != self.generation(year):
+                return
+            if key in self._entries:
+                self._evict(key)
+            self._entries[key] = (generation, value)
+            self.size += len(value)
+            while self.size > self.max_bytes:
+                self._evict(next(iter(self._entries)))
+
+    def generation(self, year):
+        return self._generations.get(year, 0)
+
+    def bump(self, year=None):
+        with self._lock:
+            self._generations[None] = self.generation(None) + 1
+            if year is not None:
+                self._generations[year] = self.generation(year) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def _evict(self, key):
+        _, value = self._entries.pop(key)
+        self.size -= len(value)
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    Cache stored in a SQLite file on local disk, shared by every worker
+    process that opens the same path.
+
+    Writes run in their own transactions, so readers in other processes
+    see either the old value or the new one, never a partial write.
+    Generations live in the file too, so a bump in one process
+    invalidates the entries every process reads. When the values outgrow
+    ``max_bytes`` the oldest entries are evicted first.
+    """
+
+    shared = True
+
+    SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS cache_entry (
+            key TEXT PRIMARY KEY,
+            year_key TEXT NOT NULL,
+            generation INTEGER NOT NULL,
+            value BLOB NOT NULL,
+            size INTEGER NOT NULL,
+            created REAL NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS ix_cache_entry_created ON cache_entry (created)",
+        "CREATE INDEX IF NOT EXISTS ix_cache_entry_year ON cache_entry (year_key)",
+        """
+        CREATE TABLE IF NOT EXISTS cache_generation (
+            year_key TEXT PRIMARY KEY,
+            generation INTEGER NOT NULL
+        )
+        """,
+    )
+
+    def __init__(self, path, max_bytes, timeout=30):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._transaction() as connection:
+            for statement in self.SCHEMA:
+                connection.execute(statement)
+
+    @staticmethod
+    def _year_key(year):
+        return "*" if year is None else str(year)
+
+    def _connection(self):
+        # sqlite3 connections must not be shared between threads
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path, timeout=self.timeout, isolation_level=None
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    @contextmanager
+    def _transaction(self):
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def __len__(self):
+        return (
+            self._connection().execute("SELECT COUNT(*) FROM cache_entry").fetchone()[0]
+        )
+
+    def get(self, key, year):
+        row = (
+            self._connection()
+            .execute(
+                """
+                SELECT e.value FROM cache_entry e
+                LEFT JOIN cache_generation g ON g.year_key = ?
+                WHERE e.key = ? AND e.generation = COALESCE(g.generation, 0)
+                """,
+                (self._year_key(year), key),
+            )
+            .fetchone()
+        )
+        return row[0] if row else None
+
+    def set(self, key, year, value, generation=None):
+        if len(value) > self.max_bytes:
+            return
+        year_key = self._year_key(year)
+        with self._transaction() as connection:
+            current = self._generation(connection, year_key)
+            if generation is None:
+                generation = current
+            if generation != current:
+                return
+            connection.execute(
+                """
+                INSERT OR REPLACE INTO cache_entry
+                    (key, year_key, generation, value, size, created)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (key, year_key, generation, value, len(value), time.time()),
+            )
+            self._evict(connection)
+
+    def generation(self, year):
+        return self._generation(self._connection(), self._year_key(year))
+
+    def bump(self, year=None):
+        year_keys = ["*"] if year is None else ["*", self._year_key(year)]
+        with self._transaction() as connection:
+            for year_key in year_keys:
+                connection.execute(
+                    """
+                    INSERT INTO cache_generation (year_key, generation)
+                    VALUES (?, 1)
+                    ON CONFLICT (year_key) DO UPDATE SET generation = generation + 1
+                    """,
+                    (year_key,),
+                )
+                connection.execute(
+                    "DELETE FROM cache_entry WHERE year_key = ?", (year_key,)
+                )
+
+    def clear(self):
+        with self._transaction() as connection:
+            connection.execute("DELETE FROM cache_entry")
+
+    @staticmethod
+    def _generation(connection, year_key):
+        row = connection.execute(
+            "SELECT generation FROM cache_generation WHERE year_key = ?", (year_key,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def _evict(self, connection):
+        total = connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM cache_entry"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        oldest = connection.execute(
+            "SELECT key, size FROM cache_entry ORDER BY created"
+        )
+        evicted = []
+        for key, size in oldest:
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        connection.executemany("DELETE FROM cache_entry WHERE key = ?", evicted)
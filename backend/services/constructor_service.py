@@ -1,6 +1,8 @@
 from models import ConstructorStats
+from services.api_cache import cached_result
 
 
+@cached_result
 def get_constructors_by_year(year, team_name=None):
     """
     Retrieves constructor stats for a given year,
@@ -19,6 +21,7 @@ def get_constructors_by_year(year, team_name=None):
     return [c.to_dict() for c in constructors]
 
 
+@cached_result
 def get_constructor_details(year, team_name):
     """
     Retrieves detailed stats for a specific constructor in a given year.
@@ -33,6 +36,7 @@ def get_constructor_details(year, team_name):
     return constructor.to_dict() if constructor else None
 
 
+@cached_result
 def get_constructor_standings_by_year(year):
     """
     Retrieves constructor standings for a given year, ordered by position.
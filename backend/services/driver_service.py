@@ -1,6 +1,8 @@
 from models import DriverStats, DriverSessionStats
+from services.api_cache import cached_result
 
 
+@cached_result
 def get_driver_stats(year, driver_number=None):
     """
     Retrieves driver statistics for a given year,
@@ -18,6 +20,7 @@ def get_driver_stats(year, driver_number=None):
     return [d.to_dict() for d in drivers]
 
 
+@cached_result
 def get_driver_session_stats(year, driver_number):
     """
     Retrieves all session statistics for a given driver and year.
@@ -33,6 +36,7 @@ def get_driver_session_stats(year, driver_number):
     return [s.to_dict() for s in sessions]
 
 
+@cached_result
 def get_driver_session_stats_by_session(year, driver_number, session_name=None, session_location=None, date_start=None):
     """
     Retrieves all session statistics for a given driver and year.
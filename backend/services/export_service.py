@@ -0,0 +1,218 @@
+import gzip
+import json
+import os
+from urllib.parse import quote, unquote, urlencode, urlsplit
+
+from flask import current_app
+
+from extensions import db
+from models import ConstructorStats, Driver, DriverSession, Session, YearData
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Name of the file recording what an export directory holds
+EXPORT_MANIFEST = "manifest.json"
+
+# Compression levels used for exported files; they are compressed once per sync
+EXPORT_GZIP_LEVEL = 9
+EXPORT_BROTLI_QUALITY = 11
+
+# Read endpoints that span every season
+GLOBAL_URLS = ("/api/years/", "/api/overview/", "/api/sessions/")
+
+
+def export_encodings():
+    """Returns the compressed copies written next to each file."""
+    return ["gzip", "br"] if brotli else ["gzip"]
+
+
+def season_urls(year):
+    """
+    Returns the URL of every read endpoint holding data for a season: its
+    drivers and their sessions, constructors, sessions with their positions
+    and overview.
+    """
+    season_sessions = (
+        db.session.query(DriverSession.id)
+        .join(Session, DriverSession.session_id == Session.id)
+        .filter(Session.year == year)
+    )
+    driver_numbers = (
+        db.session.query(Driver.driver_number)
+        .join(DriverSession, DriverSession.driver_id == Driver.id)
+        .join(Session, DriverSession.session_id == Session.id)
+        .filter(Session.year == year)
+        .distinct()
+        .order_by(Driver.driver_number)
+    )
+    team_names = (
+        db.session.query(ConstructorStats.team_name)
+        .filter_by(year=year)
+        .order_by(ConstructorStats.position)
+    )
+
+    urls = [
+        f"/api/drivers/?year={year}",
+        f"/api/constructors/?year={year}",
+        f"/api/constructors/{year}",
+        f"/api/sessions/?year={year}",
+        f"/api/overview/?year={year}",
+    ]
+    urls += [
+        "/api/drivers/sessions?"
+        + urlencode({"driver_number": driver_number, "year": year})
+        for (driver_number,) in driver_numbers
+    ]
+    urls += [
+        f"/api/constructors/{quote(team_name, safe='')}?year={year}"
+        for (team_name,) in team_names
+        if team_name
+    ]
+    urls += [
+        f"/api/sessions/{driver_session_id}/positions"
+        for (driver_session_id,) in season_sessions.order_by(DriverSession.id)
+    ]
+    return urls
+
+
+def url_to_path(url):
+    """
+    Returns the file, relative to the export directory, that holds a URL's
+    response. The URL path becomes directories and the sorted query string
+    the file name, ``index`` when there is none: ``/api/drivers/?year=2023``
+    is stored in ``api/drivers/year=2023.json``.
+    """
+    parts = urlsplit(url)
+    segments = [unquote(segment) for segment in parts.path.split("/") if segment]
+    if any(segment in (".", "..") or os.sep in segment for segment in segments):
+        raise ValueError(f"Cannot export URL: {url}")
+    query = "&".join(sorted(parts.query.split("&"))) if parts.query else "index"
+    return "/".join([*segments, f"{query}.json"])
+
+
+def _copy_paths(target):
+    """Returns the paths of a file and of its compressed copies."""
+    return [target, target + ".gz"] + ([target + ".br"] if brotli else [])
+
+
+def _write_file(outdir, path, data):
+    """
+    Writes a file with its compressed copies, leaving the files untouched
+    when the content is unchanged. Returns whether anything was written.
+    """
+    target = os.path.join(outdir, *path.split("/"))
+    stale_brotli = not brotli and os.path.exists(target + ".br")
+    if not stale_brotli and all(map(os.path.exists, _copy_paths(target))):
+        with open(target, "rb") as existing:
+            if existing.read() == data:
+                return False
+    if stale_brotli:
+        os.remove(target + ".br")
+
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    copies = {
+        target: data,
+        target + ".gz": gzip.compress(data, EXPORT_GZIP_LEVEL, mtime=0),
+    }
+    if brotli:
+        copies[target + ".br"] = brotli.compress(data, quality=EXPORT_BROTLI_QUALITY)
+    for copy_path, content in copies.items():
+        # Written aside and moved into place so a server never reads half a file
+        partial = copy_path + ".tmp"
+        with open(partial, "wb") as f:
+            f.write(content)
+        os.replace(partial, copy_path)
+    return True
+
+
+def _remove_files(outdir, paths):
+    for path in paths:
+        target = os.path.join(outdir, *path.split("/"))
+        for copy_path in (target, target + ".gz", target + ".br"):
+            if os.path.exists(copy_path):
+                os.remove(copy_path)
+
+
+def _render(client, urls):
+    """
+    Requests each URL and returns ``{path: body}`` for the ones answered
+    with 200; the others have no data to serve.
+    """
+    rendered = {}
+    for url in urls:
+        response = client.get(url)
+        if response.status_code == 200:
+            rendered[url_to_path(url)] = response.get_data()
+    return rendered
+
+
+def load_manifest(outdir):
+    """Returns the manifest of an export directory, empty if there is none."""
+    try:
+        with open(os.path.join(outdir, EXPORT_MANIFEST)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"seasons": {}}
+
+
+def export_static(outdir, force=False):
+    """
+    Pre-renders the read API into ``outdir`` as JSON files with gzip and,
+    when the brotli module is installed, brotli copies. Only the seasons
+    whose last sync or data generation differs from the one recorded by
+    the previous export are rendered again; endpoints spanning every season
+    are rendered each time but only rewritten when they changed. Returns
+    ``{"exported": [...], "skipped": [...], "removed": [...], "files": n}``.
+    """
+    manifest = load_manifest(outdir)
+    encodings = export_encodings()
+    if manifest.get("encodings") != encodings:
+        force = True
+    previous = manifest.get("seasons", {})
+
+    synced = {
+        str(year_data.year): {
+            "last_synced": year_data.last_synced.isoformat(),
+            "data_generation": year_data.data_generation,
+        }
+        for year_data in YearData.query.filter(YearData.last_synced.isnot(None))
+    }
+    client = current_app.test_client()
+    summary = {"exported": [], "skipped": [], "removed": [], "files": 0}
+    seasons = {}
+
+    for year, version in sorted(synced.items()):
+        entry = previous.get(year)
+        if not force and entry and all(entry.get(k) == v for k, v in version.items()):
+            seasons[year] = entry
+            summary["skipped"].append(int(year))
+            continue
+
+        rendered = _render(client, season_urls(int(year)))
+        for path, data in rendered.items():
+            summary["files"] += _write_file(outdir, path, data)
+        if entry:
+            _remove_files(outdir, set(entry["files"]) - set(rendered))
+        seasons[year] = {**version, "files": sorted(rendered)}
+        summary["exported"].append(int(year))
+
+    for year in sorted(set(previous) - set(synced)):
+        _remove_files(outdir, previous[year]["files"])
+        summary["removed"].append(int(year))
+
+    rendered = _render(client, GLOBAL_URLS)
+    for path, data in rendered.items():
+        summary["files"] += _write_file(outdir, path, data)
+    _remove_files(outdir, set(manifest.get("global", [])) - set(rendered))
+
+    os.makedirs(outdir, exist_ok=True)
+    with open(os.path.join(outdir, EXPORT_MANIFEST), "w") as f:
+        json.dump(
+            {"encodings": encodings, "global": sorted(rendered), "seasons": seasons},
+            f,
+            indent=2,
+        )
+    return summary
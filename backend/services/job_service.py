@@ -0,0 +1,125 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from flask import current_app
+
+from extensions import db
+from models import SyncJob, YearData
+from services.sync_service import is_sync_stale, run_sync_for_year
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    """
+    Returns the process-wide worker pool, creating it on first use. Jobs
+    orphaned by an earlier process are failed as the pool starts.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            fail_orphaned_jobs()
+            _executor = ThreadPoolExecutor(
+                max_workers=current_app.config["SYNC_JOB_WORKERS"],
+                thread_name_prefix="sync-job",
+            )
+        return _executor
+
+
+def enqueue_sync_job(year):
+    """
+    Records a queued sync job for a year and hands it to the worker pool.
+    Returns the job as a dict without waiting for it to run.
+    """
+    if not year:
+        raise ValueError("Year parameter is required")
+
+    job = SyncJob(year=year, status="queued", phase="Queued", progress=0)
+    db.session.add(job)
+    db.session.commit()
+
+    app = current_app._get_current_object()
+    _get_executor().submit(run_sync_job, app, job.id)
+    return job.to_dict()
+
+
+def fail_orphaned_jobs():
+    """
+    Marks queued and running jobs whose process died as failed, so clients
+    polling them stop waiting. A running job is orphaned once its season's
+    sync has stopped beating for SYNC_STALE_SECONDS; a queued one, lost with
+    the in-memory queue, once it is that old and no sync is running at all.
+    Returns the number of jobs failed.
+    """
+    cutoff = datetime.utcnow() - timedelta(
+        seconds=current_app.config["SYNC_STALE_SECONDS"]
+    )
+    live_years = {
+        year_data.year
+        for year_data in YearData.query.filter_by(sync_status="in_progress")
+        if not is_sync_stale(year_data)
+    }
+    jobs = SyncJob.query.filter(SyncJob.status.in_(("queued", "running")))
+    failed = 0
+    for job in jobs:
+        if job.status == "running":
+            started = job.started_at or job.created_at
+            orphaned = started < cutoff and job.year not in live_years
+        else:
+            orphaned = job.created_at < cutoff and not live_years
+        if orphaned:
+            job.status = "error"
+            job.message = "The sync was interrupted; start it again."
+            job.finished_at = datetime.utcnow()
+            failed += 1
+    db.session.commit()
+    if failed:
+        current_app.logger.warning(f"Failed {failed} orphaned sync jobs")
+    return failed
+
+
+def get_sync_job(job_id):
+    """
+    Returns a sync job as a dict, or None if it does not exist. A job whose
+    process died is reported as failed.
+    """
+    job = db.session.get(SyncJob, job_id)
+    if job and job.status in ("queued", "running"):
+        fail_orphaned_jobs()
+    return job.to_dict() if job else None
+
+
+def run_sync_job(app, job_id):
+    """
+    Runs a queued sync job to completion inside its own app context.
+    Progress is written to the job as the sync advances.
+    """
+    with app.app_context():
+        job = db.session.get(SyncJob, job_id)
+        job.status = "running"
+        job.started_at = datetime.utcnow()
+        db.session.commit()
+
+        def on_progress(phase, percent):
+            job.phase = phase
+            job.progress = percent
+            db.session.commit()
+
+        try:
+            result = asyncio.run(run_sync_for_year(job.year, on_progress))
+            job.status = result.get("status", "completed")
+            job.phase = job.status.capitalize()
+            job.progress = 100
+            job.message = result.get("message")
+            job.row_counts = result.get("rows")
+        except Exception as e:
+            db.session.rollback()
+            app.logger.error(f"Sync job {job_id} failed: {e}")
+            job.status = "error"
+            job.message = str(e)[:200]
+        finally:
+            job.finished_at = datetime.utcnow()
+            db.session.commit()
@@ -0,0 +1,94 @@
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+CACHE_MODES = ("off", "readwrite", "replay")
+
+
+class ResponseCache:
+    """
+    Content-addressed on-disk cache for OpenF1 responses.
+    Entries are keyed by endpoint and params and stored as gzip-compressed
+    JSON under ``<directory>/<endpoint>/<sha256>.json.gz``.
+
+    Modes:
+    - ``off``: never read or write the cache.
+    - ``readwrite``: serve fresh entries, store new responses.
+    - ``replay``: serve only from the cache, ignoring TTLs; misses are
+      reported as such and the network is never used.
+
+    ``ttl`` maps an endpoint to its time-to-live in seconds. An endpoint
+    missing from the mapping, or mapped to None, never expires.
+    """
+
+    def __init__(self, directory, mode="readwrite", ttl=None, clock=time.time):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown cache mode: {mode}")
+
+        self.directory = directory
+        self.mode = mode
+        self.ttl = ttl or {}
+        self._clock = clock
+
+    @property
+    def enabled(self):
+        return self.mode != "off"
+
+    @property
+    def replay(self):
+        return self.mode == "replay"
+
+    @staticmethod
+    def make_key(endpoint, params):
+        """Returns the content address for an endpoint and its params."""
+        canonical = json.dumps(
+            {"endpoint": endpoint, "params": params}, sort_keys=True, default=str
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def _path(self, endpoint, params):
+        key = self.make_key(endpoint, params)
+        return os.path.join(self.directory, endpoint, f"{key}.json.gz")
+
+    def _is_fresh(self, endpoint, path):
+        ttl = self.ttl.get(endpoint)
+        if ttl is None or self.replay:
+            return True
+        return self._clock() - os.path.getmtime(path) < ttl
+
+    def get(self, endpoint, params):
+        """
+        Returns ``(hit, data)``. ``hit`` is False when the entry is missing,
+        expired or unreadable.
+        """
+        if not self.enabled:
+            return False, None
+
+        path = self._path(endpoint, params)
+        try:
+            if not self._is_fresh(endpoint, path):
+                return False, None
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                return True, json.load(f)
+        except (OSError, ValueError):
+            return False, None
+
+    def set(self, endpoint, params, data):
+        """Stores a response atomically so readers never see partial files."""
+        if self.mode != "readwrite":
+            return
+
+        path = self._path(endpoint, params)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb") as f:
+                f.write(json.dumps(data).encode("utf-8"))
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
@@ -1,46 +1,112 @@
-from models import db, Driver, Session, DriverSession
+from datetime import datetime
 
+from sqlalchemy import distinct, func, literal, select, true
 
+from models import db, Driver, Session, DriverSession, SeasonSummary, YearData
+from services.api_cache import cached_result
+
+# SeasonSummary year under which the summary of every season is stored
+ALL_SEASONS = 0
+
+
+@cached_result
 def get_stats_summary(year=None):
     """
-    Calculates a summary of statistics, optionally filtered by year.
+    Returns a summary of statistics, optionally filtered by year. The
+    summary stored by the last sync is read by primary key; it is computed
+    on the fly only when none has been stored yet.
+    """
+    summary = db.session.get(SeasonSummary, year or ALL_SEASONS)
+    if summary is None:
+        values = _compute_summary(year)
+        values.pop("season_drivers", None)
+        summary = SeasonSummary(year=year or ALL_SEASONS, **values)
+    return summary.to_dict()
+
+
+def _summary_statement(year):
+    """
+    Builds the single statement that aggregates a season's summary, or that
+    of every season when no year is given.
     """
+    sessions = select(Session.session_name, Session.location, Session.date_start)
+    total_sessions = select(func.count(Session.id))
     if year:
-        drivers_q = (
-            db.session.query(Driver.id)
-            .join(DriverSession)
-            .join(Session)
-            .filter(Session.year == year, Driver.is_active)
+        sessions = sessions.where(Session.year == year)
+        total_sessions = total_sessions.where(Session.year == year)
+        season_drivers = (
+            select(func.count(distinct(DriverSession.driver_id)))
+            .join(Session, DriverSession.session_id == Session.id)
+            .where(Session.year == year)
         )
-        total_drivers = drivers_q.distinct().count()
+        counts = {
+            "total_drivers": season_drivers.join(
+                Driver, DriverSession.driver_id == Driver.id
+            ).where(Driver.is_active),
+            "season_drivers": season_drivers,
+        }
+    else:
+        counts = {
+            "total_drivers": select(func.count(Driver.id)),
+            "active_drivers": select(func.count(distinct(DriverSession.driver_id))),
+        }
+    counts["total_sessions"] = total_sessions
 
-        total_sessions = Session.query.filter(Session.year == year).count()
+    # Joined to a one-row table so the counts come back with no sessions
+    latest = sessions.order_by(Session.date_start.desc()).limit(1).subquery()
+    one_row = select(literal(1).label("one")).subquery()
+    return select(
+        *[query.scalar_subquery().label(name) for name, query in counts.items()],
+        latest.c.session_name.label("latest_session_name"),
+        latest.c.location.label("latest_session_location"),
+        latest.c.date_start.label("latest_session_date"),
+    ).select_from(one_row.outerjoin(latest, true()))
 
-        sessions_q = Session.query.filter(Session.year == year)
-        latest_session = sessions_q.order_by(Session.date_start.desc()).first()
 
-    else:
-        total_drivers = Driver.query.count()
-        total_sessions = Session.query.count()
-        latest_session = Session.query.order_by(Session.date_start.desc()).first()
-
-    active_drivers_q = db.session.query(Driver.id).join(DriverSession)
-    active_drivers_count = active_drivers_q.distinct().count()
-    active_drivers = total_drivers if year else active_drivers_count
-
-    latest_session_data = None
-    if latest_session:
-        date_start = latest_session.date_start
-        latest_session_data = {
-            "name": latest_session.session_name,
-            "location": latest_session.location,
-            "date": date_start.isoformat() if date_start else None,
-        }
+def _compute_summary(year):
+    """
+    Returns the SeasonSummary column values of a season, or of all seasons.
+    Season values also hold ``season_drivers``, the number of drivers who
+    took part whether or not they are still active.
+    """
+    values = dict(db.session.execute(_summary_statement(year)).one()._mapping)
+    values.setdefault("active_drivers", values["total_drivers"])
+    return values
+
+
+def _store_summary(year):
+    values = _compute_summary(year or None)
+    season_drivers = values.pop("season_drivers", None)
+    db.session.merge(SeasonSummary(year=year, refreshed_at=datetime.utcnow(), **values))
+    if year:
+        YearData.query.filter_by(year=year).update(
+            {
+                "drivers_count": season_drivers,
+                "sessions_count": values["total_sessions"],
+            },
+            synchronize_session=False,
+        )
+
+
+def refresh_season_summary(year):
+    """
+    Stores the summaries of a season and of all seasons, and fills in the
+    season's YearData driver and session counts.
+    Returns the season's summary.
+    """
+    _store_summary(year)
+    _store_summary(ALL_SEASONS)
+    db.session.commit()
+    return db.session.get(SeasonSummary, year).to_dict()
+
 
+def refresh_all_season_summaries():
+    """Rebuilds the summaries of every season with sessions stored."""
+    years = db.session.execute(select(Session.year).distinct()).scalars().all()
+    for year in years:
+        _store_summary(year)
+    _store_summary(ALL_SEASONS)
+    db.session.commit()
     return {
-        "total_drivers": total_drivers,
-        "active_drivers": active_drivers,
-        "total_sessions": total_sessions,
-        "latest_session": latest_session_data,
-        "year": year,
+        year: db.session.get(SeasonSummary, year).to_dict() for year in sorted(years)
     }
@@ -0,0 +1,220 @@
+import struct
+import sys
+from array import array
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from itertools import accumulate, groupby
+
+from sqlalchemy import delete, insert, select
+
+from extensions import db
+from models import Position, PositionTimeline
+
+# Maximum number of driver sessions rebuilt per statement
+TIMELINE_CHUNK_SIZE = 500
+
+EPOCH = datetime(1970, 1, 1)
+_ONE_MS = timedelta(milliseconds=1)
+_UINT32_MAX = 2**32 - 1
+
+# Binary positions format: a little-endian header of magic, driver session
+# id, sample count and first date in ms since the epoch, followed by uint32
+# ids, uint32 ms offsets from the previous sample and uint8 positions, the
+# same layout PositionTimeline stores
+BINARY_MAGIC = b"F1P1"
+_BINARY_HEADER = struct.Struct("<4sIIq")
+
+
+def position_changes(samples):
+    """
+    Keeps only the samples where the position changes. ``samples`` must be
+    in date order and have a ``position`` attribute.
+    """
+    changes = []
+    previous = None
+    for sample in samples:
+        if sample.position != previous:
+            changes.append(sample)
+            previous = sample.position
+    return changes
+
+
+def _pack(typecode, values):
+    packed = array(typecode, values)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _unpack(typecode, data):
+    unpacked = array(typecode)
+    unpacked.frombytes(data)
+    if sys.byteorder == "big":
+        unpacked.byteswap()
+    return unpacked
+
+
+def encode_timeline(samples):
+    """
+    Packs date-ordered ``(id, date, position)`` samples into the column
+    values of a PositionTimeline. Returns None when the samples cannot be
+    stored losslessly, e.g. sub-millisecond dates or out-of-range values.
+    """
+    if not samples:
+        return None
+
+    ids, times, positions = [], [], []
+    for sample in samples:
+        delta = sample.date - EPOCH
+        if delta.microseconds % 1000:
+            return None
+        ids.append(sample.id)
+        times.append(delta // _ONE_MS)
+        positions.append(sample.position)
+
+    offsets = [0] + [b - a for a, b in zip(times, times[1:])]
+    if (
+        max(ids) > _UINT32_MAX
+        or min(ids) < 0
+        or max(offsets) > _UINT32_MAX
+        or not 0 <= min(positions) <= max(positions) <= 255
+    ):
+        return None
+
+    return {
+        "start_ms": times[0],
+        "sample_count": len(samples),
+        "ids": _pack("I", ids),
+        "offsets": _pack("I", offsets),
+        "positions": _pack("B", positions),
+    }
+
+
+def decode_timeline(timeline):
+    """
+    Unpacks a PositionTimeline into the same dicts ``Position.to_dict``
+    returns, without loading any Position rows.
+    """
+    return list(iter_timeline(timeline))
+
+
+def iter_timeline(timeline, after=None):
+    """
+    Yields the samples of a PositionTimeline one at a time, as
+    ``decode_timeline`` returns them. With ``after``, a naive UTC datetime,
+    only samples dated later are yielded.
+    """
+    driver_session_id = timeline.driver_session_id
+    after_ms = None if after is None else to_epoch_ms(after)
+    times = accumulate(_unpack("I", timeline.offsets), initial=timeline.start_ms)
+    next(times)
+    for position_id, ms, position in zip(
+        _unpack("I", timeline.ids), times, _unpack("B", timeline.positions)
+    ):
+        if after_ms is not None and ms <= after_ms:
+            continue
+        yield {
+            "id": position_id,
+            "driver_session_id": driver_session_id,
+            "date": from_epoch_ms(ms).isoformat(),
+            "position": position,
+        }
+
+
+def to_epoch_ms(date):
+    """Returns a naive UTC datetime as whole milliseconds since the epoch."""
+    return (date - EPOCH) // _ONE_MS
+
+
+def from_epoch_ms(ms):
+    return EPOCH + timedelta(milliseconds=ms)
+
+
+def timeline_columns(timeline, after=None):
+    """
+    Unpacks a PositionTimeline into ``(ids, times, positions)`` columns,
+    with times in ms since the epoch, without building a row per sample.
+    With ``after``, only samples dated later are kept.
+    """
+    times = array(
+        "q", accumulate(_unpack("I", timeline.offsets), initial=timeline.start_ms)
+    )[1:]
+    ids = _unpack("I", timeline.ids)
+    positions = _unpack("B", timeline.positions)
+    if after is not None:
+        start = bisect_right(times, to_epoch_ms(after))
+        return ids[start:], times[start:], positions[start:]
+    return ids, times, positions
+
+
+def pack_columns(driver_session_id, ids, times, positions):
+    """
+    Packs position columns, times in ms since the epoch, into the binary
+    positions format. Raises ValueError when a value does not fit.
+    """
+    offsets = [0] + [b - a for a, b in zip(times, times[1:])]
+    try:
+        header = _BINARY_HEADER.pack(
+            BINARY_MAGIC, driver_session_id, len(ids), times[0] if times else 0
+        )
+        return header + _pack("I", ids) + _pack("I", offsets) + _pack("B", positions)
+    except (OverflowError, struct.error):
+        raise ValueError("Positions do not fit the binary format")
+
+
+def unpack_columns(data):
+    """
+    Reads the binary positions format back into
+    ``(driver_session_id, ids, times, positions)``.
+    """
+    magic, driver_session_id, count, start_ms = _BINARY_HEADER.unpack_from(data)
+    if magic != BINARY_MAGIC:
+        raise ValueError("Not binary position data")
+    start = _BINARY_HEADER.size
+    ids = _unpack("I", data[start : start + 4 * count])
+    offsets = _unpack("I", data[start + 4 * count : start + 8 * count])
+    positions = _unpack("B", data[start + 8 * count : start + 9 * count])
+    times = list(accumulate(offsets, initial=start_ms))[1:]
+    return driver_session_id, list(ids), times, list(positions)
+
+
+def build_position_timelines(driver_session_ids):
+    """
+    Rebuilds the position timelines of the given driver sessions from their
+    stored positions. Driver sessions whose positions cannot be packed
+    losslessly are left without a timeline and read from Position rows.
+    Returns the number of timelines written.
+    """
+    ids = sorted(driver_session_ids)
+    built = 0
+    for start in range(0, len(ids), TIMELINE_CHUNK_SIZE):
+        chunk = ids[start : start + TIMELINE_CHUNK_SIZE]
+        samples = db.session.execute(
+            select(
+                Position.driver_session_id,
+                Position.id,
+                Position.date,
+                Position.position,
+            )
+            .where(Position.driver_session_id.in_(chunk))
+            .order_by(Position.driver_session_id, Position.date)
+        )
+
+        rows = []
+        for driver_session_id, group in groupby(
+            samples, key=lambda sample: sample.driver_session_id
+        ):
+            encoded = encode_timeline(position_changes(group))
+            if encoded:
+                rows.append({"driver_session_id": driver_session_id, **encoded})
+
+        db.session.execute(
+            delete(PositionTimeline).where(
+                PositionTimeline.driver_session_id.in_(chunk)
+            )
+        )
+        if rows:
+            db.session.execute(insert(PositionTimeline), rows)
+        built += len(rows)
+    db.session.commit()
+    return built
@@ -0,0 +1,148 @@
+import asyncio
+import multiprocessing
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+
+class TokenBucket:
+    """
+    Token-bucket state for a single process.
+    ``take`` either consumes a token and returns 0, or returns how many
+    seconds to wait before trying again.
+    """
+
+    def __init__(self, rate, capacity, now):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = now
+        self._paused_until = 0.0
+
+    def take(self, now):
+        if now < self._paused_until:
+            return self._paused_until - now
+
+        elapsed = max(now - self._updated, 0)
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0
+        return (1 - self._tokens) / self.rate
+
+    def pause(self, seconds, now):
+        self._paused_until = max(self._paused_until, now + seconds)
+        self._tokens = 0
+        self._updated = max(self._updated, self._paused_until)
+
+
+class SharedTokenBucket:
+    """
+    Token-bucket state in shared memory, so several worker processes draw
+    from one request budget and a 429 seen by any of them pauses all.
+    Must be created before the workers start and handed to them; uses
+    wall-clock time since monotonic clocks are not comparable across
+    processes.
+    """
+
+    clock = staticmethod(time.time)
+
+    def __init__(self, rate, capacity=None, ctx=multiprocessing):
+        self.rate = rate
+        self.capacity = capacity or max(1, rate)
+        self._lock = ctx.Lock()
+        self._tokens = ctx.RawValue("d", self.capacity)
+        self._updated = ctx.RawValue("d", self.clock())
+        self._paused_until = ctx.RawValue("d", 0.0)
+
+    def take(self, now):
+        with self._lock:
+            if now < self._paused_until.value:
+                return self._paused_until.value - now
+
+            elapsed = max(now - self._updated.value, 0)
+            tokens = min(self.capacity, self._tokens.value + elapsed * self.rate)
+            self._updated.value = now
+            if tokens >= 1:
+                self._tokens.value = tokens - 1
+                return 0
+            self._tokens.value = tokens
+            return (1 - tokens) / self.rate
+
+    def pause(self, seconds, now):
+        with self._lock:
+            paused_until = max(self._paused_until.value, now + seconds)
+            self._paused_until.value = paused_until
+            self._tokens.value = 0
+            self._updated.value = max(self._updated.value, paused_until)
+
+
+class RateLimiter:
+    """
+    Token-bucket rate limiter shared by every OpenF1 request in a sync.
+    Limits both the request rate and the number of requests in flight.
+    A 429 response pauses the whole client, not just the caller that saw it.
+    Pass a SharedTokenBucket as ``bucket`` to share the request rate with
+    other processes; the in-flight limit always applies per process.
+    """
+
+    def __init__(
+        self, rate, max_in_flight, burst=None, clock=time.monotonic, bucket=None
+    ):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+
+        self.rate = rate
+        self.max_in_flight = max_in_flight
+        if bucket is not None:
+            clock = bucket.clock
+        self._clock = clock
+        self._bucket = bucket or TokenBucket(rate, burst or max(1, rate), clock())
+        self._lock = asyncio.Lock()
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+
+    async def _take_token(self):
+        async with self._lock:
+            while True:
+                wait = self._bucket.take(self._clock())
+                if wait <= 0:
+                    return
+                await asyncio.sleep(wait)
+
+    @asynccontextmanager
+    async def slot(self):
+        """Waits for a free in-flight slot and a token, then holds the slot."""
+        async with self._in_flight:
+            await self._take_token()
+            yield
+
+    def pause(self, seconds):
+        """Stops all callers from sending requests for the next `seconds`."""
+        self._bucket.pause(seconds, self._clock())
+
+
+def parse_retry_after(value):
+    """
+    Parses a Retry-After header into seconds to wait.
+    Accepts both delta-seconds and HTTP-date forms; returns None if the value
+    is missing or malformed.
+    """
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
@@ -0,0 +1,141 @@
+import re
+from itertools import groupby, repeat
+
+from sqlalchemy import select
+
+from extensions import db
+from models import Driver, DriverSession, Position, PositionTimeline, Session
+from services.api_cache import cached_result
+from services.position_timeline import timeline_columns, to_epoch_ms
+
+# Default and smallest replay step, in ms
+REPLAY_STEP_MS = 1000
+REPLAY_MIN_STEP_MS = 100
+
+# Largest number of frames one replay may hold
+REPLAY_MAX_FRAMES = 50000
+
+_STEP_PATTERN = re.compile(r"^(\d+(?:\.\d+)?)(ms|s|m)?$")
+_STEP_UNITS = {"ms": 1, "s": 1000, "m": 60000, None: 1000}
+
+
+def parse_step(value):
+    """
+    Parses a replay step such as ``1s``, ``500ms`` or ``2`` (seconds) into
+    milliseconds. Returns the default step when no value is given.
+    """
+    if not value:
+        return REPLAY_STEP_MS
+    match = _STEP_PATTERN.match(value.strip())
+    if not match:
+        raise ValueError(f"Invalid step: {value}")
+    step_ms = round(float(match.group(1)) * _STEP_UNITS[match.group(2)])
+    if step_ms < REPLAY_MIN_STEP_MS:
+        raise ValueError(f"step must be at least {REPLAY_MIN_STEP_MS}ms")
+    return step_ms
+
+
+def forward_fill(times, values, start_ms, step_ms, frame_count):
+    """
+    Samples ``values``, dated by the sorted ``times`` in ms, at
+    ``start_ms + k * step_ms`` for each of ``frame_count`` frames. Each frame
+    holds the latest value at or before its time, or None before the first.
+    Every value fills its run of frames with one slice assignment.
+    """
+    filled = [None] * frame_count
+    for index, value in enumerate(values):
+        first = max(-((start_ms - times[index]) // step_ms), 0)
+        if index + 1 < len(times):
+            end = min(-((start_ms - times[index + 1]) // step_ms), frame_count)
+        else:
+            end = frame_count
+        if first < end:
+            filled[first:end] = repeat(value, end - first)
+    return filled
+
+
+def _driver_samples(driver_session_ids):
+    """
+    Returns ``{driver_session_id: (times, positions)}``, times in ms since
+    the epoch. Packed timelines are used where they exist, the rest are read
+    in one range scan of the (driver_session_id, date) index.
+    """
+    samples = {}
+    timelines = PositionTimeline.query.filter(
+        PositionTimeline.driver_session_id.in_(driver_session_ids)
+    )
+    for timeline in timelines:
+        _, times, positions = timeline_columns(timeline)
+        samples[timeline.driver_session_id] = (times, positions)
+
+    missing = [id_ for id_ in driver_session_ids if id_ not in samples]
+    if missing:
+        rows = db.session.execute(
+            select(Position.driver_session_id, Position.date, Position.position)
+            .where(Position.driver_session_id.in_(missing))
+            .order_by(Position.driver_session_id, Position.date)
+        )
+        for driver_session_id, group in groupby(
+            rows, key=lambda row: row.driver_session_id
+        ):
+            times, positions = [], []
+            for row in group:
+                times.append(to_epoch_ms(row.date))
+                positions.append(row.position)
+            samples[driver_session_id] = (times, positions)
+    return samples
+
+
+@cached_result
+def get_session_replay(session_key, step_ms=REPLAY_STEP_MS):
+    """
+    Retrieves the position of every driver in a session at fixed steps,
+    from the first stored sample to the end of the session. ``positions``
+    has one row per frame and one column per driver, in the order of
+    ``drivers``; a driver keeps their last known position until it changes.
+    """
+    session = Session.query.filter_by(session_key=session_key).first()
+    if not session:
+        return None
+
+    entries = (
+        db.session.query(DriverSession.id, Driver)
+        .join(Driver, DriverSession.driver_id == Driver.id)
+        .filter(DriverSession.session_id == session.id)
+        .order_by(Driver.driver_number)
+        .all()
+    )
+    samples = _driver_samples([driver_session_id for driver_session_id, _ in entries])
+
+    sampled = [times for times, _ in samples.values() if times]
+    start_ms = min((times[0] for times in sampled), default=None)
+    frame_count = 0
+    if sampled:
+        # Only changes may be stored, so the last sample can come well
+        # before the end of the session
+        end_ms = max(times[-1] for times in sampled)
+        if session.date_end:
+            end_ms = max(end_ms, to_epoch_ms(session.date_end))
+        frame_count = (end_ms - start_ms) // step_ms + 1
+    if frame_count > REPLAY_MAX_FRAMES:
+        raise ValueError(
+            f"step too small: the replay would have {frame_count} frames, "
+            f"at most {REPLAY_MAX_FRAMES} are allowed"
+        )
+
+    columns = [
+        forward_fill(
+            *samples.get(driver_session_id, ([], [])),
+            start_ms,
+            step_ms,
+            frame_count,
+        )
+        for driver_session_id, _ in entries
+    ]
+    return {
+        "session": session.to_dict(),
+        "drivers": [driver.to_dict() for _, driver in entries],
+        "start_ms": start_ms,
+        "step_ms": step_ms,
+        "positions": [list(frame) for frame in zip(*columns)],
+    }
@@ -0,0 +1,101 @@
+from sqlalchemy import bindparam, case, exists, func, select, update
+
+from extensions import db
+from models import DriverSession, Lap, Position, Session
+
+# Maximum number of sessions derived per statement
+RESULTS_CHUNK_SIZE = 500
+
+
+def sessions_for_driver_sessions(driver_session_ids):
+    """Returns the ids of the sessions the given driver sessions belong to."""
+    ids = list(driver_session_ids)
+    session_ids = set()
+    for start in range(0, len(ids), RESULTS_CHUNK_SIZE):
+        chunk = ids[start : start + RESULTS_CHUNK_SIZE]
+        session_ids.update(
+            db.session.execute(
+                select(DriverSession.session_id)
+                .where(DriverSession.id.in_(chunk))
+                .distinct()
+            ).scalars()
+        )
+    return session_ids
+
+
+def sessions_for_year(year):
+    """Returns the ids of every session in a season."""
+    return set(
+        db.session.execute(select(Session.id).where(Session.year == year)).scalars()
+    )
+
+
+def derive_session_results(session_ids):
+    """
+    Derives final classifications and fastest laps for the given sessions.
+
+    - ``Lap.is_fastest`` marks the laps matching the session's quickest lap.
+    - ``DriverSession.fastest_lap`` is set when the driver set that lap.
+    - ``DriverSession.final_position`` is the driver's last recorded position.
+
+    Each step is a set-based statement per chunk of sessions, so the cost
+    depends on the number of sessions rather than drivers.
+    Returns the number of sessions derived.
+    """
+    session_ids = sorted(session_ids)
+    for start in range(0, len(session_ids), RESULTS_CHUNK_SIZE):
+        chunk = session_ids[start : start + RESULTS_CHUNK_SIZE]
+        _mark_fastest_laps(chunk)
+        _update_driver_session_results(chunk)
+    db.session.commit()
+    return len(session_ids)
+
+
+def _mark_fastest_laps(session_ids):
+    best_times = db.session.execute(
+        select(DriverSession.session_id, func.min(Lap.lap_time))
+        .join(Lap, Lap.driver_session_id == DriverSession.id)
+        .where(DriverSession.session_id.in_(session_ids))
+        .group_by(DriverSession.session_id)
+    ).all()
+    if not best_times:
+        return
+
+    # A Core update, so a list of params runs as an executemany instead of
+    # the ORM's bulk update by primary key
+    laps = Lap.__table__
+    session_driver_sessions = select(DriverSession.id).where(
+        DriverSession.session_id == bindparam("session_id")
+    )
+    db.session.execute(
+        update(laps)
+        .where(laps.c.driver_session_id.in_(session_driver_sessions))
+        .values(
+            is_fastest=case(
+                (laps.c.lap_time == bindparam("best_time"), True), else_=False
+            )
+        ),
+        [
+            {"session_id": session_id, "best_time": best_time}
+            for session_id, best_time in best_times
+        ],
+    )
+
+
+def _update_driver_session_results(session_ids):
+    last_position = (
+        select(Position.position)
+        .where(Position.driver_session_id == DriverSession.id)
+        .order_by(Position.date.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    set_fastest_lap = exists().where(
+        Lap.driver_session_id == DriverSession.id, Lap.is_fastest.is_(True)
+    )
+    db.session.execute(
+        update(DriverSession)
+        .where(DriverSession.session_id.in_(session_ids))
+        .values(final_position=last_position, fastest_lap=set_fastest_lap)
+        .execution_options(synchronize_session=False)
+    )
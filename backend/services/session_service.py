@@ -1,7 +1,31 @@
+from contextlib import closing
+from datetime import timezone
+from itertools import islice
+
+from sqlalchemy import select
+
 from extensions import db
-from models import Session, DriverSession, Position
+from models import Session, DriverSession, Position, PositionTimeline
+from services.api_cache import cached_result
+from services.position_timeline import (
+    decode_timeline,
+    from_epoch_ms,
+    iter_timeline,
+    position_changes,
+    timeline_columns,
+    to_epoch_ms,
+)
+from services.timestamps import parse_timestamp
+
+# Default and largest number of positions in one page
+POSITIONS_PAGE_SIZE = 1000
+POSITIONS_MAX_PAGE_SIZE = 10000
+
+# Number of Position rows fetched from the cursor at a time when streaming
+POSITIONS_STREAM_BATCH = 1000
 
 
+@cached_result
 def get_all_sessions(year=None):
     """
     Retrieves a list of all sessions, optionally filtered by year.
@@ -14,6 +38,7 @@ def get_all_sessions(year=None):
     return [s.to_dict() for s in sessions]
 
 
+@cached_result
 def get_session_positions(session_id):
     """
     Retrieves position data for a specific session.
@@ -25,13 +50,172 @@ def get_session_positions(session_id):
     if not driver_session:
         return None
 
-    positions = (
-        Position.query.filter_by(driver_session_id=session_id)
-        .order_by(Position.date)
-        .all()
+    timeline = PositionTimeline.query.filter_by(driver_session_id=session_id).first()
+    if timeline:
+        positions = decode_timeline(timeline)
+    else:
+        # Repeated samples are collapsed so fully stored and run-length
+        # encoded sessions give the same answer
+        positions = (
+            Position.query.filter_by(driver_session_id=session_id)
+            .order_by(Position.date)
+            .all()
+        )
+        positions = [p.to_dict() for p in position_changes(positions)]
+
+    return {
+        "driver_session": driver_session.to_dict(),
+        "positions": positions,
+    }
+
+
+def parse_position_cursor(value):
+    """
+    Parses an ``after`` cursor, an ISO 8601 date, into the naive UTC
+    datetime positions are stored with. Returns None for an empty cursor.
+    """
+    if not value:
+        return None
+    try:
+        after = parse_timestamp(value)
+    except ValueError:
+        raise ValueError(f"Invalid after cursor: {value}")
+    return after.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def iter_session_positions(session_id, after=None):
+    """
+    Yields the positions of a driver session in date order, optionally only
+    those dated after a naive UTC datetime. Rows are read from a
+    server-side cursor in batches, so memory use does not grow with the
+    length of the session.
+    """
+    timeline = PositionTimeline.query.filter_by(driver_session_id=session_id).first()
+    if timeline:
+        yield from iter_timeline(timeline, after)
+        return
+
+    with closing(_iter_position_rows(session_id, after)) as rows:
+        for position_id, date, position in rows:
+            yield {
+                "id": position_id,
+                "driver_session_id": session_id,
+                "date": date.isoformat(),
+                "position": position,
+            }
+
+
+def _iter_position_rows(session_id, after=None):
+    """
+    Yields ``(id, date, position)`` tuples of the stored positions of a
+    driver session where the position changes, without loading ORM objects.
+    """
+    query = select(Position.id, Position.date, Position.position).where(
+        Position.driver_session_id == session_id
     )
+    previous = None
+    if after is not None:
+        # The last position before the cursor, so a repeat of it right
+        # after the cursor is collapsed as it would be without paging
+        previous = db.session.execute(
+            select(Position.position)
+            .where(Position.driver_session_id == session_id, Position.date <= after)
+            .order_by(Position.date.desc())
+            .limit(1)
+        ).scalar()
+        query = query.where(Position.date > after)
+
+    rows = db.session.execute(
+        query.order_by(Position.date).execution_options(
+            yield_per=POSITIONS_STREAM_BATCH
+        )
+    )
+    with closing(rows):
+        for row in rows:
+            if row.position != previous:
+                previous = row.position
+                yield tuple(row)
+
+
+@cached_result
+def get_session_positions_page(session_id, after=None, limit=POSITIONS_PAGE_SIZE):
+    """
+    Retrieves one page of position data for a driver session, keyed on the
+    date of the last position of the previous page. ``next_after`` is the
+    cursor of the following page, or None on the last page.
+    """
+    if not session_id:
+        raise ValueError("session_id parameter is required")
+    if not 1 <= limit <= POSITIONS_MAX_PAGE_SIZE:
+        raise ValueError(f"limit must be between 1 and {POSITIONS_MAX_PAGE_SIZE}")
+
+    driver_session = db.session.get(DriverSession, session_id)
+    if not driver_session:
+        return None
+
+    with closing(iter_session_positions(session_id, after)) as rows:
+        positions = list(islice(rows, limit + 1))
+
+    next_after = positions[limit - 1]["date"] if len(positions) > limit else None
+    return {
+        "driver_session": driver_session.to_dict(),
+        "positions": positions[:limit],
+        "next_after": next_after,
+    }
+
+
+def stream_session_positions(session_id, after=None):
+    """
+    Returns a lazy iterator over the positions of a driver session, or None
+    if it does not exist. No positions are read until it is iterated.
+    """
+    if not session_id:
+        raise ValueError("session_id parameter is required")
+    if not db.session.get(DriverSession, session_id):
+        return None
+    return iter_session_positions(session_id, after)
+
+
+@cached_result
+def get_session_position_columns(session_id, after=None, limit=None):
+    """
+    Retrieves the positions of a driver session as columns: ``id``,
+    ``date`` in ms since the Unix epoch and ``position``. They are built
+    from packed timelines or query tuples, without a dict per position.
+    With ``limit``, one page is returned as in get_session_positions_page.
+    """
+    if not session_id:
+        raise ValueError("session_id parameter is required")
+    if limit is not None and not 1 <= limit <= POSITIONS_MAX_PAGE_SIZE:
+        raise ValueError(f"limit must be between 1 and {POSITIONS_MAX_PAGE_SIZE}")
+
+    driver_session = db.session.get(DriverSession, session_id)
+    if not driver_session:
+        return None
+
+    dates = None
+    timeline = PositionTimeline.query.filter_by(driver_session_id=session_id).first()
+    if timeline:
+        ids, times, positions = timeline_columns(timeline, after)
+    else:
+        with closing(_iter_position_rows(session_id, after)) as rows:
+            rows = list(rows if limit is None else islice(rows, limit + 1))
+        ids, dates, positions = map(list, zip(*rows)) if rows else ([], [], [])
+        times = [to_epoch_ms(date) for date in dates]
+
+    next_after = None
+    if limit is not None and len(ids) > limit:
+        # Stored dates are exact, so they make the cursor when available
+        last = dates[limit - 1] if dates else from_epoch_ms(times[limit - 1])
+        next_after = last.isoformat()
+        ids, times, positions = ids[:limit], times[:limit], positions[:limit]
 
     return {
         "driver_session": driver_session.to_dict(),
-        "positions": [p.to_dict() for p in positions],
+        "positions": {
+            "id": list(ids),
+            "date": list(times),
+            "position": list(positions),
+        },
+        "next_after": next_after,
     }
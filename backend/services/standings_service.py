@@ -0,0 +1,140 @@
+from sqlalchemy import select, text
+
+from extensions import db
+from models import ConstructorStats, DriverSessionStats, DriverStats, Session
+
+# Statements that rebuild one season of the materialized standings tables.
+# They run in order, each reading the table refreshed before it. Positions
+# are ranked within each season and stored, so standings reads are a range
+# scan of the (year, position) index however many seasons are stored.
+REFRESH_SQL = {
+    "driver_session_stats": """
+    INSERT INTO driver_session_stats (
+        driver_number, full_name, team_name, session_name, session_type,
+        location, date_start, final_position, fastest_lap, year, points
+    )
+    SELECT
+        d.driver_number,
+        d.full_name,
+        d.team_name,
+        s.session_name,
+        s.session_type,
+        s.location,
+        s.date_start,
+        ds.final_position,
+        ds.fastest_lap,
+        s.year,
+        CASE
+            WHEN s.session_type = 'Race' AND s.session_name = 'Race' THEN
+                CASE
+                    WHEN ds.final_position = 1 THEN 25
+                    WHEN ds.final_position = 2 THEN 18
+                    WHEN ds.final_position = 3 THEN 15
+                    WHEN ds.final_position = 4 THEN 12
+                    WHEN ds.final_position = 5 THEN 10
+                    WHEN ds.final_position = 6 THEN 8
+                    WHEN ds.final_position = 7 THEN 6
+                    WHEN ds.final_position = 8 THEN 4
+                    WHEN ds.final_position = 9 THEN 2
+                    WHEN ds.final_position = 10 THEN 1
+                    ELSE 0
+                END
+            WHEN s.session_type = 'Race' AND s.session_name = 'Spring' THEN
+                CASE
+                    WHEN ds.final_position = 1 THEN 8
+                    WHEN ds.final_position = 2 THEN 7
+                    WHEN ds.final_position = 3 THEN 6
+                    WHEN ds.final_position = 4 THEN 5
+                    WHEN ds.final_position = 5 THEN 4
+                    WHEN ds.final_position = 6 THEN 3
+                    WHEN ds.final_position = 7 THEN 2
+                    WHEN ds.final_position = 8 THEN 1
+                    ELSE 0
+                END
+            ELSE 0
+        END as points
+    FROM driver_session ds
+    JOIN driver d ON ds.driver_id = d.id
+    JOIN session s ON ds.session_id = s.id
+    WHERE s.year = :year
+    """,
+    "driver_stats": """
+    INSERT INTO driver_stats (
+        driver_number, full_name, team_name, team_colour, country_code,
+        headshot_url, is_active, year, races, points, wins, podiums,
+        fastest_laps, average_position, position
+    )
+    SELECT
+        d.driver_number,
+        d.full_name,
+        d.team_name,
+        d.team_colour,
+        d.country_code,
+        d.headshot_url,
+        d.is_active,
+        ds.year,
+        COUNT(CASE WHEN ds.session_type = 'Race' AND ds.final_position IS NOT NULL THEN 1 END) as races,
+        SUM(ds.points) as points,
+        SUM(CASE WHEN ds.session_type = 'Race' AND ds.final_position = 1 THEN 1 ELSE 0 END) as wins,
+        SUM(CASE WHEN ds.session_type = 'Race' AND ds.final_position >= 1 AND ds.final_position <= 3 THEN 1 ELSE 0 END) as podiums,
+        SUM(CASE WHEN ds.session_type = 'Race' AND ds.fastest_lap = TRUE THEN 1 ELSE 0 END) as fastest_laps,
+        AVG(CASE WHEN ds.session_type = 'Race' AND ds.final_position IS NOT NULL THEN ds.final_position END) as average_position,
+        ROW_NUMBER() OVER (
+            PARTITION BY ds.year
+            ORDER BY
+                SUM(ds.points) desc,
+                SUM(CASE WHEN ds.session_type = 'Race' AND ds.final_position = 1 THEN 1 ELSE 0 END) desc,
+                d.driver_number
+        ) as position
+    FROM driver_session_stats ds
+    JOIN driver d ON ds.driver_number = d.driver_number
+    WHERE ds.year = :year
+    GROUP BY d.driver_number, d.full_name, d.team_name, ds.year
+    HAVING races > 0
+    """,  # noqa: E501
+    "constructor_stats": """
+    INSERT INTO constructor_stats (
+        team_name, team_colour, year, points, wins, podiums, fastest_laps,
+        races, position
+    )
+    SELECT
+        d.team_name,
+        d.team_colour,
+        d.year,
+        SUM(d.points) as points,
+        SUM(d.wins) as wins,
+        SUM(d.podiums) as podiums,
+        SUM(d.fastest_laps) as fastest_laps,
+        SUM(d.races) as races,
+        ROW_NUMBER() OVER (
+            PARTITION BY d.year
+            ORDER BY SUM(d.points) desc, SUM(d.wins) desc, d.team_name
+        ) as position
+    FROM driver_stats d
+    WHERE d.team_name NOT NULL AND d.year = :year
+    GROUP BY d.team_name, d.year
+    """,
+}
+
+STANDINGS_MODELS = (DriverSessionStats, DriverStats, ConstructorStats)
+
+
+def refresh_standings(year):
+    """
+    Rebuilds one season of the standings tables from driver sessions.
+    Other seasons are left untouched, so the cost depends only on the size
+    of the season being refreshed.
+    Returns the number of driver standings rows written.
+    """
+    for model in reversed(STANDINGS_MODELS):
+        model.query.filter_by(year=year).delete(synchronize_session=False)
+    for sql in REFRESH_SQL.values():
+        db.session.execute(text(sql), {"year": year})
+    db.session.commit()
+    return DriverStats.query.filter_by(year=year).count()
+
+
+def refresh_all_standings():
+    """Rebuilds the standings of every season with sessions stored."""
+    years = db.session.execute(select(Session.year).distinct()).scalars().all()
+    return {year: refresh_standings(year) for year in sorted(years)}
@@ -1,9 +1,18 @@
 import asyncio
-from datetime import datetime, timezone
+import hashlib
+import json
+import time
+from collections import defaultdict, deque
+from contextlib import nullcontext
+from functools import partial
+from datetime import datetime, timedelta, timezone
 
 import aiohttp
 from dateutil.relativedelta import relativedelta
 from flask import current_app
+from sqlalchemy import and_, delete, func, insert, inspect, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from extensions import db
 from models import (
@@ -12,8 +21,31 @@ from models import (
     DriverSession,
     Position,
     Lap,
+    SyncCheckpoint,
     YearData,
 )
+from services.api_cache import invalidate_year
+from services.bundle_service import store_season_bundle
+from services.openf1_cache import ResponseCache
+from services.position_timeline import build_position_timelines
+from services.rate_limiter import RateLimiter, parse_retry_after
+from services.results_service import (
+    derive_session_results,
+    sessions_for_driver_sessions,
+)
+from services.overview_service import refresh_season_summary
+from services.standings_service import refresh_standings
+from services.timestamps import TimestampDecoder, parse_timestamp
+
+# Number of rows sent to the database per INSERT ... ON CONFLICT statement
+BULK_INSERT_CHUNK_SIZE = 5000
+
+# Number of keys per IN (...) prefetch when upserting reference tables
+IN_CLAUSE_CHUNK_SIZE = 500
+
+# Position ingest mode: "changes" stores only the samples where a driver's
+# position changes, "full" stores every sample
+POSITION_STORAGE_MODES = ("full", "changes")
 
 
 def make_aware(dt):
@@ -23,33 +55,109 @@ def make_aware(dt):
     return dt
 
 
-async def fetch_data_async(session, endpoint, params, max_retries=3, initial_delay=1):
-    """Fetch data asynchronously with retries for rate limiting"""
+def _build_rate_limiter():
+    """
+    Creates the rate limiter shared by every OpenF1 request in one sync.
+    If the app was given a shared token bucket (as backfill workers are),
+    the request budget is shared with every process using that bucket.
+    """
+    config = current_app.config
+    return RateLimiter(
+        rate=config["OPENF1_REQUESTS_PER_SECOND"],
+        max_in_flight=config["OPENF1_MAX_IN_FLIGHT"],
+        bucket=config.get("OPENF1_SHARED_BUCKET"),
+    )
+
+
+def _db_write_lock():
+    """
+    Returns the lock serializing bulk writes across processes, if the app
+    was given one (as backfill workers are), or a no-op context.
+    """
+    return current_app.config.get("SYNC_DB_WRITE_LOCK") or nullcontext()
+
+
+def _build_response_cache(year):
+    """
+    Creates the OpenF1 response cache for syncing a season.
+    Past seasons never change, so their entries never expire.
+    """
+    config = current_app.config
+    is_finished_season = year < datetime.now(timezone.utc).year
+    return ResponseCache(
+        directory=config["OPENF1_CACHE_DIR"],
+        mode=config["OPENF1_CACHE_MODE"],
+        ttl=None if is_finished_season else config["OPENF1_CACHE_TTL"],
+    )
+
+
+async def fetch_data_async(
+    session,
+    endpoint,
+    params,
+    max_retries=3,
+    initial_delay=1,
+    limiter=None,
+    cache=None,
+):
+    """
+    Fetch data asynchronously with retries for rate limiting.
+    When a shared limiter is given, every attempt waits for it and a 429
+    pauses the limiter for the server's Retry-After, slowing down every
+    request that shares it.
+    When a response cache is given, fresh entries are served from disk and
+    successful responses are stored; in replay mode the network is never used.
+    """
     url = f"https://api.openf1.org/v1/{endpoint}"
     retry_count = 0
     delay = initial_delay
     logger = current_app.logger
 
+    if cache:
+        hit, data = cache.get(endpoint, params)
+        if hit:
+            return data
+        if cache.replay:
+            logger.warning(f"Replay cache miss: {endpoint} with params: {params}")
+            return None
+
     while retry_count <= max_retries:
         try:
-            logger.info(f"Requesting: {url} with params: {params}")
-            async with session.get(url, params=params) as response:
-                status = response.status
-                if status == 200:
-                    return await response.json()
-                elif status == 429:
-                    if retry_count < max_retries:
-                        logger.warning(f"Rate limited. Retrying in {delay}s.")
-                        await asyncio.sleep(delay)
-                        delay *= 2
-                        retry_count += 1
+            async with limiter.slot() if limiter else nullcontext():
+                logger.info(f"Requesting: {url} with params: {params}")
+                async with session.get(url, params=params) as response:
+                    status = response.status
+                    if status == 200:
+                        data = await response.json()
+                        if cache:
+                            cache.set(endpoint, params, data)
+                        return data
+                    elif status == 404:
+                        # OpenF1 answers queries without results with a 404.
+                        # It is cached like any result, so replays find it
+                        if cache:
+                            cache.set(endpoint, params, [])
+                        return []
+                    elif status == 429:
+                        retry_after = parse_retry_after(
+                            response.headers.get("Retry-After")
+                        )
                     else:
-                        logger.error("Max retries reached after rate limit.")
+                        error_text = await response.text()
+                        logger.error(f"HTTP Error {status}: {error_text}")
                         return None
-                else:
-                    error_text = await response.text()
-                    logger.error(f"HTTP Error {status}: {error_text}")
-                    return None
+
+            if retry_count >= max_retries:
+                logger.error("Max retries reached after rate limit.")
+                return None
+            wait = retry_after if retry_after is not None else delay
+            logger.warning(f"Rate limited. Retrying in {wait}s.")
+            if limiter:
+                limiter.pause(wait)
+            else:
+                await asyncio.sleep(wait)
+            delay *= 2
+            retry_count += 1
         except aiohttp.ClientError as e:
             logger.error(f"ClientError during request: {e}")
             if retry_count < max_retries:
@@ -62,8 +170,71 @@ async def fetch_data_async(session, endpoint, params, max_retries=3, initial_del
     return None
 
 
-async def run_sync_for_year(year):
-    """Orchestrates the data synchronization for a given year."""
+class SyncProgress:
+    """
+    Records the phase and percent complete of a running sync on its
+    YearData row, and forwards every update to an optional callback.
+    """
+
+    def __init__(self, year_data, on_update=None):
+        self.year_data = year_data
+        self.on_update = on_update
+
+    def update(self, phase, percent):
+        percent = int(min(max(percent, 0), 100))
+        unchanged = (
+            self.year_data.sync_message == phase
+            and self.year_data.sync_progress == percent
+        )
+        if unchanged and not _heartbeat_due(self.year_data):
+            return
+        self.year_data.sync_progress = percent
+        self.year_data.sync_message = phase
+        self.year_data.sync_heartbeat = datetime.utcnow()
+        db.session.commit()
+        if self.on_update and not unchanged:
+            self.on_update(phase, percent)
+
+    def windows(self, phase, total, start, end):
+        """
+        Returns a callback that advances progress from ``start`` to ``end``
+        percent over ``total`` completed windows.
+        """
+        done = 0
+
+        def advance():
+            nonlocal done
+            done += 1
+            self.update(phase, start + (end - start) * done / max(total, 1))
+
+        return advance
+
+
+def _heartbeat_due(year_data):
+    """Returns whether a running sync should refresh its heartbeat."""
+    beat = year_data.sync_heartbeat
+    return beat is None or datetime.utcnow() - beat > timedelta(
+        seconds=current_app.config["SYNC_STALE_SECONDS"] / 10
+    )
+
+
+def is_sync_stale(year_data):
+    """
+    Returns whether a sync left in progress has stopped beating for longer
+    than SYNC_STALE_SECONDS, as when the process running it died.
+    """
+    beat = year_data.sync_heartbeat
+    return beat is None or datetime.utcnow() - beat > timedelta(
+        seconds=current_app.config["SYNC_STALE_SECONDS"]
+    )
+
+
+async def run_sync_for_year(year, on_progress=None):
+    """
+    Orchestrates the data synchronization for a given year.
+    ``on_progress(phase, percent)`` is called whenever the sync advances.
+    Returns a summary including the row counts written per table.
+    """
     logger = current_app.logger
     year_data = YearData.query.filter_by(year=year).first()
     if not year_data:
@@ -72,22 +243,54 @@ async def run_sync_for_year(year):
         db.session.commit()
 
     if year_data.sync_status == "in_progress":
-        raise Exception("Sync for this year is already in progress.")
+        if not is_sync_stale(year_data):
+            raise Exception("Sync for this year is already in progress.")
+        # Its process died; the checkpoints let this run skip what it wrote
+        logger.warning(
+            f"Resuming the {year} sync interrupted at: {year_data.sync_message}"
+        )
 
     year_data.sync_status = "in_progress"
+    year_data.sync_progress = 0
     year_data.sync_message = "Starting sync..."
+    year_data.sync_heartbeat = datetime.utcnow()
     db.session.commit()
+    progress = SyncProgress(year_data, on_progress)
 
     try:
-        await _fetch_and_process_data(year, year_data)
+        rows = await _fetch_and_process_data(year, year_data, progress)
 
-        year_data.sync_status = "completed"
-        year_data.sync_message = "Sync completed successfully."
+        failed_windows = rows.get("failed_windows")
+        year_data.sync_progress = 100
         year_data.last_synced = datetime.utcnow()
-        year_data.last_incremental_sync = datetime.utcnow()
-        db.session.commit()
-        logger.info(f"Sync for year {year} completed successfully.")
-        return {"success": True, "message": f"Sync for {year} completed."}
+        if failed_windows:
+            # Checkpoints and the incremental start are kept, so the next
+            # sync fetches only the windows that failed
+            year_data.sync_status = "incomplete"
+            year_data.sync_message = (
+                f"{failed_windows} windows could not be fetched; "
+                "sync again to fetch them."
+            )
+            message = f"Sync for {year} is incomplete: {year_data.sync_message}"
+            db.session.commit()
+            logger.warning(message)
+        else:
+            year_data.sync_status = "completed"
+            year_data.sync_message = "Sync completed successfully."
+            year_data.last_incremental_sync = datetime.utcnow()
+            message = f"Sync for {year} completed."
+            db.session.commit()
+            # Checkpoints only exist to resume an interrupted run
+            clear_checkpoints(year)
+            logger.info(f"Sync for year {year} completed successfully.")
+        invalidate_year(year)
+        _store_bundle(year)
+        return {
+            "success": not failed_windows,
+            "status": year_data.sync_status,
+            "message": message,
+            "rows": rows,
+        }
 
     except Exception as e:
         db.session.rollback()
@@ -95,69 +298,249 @@ async def run_sync_for_year(year):
         year_data.sync_status = "error"
         year_data.sync_message = str(e)
         db.session.commit()
+        # Windows written before the failure are already visible
+        invalidate_year(year)
         raise e
 
 
-async def _fetch_and_process_data(year, year_data):
-    """Handles the core data fetching and processing logic."""
+def _store_bundle(year):
+    """
+    Prebuilds the season bundle from the freshly synced data. A failure
+    only leaves the bundle to be built on its first request.
+    """
+    try:
+        with _db_write_lock():
+            store_season_bundle(year)
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.warning(f"Could not build the {year} bundle: {e}")
+
+
+async def _fetch_and_process_data(year, year_data, progress=None):
+    """
+    Handles the core data fetching and processing logic.
+    Returns the row counts written per table.
+    """
     logger = current_app.logger
     logger.info("Initializing sync...")
+    progress = progress or SyncProgress(year_data)
+    _require_position_key()
 
+    limiter = _build_rate_limiter()
+    cache = _build_response_cache(year)
     async with aiohttp.ClientSession() as session:
-        sessions_data = await _get_sessions_data(session, year, year_data)
+        progress.update("Fetching sessions", 5)
+        sessions_data = await _get_sessions_data(
+            session, year, year_data, limiter, cache
+        )
         if not sessions_data:
             raise Exception(f"No sessions found for year {year}")
 
-        drivers_data = await _get_drivers_data(session, year, sessions_data)
+        progress.update("Fetching drivers", 10)
+        drivers_data = await _get_drivers_data(
+            session, year, sessions_data, limiter, cache
+        )
         if not drivers_data:
             raise Exception(f"No drivers found for year {year}")
 
+        progress.update("Processing drivers and sessions", 20)
         logger.info("Processing drivers...")
-        _process_drivers(drivers_data)
+        drivers = _process_drivers(drivers_data)
 
         logger.info("Processing sessions...")
-        _process_sessions(sessions_data, year)
+        sessions = _process_sessions(sessions_data, year)
 
-        _process_driver_sessions(drivers_data)
+        resolver = DriverSessionResolver().load(year)
+        driver_sessions = _process_driver_sessions(drivers_data, resolver)
 
         logger.info("Processing positions and laps...")
-        await _process_positions_and_laps(session, year, year_data)
+        changed = set()
+        failed = []
+        inserted = await _process_positions_and_laps(
+            session,
+            year,
+            year_data,
+            limiter,
+            cache,
+            resolver,
+            progress,
+            changed,
+            failed,
+        )
 
+    progress.update("Deriving results", 96)
+    results = _derive_results(changed)
+    progress.update("Building position timelines", 98)
+    timelines = _build_timelines(changed)
+    progress.update("Refreshing standings", 99)
+    with _db_write_lock():
+        standings = refresh_standings(year)
+        refresh_season_summary(year)
+
+    return {
+        "drivers": drivers,
+        "sessions": sessions,
+        "driver_sessions": driver_sessions,
+        "positions": inserted["position"],
+        "laps": inserted["laps"],
+        "results": results,
+        "timelines": timelines,
+        "standings": standings,
+        "failed_windows": len(failed),
+    }
 
-async def _get_sessions_data(session, year, year_data):
+
+def _derive_results(changed_driver_sessions):
+    """
+    Re-derives final positions and fastest laps for the sessions whose
+    positions or laps changed during this sync.
+    Returns the number of sessions derived.
+    """
+    session_ids = sessions_for_driver_sessions(changed_driver_sessions)
+    if not session_ids:
+        return 0
+    current_app.logger.info(f"Deriving results for {len(session_ids)} sessions...")
+    with _db_write_lock():
+        return derive_session_results(session_ids)
+
+
+def _build_timelines(changed_driver_sessions):
+    """
+    Repacks the position timelines of driver sessions that gained rows.
+    Returns the number of timelines written.
+    """
+    if not changed_driver_sessions:
+        return 0
+    with _db_write_lock():
+        return build_position_timelines(changed_driver_sessions)
+
+
+async def _get_sessions_data(session, year, year_data, limiter=None, cache=None):
     """Fetches session data from cache or API."""
     logger = current_app.logger
 
     logger.info("Fetching sessions from API...")
-    sessions_data = await fetch_data_async(session, "sessions", {"year": year})
+    sessions_data = await fetch_data_async(
+        session, "sessions", {"year": year}, limiter=limiter, cache=cache
+    )
     if not sessions_data:
         return None
 
     return sessions_data
 
 
-async def _get_drivers_data(session, year, sessions_data):
-    """Fetches driver data for all sessions in a year."""
+async def _get_drivers_data(session, year, sessions_data, limiter=None, cache=None):
+    """
+    Fetches driver data for all sessions in a year.
+    Requests run concurrently, bounded by the shared limiter.
+    """
     logger = current_app.logger
     logger.info("Fetching drivers for each session...")
     session_keys = [s["session_key"] for s in sessions_data]
     tasks = [
-        fetch_data_async(session, "drivers", {"session_key": key})
+        fetch_data_async(
+            session, "drivers", {"session_key": key}, limiter=limiter, cache=cache
+        )
         for key in session_keys
     ]
     results = await asyncio.gather(*tasks)
     return [item for sublist in results if sublist for item in sublist]
 
 
+def _same_value(current, new):
+    """Compares column values, treating naive datetimes as UTC."""
+    if isinstance(current, datetime) and isinstance(new, datetime):
+        return make_aware(current) == make_aware(new)
+    return current == new
+
+
+def _upsert_reference_rows(model, key_columns, rows, chunk_size=IN_CLAUSE_CHUNK_SIZE):
+    """
+    Upserts rows into a reference table identified by ``key_columns``.
+    Existing rows are prefetched with one IN query per chunk of keys. New
+    rows are bulk inserted, changed rows are bulk updated by primary key and
+    rows whose values all match are not touched.
+    Returns ``(counts, ids)``: insert/update/unchanged counts and a map of
+    each row's key to its primary key.
+    """
+    table = model.__table__
+    key_cols = [table.c[name] for name in key_columns]
+    value_names = [name for name in rows[0] if name not in key_columns] if rows else []
+    key_of = (
+        (lambda row: row[key_columns[0]])
+        if len(key_columns) == 1
+        else (lambda row: tuple(row[name] for name in key_columns))
+    )
+    key_expr = key_cols[0] if len(key_cols) == 1 else tuple_(*key_cols)
+
+    # Prefetch and write under one lock so concurrent syncs cannot race
+    with _db_write_lock():
+        rows_by_key = {key_of(row): row for row in rows}
+        keys = list(rows_by_key)
+        existing = {}
+        for start in range(0, len(keys), chunk_size):
+            chunk = keys[start : start + chunk_size]
+            result = db.session.execute(
+                select(table.c.id, *key_cols, *[table.c[n] for n in value_names]).where(
+                    key_expr.in_(chunk)
+                )
+            )
+            for record in result.mappings():
+                existing[key_of(record)] = record
+
+        ids = {}
+        inserts, updates = [], []
+        counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+        for key, row in rows_by_key.items():
+            record = existing.get(key)
+            if record is None:
+                inserts.append(row)
+                continue
+            ids[key] = record["id"]
+            if all(_same_value(record[name], row[name]) for name in value_names):
+                counts["unchanged"] += 1
+            else:
+                updates.append({"id": record["id"], **row})
+
+        if inserts:
+            stmt = insert(table).returning(table.c.id, *key_cols)
+            for start in range(0, len(inserts), chunk_size):
+                result = db.session.execute(stmt, inserts[start : start + chunk_size])
+                for record in result.mappings():
+                    ids[key_of(record)] = record["id"]
+            counts["inserted"] = len(inserts)
+
+        if updates:
+            db.session.execute(update(model), updates)
+            counts["updated"] = len(updates)
+
+        db.session.commit()
+    current_app.logger.info(
+        f"Upserted {table.name}: {counts['inserted']} inserted, "
+        f"{counts['updated']} updated, {counts['unchanged']} unchanged"
+    )
+    return counts, ids
+
+
 def _process_drivers(drivers_data):
-    """Upserts driver information into the database."""
+    """
+    Upserts driver information into the database.
+    Returns the insert/update/unchanged counts.
+    """
     unique_drivers_data = {}
     for d in drivers_data:
         driver_number = d.get("driver_number")
         if not driver_number:
             continue
         if driver_number not in unique_drivers_data:
-            unique_drivers_data[driver_number] = {"driver_number": driver_number}
+            unique_drivers_data[driver_number] = {
+                "driver_number": driver_number,
+                "full_name": None,
+                "team_name": None,
+                "team_colour": None,
+                "country_code": None,
+                "headshot_url": None,
+            }
 
         for key in [
             "full_name",
@@ -169,46 +552,59 @@ def _process_drivers(drivers_data):
             if d.get(key) is not None:
                 unique_drivers_data[driver_number][key] = d.get(key)
 
-    for driver_data in unique_drivers_data.values():
-        driver = Driver.query.filter_by(
-            driver_number=driver_data["driver_number"]
-        ).first()
-        if not driver:
-            driver = Driver(driver_number=driver_data["driver_number"])
-            db.session.add(driver)
-        driver.full_name = driver_data.get("full_name")
-        driver.team_name = driver_data.get("team_name")
-        driver.team_colour = driver_data.get("team_colour")
-        driver.country_code = driver_data.get("country_code")
-        driver.headshot_url = driver_data.get("headshot_url")
-    db.session.commit()
+    counts, _ = _upsert_reference_rows(
+        Driver, ["driver_number"], list(unique_drivers_data.values())
+    )
+    return counts
 
 
 def _process_sessions(sessions_data, year):
-    """Upserts session information into the database."""
+    """
+    Upserts session information into the database.
+    Returns the insert/update/unchanged counts.
+    """
+    rows = []
     for session_data in sessions_data:
-        session = Session.query.filter_by(
-            session_key=session_data["session_key"]
-        ).first()
-        if not session:
-            session = Session(session_key=session_data["session_key"])
-            db.session.add(session)
         date_start = session_data.get("date_start")
-        session.session_name = session_data.get("session_name")
-        session.date_start = (
-            make_aware(datetime.fromisoformat(date_start.replace("Z", "+00:00")))
-            if date_start
-            else None
+        date_end = session_data.get("date_end")
+        rows.append(
+            {
+                "session_key": session_data["session_key"],
+                "session_name": session_data.get("session_name"),
+                "date_start": parse_timestamp(date_start) if date_start else None,
+                "date_end": parse_timestamp(date_end) if date_end else None,
+                "session_type": session_data.get("session_type"),
+                "meeting_key": session_data.get("meeting_key"),
+                "location": session_data.get("location"),
+                "year": year,
+            }
         )
-        session.session_type = session_data.get("session_type")
-        session.meeting_key = session_data.get("meeting_key")
-        session.location = session_data.get("location")
-        session.year = year
-    db.session.commit()
+
+    counts, _ = _upsert_reference_rows(Session, ["session_key"], rows)
+    return counts
 
 
-def _process_driver_sessions(drivers_data):
-    """Creates driver_session records from driver data."""
+async def refresh_sessions(year):
+    """
+    Fetches a season's sessions from OpenF1 and upserts them, filling
+    fields such as ``date_end`` for sessions stored before they were kept.
+    Returns the insert/update/unchanged counts.
+    """
+    async with aiohttp.ClientSession() as session:
+        sessions_data = await _get_sessions_data(
+            session, year, None, _build_rate_limiter(), _build_response_cache(year)
+        )
+    if not sessions_data:
+        raise Exception(f"No sessions found for year {year}")
+    return _process_sessions(sessions_data, year)
+
+
+def _process_driver_sessions(drivers_data, resolver=None):
+    """
+    Creates driver_session records from driver data.
+    New and existing records are registered with the resolver, if given.
+    Returns the insert/unchanged counts.
+    """
     logger = current_app.logger
     logger.info("Processing driver sessions...")
 
@@ -219,27 +615,28 @@ def _process_driver_sessions(drivers_data):
 
     if not driver_numbers or not session_keys:
         logger.info("No driver numbers or session keys found in data to process.")
-        return
-
-    drivers = Driver.query.filter(Driver.driver_number.in_(driver_numbers)).all()
-    driver_map = {d.driver_number: d.id for d in drivers}
+        return {"inserted": 0, "updated": 0, "unchanged": 0}
 
-    sessions = Session.query.filter(Session.session_key.in_(session_keys)).all()
-    session_map = {s.session_key: s.id for s in sessions}
-
-    processed_pairs = set()
+    driver_map = dict(
+        db.session.query(Driver.driver_number, Driver.id)
+        .filter(Driver.driver_number.in_(driver_numbers))
+        .all()
+    )
+    session_map = dict(
+        db.session.query(Session.session_key, Session.id)
+        .filter(Session.session_key.in_(session_keys))
+        .all()
+    )
 
+    pairs = {}
     for data in drivers_data:
         driver_number = data.get("driver_number")
         session_key = data.get("session_key")
 
         if not driver_number or not session_key:
             continue
-
-        pair = (driver_number, session_key)
-        if pair in processed_pairs:
+        if (session_key, driver_number) in pairs:
             continue
-        processed_pairs.add(pair)
 
         driver_id = driver_map.get(driver_number)
         session_id = session_map.get(session_key)
@@ -251,20 +648,40 @@ def _process_driver_sessions(drivers_data):
             logger.warning(f"Session {session_key} not found in database.")
             continue
 
-        # Check if DriverSession already exists to avoid duplicates
-        existing = DriverSession.query.filter_by(
-            driver_id=driver_id, session_id=session_id
-        ).first()
-
-        if not existing:
-            driver_session = DriverSession(driver_id=driver_id, session_id=session_id)
-            db.session.add(driver_session)
-
-    db.session.commit()
+        pairs[(session_key, driver_number)] = (driver_id, session_id)
 
+    counts, ids = _upsert_reference_rows(
+        DriverSession,
+        ["driver_id", "session_id"],
+        [
+            {"driver_id": driver_id, "session_id": session_id}
+            for driver_id, session_id in pairs.values()
+        ],
+    )
 
-async def _process_positions_and_laps(session, year, year_data):
-    """Fetches and processes position and lap data for a given year."""
+    if resolver is not None:
+        for (session_key, driver_number), key in pairs.items():
+            resolver.add(session_key, driver_number, ids[key])
+    return counts
+
+
+async def _process_positions_and_laps(
+    session,
+    year,
+    year_data,
+    limiter=None,
+    cache=None,
+    resolver=None,
+    progress=None,
+    changed=None,
+    failed=None,
+):
+    """
+    Fetches and processes position and lap data for a given year.
+    The ids of driver sessions that gained rows are added to ``changed``,
+    and windows that could not be fetched to ``failed``.
+    Returns the number of new rows inserted per endpoint.
+    """
     logger = current_app.logger
     is_current_year = year == datetime.now(timezone.utc).year
 
@@ -285,86 +702,467 @@ async def _process_positions_and_laps(session, year, year_data):
     )
 
     start_date, end_date = start_date_dt.isoformat(), end_date_dt.isoformat()
+    if resolver is None:
+        resolver = DriverSessionResolver().load(year)
+
+    # Windows finished by an earlier, interrupted run are not fetched again
+    done_windows = _load_checkpoints(year)
+    windows = _month_windows(start_date, end_date)
+    endpoints = [("position", "date"), ("laps", "date_start")]
+    skipped = sum(
+        _window_key(*window) in done_windows[endpoint]
+        for endpoint, _ in endpoints
+        for window in windows
+    )
+    if skipped:
+        logger.info(f"Resuming sync: skipping {skipped} checkpointed windows")
+        # Rows written by the interrupted run were never derived
+        if changed is not None:
+            changed.update(resolver.driver_session_ids())
+
+    # Stream position and lap windows to the database writer as they arrive
+    queue = asyncio.Queue(maxsize=current_app.config["SYNC_QUEUE_SIZE"])
+    producers = [
+        _produce_windows(
+            queue,
+            session,
+            endpoint,
+            start_date,
+            end_date,
+            param,
+            limiter,
+            cache,
+            done_windows[endpoint],
+        )
+        for endpoint, param in endpoints
+    ]
+    on_window = None
+    if progress:
+        total = len(endpoints) * len(windows) - skipped
+        on_window = progress.windows("Syncing positions and laps", total, 25, 95)
+    if failed is None:
+        failed = []
+    inserted = await _run_pipeline(
+        queue,
+        producers,
+        _write_windows(queue, resolver, on_window, year, changed, failed),
+    )
 
-    # Fetch position and lap data
-    pos_task = fetch_data_by_month(session, "position", start_date, end_date, "date")
-    lap_task = fetch_data_by_month(session, "laps", start_date, end_date, "date_start")
-    positions_data, laps_data = await asyncio.gather(pos_task, lap_task)
-
-    if positions_data:
-        logger.info(f"Processing {len(positions_data)} position records...")
-        _process_positions_batch(positions_data)
+    # Update the last incremental sync time for current year, unless a
+    # window is missing and has to be fetched again from there
+    if is_current_year and not failed:
+        year_data.last_incremental_sync = datetime.utcnow()
 
-    if laps_data:
-        logger.info(f"Processing {len(laps_data)} lap records...")
-        _process_laps_batch(laps_data)
+    db.session.commit()
+    return inserted
+
+
+def _load_checkpoints(year):
+    """Returns the window keys already completed for a year, per endpoint."""
+    done = defaultdict(set)
+    checkpoints = db.session.query(
+        SyncCheckpoint.endpoint,
+        SyncCheckpoint.window_start,
+        SyncCheckpoint.window_end,
+    ).filter_by(year=year)
+    for endpoint, window_start, window_end in checkpoints:
+        done[endpoint].add((window_start, window_end))
+    return done
+
+
+def _record_checkpoint(year, endpoint, window, records):
+    """Marks a fetched window as fully written, with its size and payload hash."""
+    window_start, window_end = _window_key(*window)
+    payload = json.dumps(records, sort_keys=True, separators=(",", ":"))
+    with _db_write_lock():
+        db.session.add(
+            SyncCheckpoint(
+                year=year,
+                endpoint=endpoint,
+                window_start=window_start,
+                window_end=window_end,
+                row_count=len(records),
+                payload_hash=hashlib.sha256(payload.encode("utf-8")).hexdigest(),
+            )
+        )
+        db.session.commit()
 
-    # Update the last incremental sync time for current year
-    if is_current_year:
-        year_data.last_incremental_sync = datetime.utcnow()
 
+def clear_checkpoints(year, endpoint=None):
+    """Forgets completed windows so the next sync fetches them again."""
+    query = SyncCheckpoint.query.filter_by(year=year)
+    if endpoint:
+        query = query.filter_by(endpoint=endpoint)
+    deleted = query.delete(synchronize_session=False)
     db.session.commit()
+    return deleted
+
+
+async def _run_pipeline(queue, producers, consumer):
+    """
+    Runs fetch producers and a database writer concurrently over a bounded
+    queue. Producers block once the queue is full, so at most
+    ``queue.maxsize`` windows are held in memory at a time. If any stage
+    fails the others are cancelled and the error is re-raised.
+    Returns the consumer's result.
+    """
+    producer_tasks = [asyncio.create_task(p) for p in producers]
+    consumer_task = asyncio.create_task(consumer)
+
+    async def _close_when_done():
+        await asyncio.gather(*producer_tasks)
+        await queue.put(None)
+
+    closer_task = asyncio.create_task(_close_when_done())
+    tasks = [*producer_tasks, closer_task, consumer_task]
+    try:
+        done, _ = await asyncio.wait(
+            [closer_task, consumer_task], return_when=asyncio.FIRST_EXCEPTION
+        )
+        for task in done:
+            task.result()
+        return await consumer_task
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _produce_windows(
+    queue,
+    session,
+    endpoint,
+    start_date,
+    end_date,
+    param,
+    limiter=None,
+    cache=None,
+    skip=None,
+):
+    """
+    Fetches an endpoint month by month and queues each window, skipping
+    windows already checkpointed.
+    """
+    async for window, window_data in stream_data_by_month(
+        session, endpoint, start_date, end_date, param, limiter, cache, skip
+    ):
+        await queue.put((endpoint, window, window_data))
+
+
+async def _write_windows(
+    queue, resolver, on_window=None, year=None, changed=None, failed=None
+):
+    """
+    Consumes queued windows and commits each one as soon as it arrives.
+    When a year is given, every successfully fetched window is checkpointed
+    after it is written; windows whose fetch failed are added to ``failed``
+    as ``(endpoint, window)``. ``on_window`` is called after every window,
+    including empty ones.
+    Returns the number of new rows inserted per endpoint.
+    """
+    logger = current_app.logger
+    decoder = TimestampDecoder()
+    processors = {
+        "position": partial(_process_positions_batch, decoder=decoder, changed=changed),
+        "laps": partial(_process_laps_batch, changed=changed),
+    }
+    inserted = {endpoint: 0 for endpoint in processors}
+
+    while True:
+        item = await queue.get()
+        if item is None:
+            return inserted
+        endpoint, window, window_data = item
+        month_str = window[0].strftime("%Y-%m")
+        if window_data:
+            logger.info(
+                f"Processing {len(window_data)} {endpoint} records for {month_str}..."
+            )
+            inserted[endpoint] += processors[endpoint](window_data, resolver)
+        if window_data is None:
+            logger.warning(f"Could not fetch {endpoint} for {month_str}")
+            if failed is not None:
+                failed.append((endpoint, window))
+        elif year is not None:
+            _record_checkpoint(year, endpoint, window, window_data)
+        if on_window:
+            on_window()
+
+
+class DriverSessionResolver:
+    """
+    Sync-scoped map of ``(session_key, driver_number) -> driver_session.id``.
+    Loaded for a whole season in one query, kept current as driver sessions
+    are inserted, and shared by every record processor in the sync.
+    Pairs missing from the map are looked up once and the result remembered,
+    including misses.
+    """
+
+    def __init__(self):
+        self._ids = {}
+        self._missing = set()
+
+    def __len__(self):
+        return len(self._ids)
+
+    def driver_session_ids(self):
+        """Returns the ids of every driver session in the map."""
+        return set(self._ids.values())
+
+    def load(self, year):
+        """Loads every driver session of a season in a single query."""
+        rows = (
+            db.session.query(
+                Session.session_key, Driver.driver_number, DriverSession.id
+            )
+            .select_from(DriverSession)
+            .join(Session)
+            .join(Driver)
+            .filter(Session.year == year)
+            .all()
+        )
+        for session_key, driver_number, driver_session_id in rows:
+            self.add(session_key, driver_number, driver_session_id)
+        return self
+
+    def add(self, session_key, driver_number, driver_session_id):
+        key = (session_key, driver_number)
+        self._ids[key] = driver_session_id
+        self._missing.discard(key)
+
+    def get(self, session_key, driver_number):
+        """Returns the driver_session id for a pair, or None if unknown."""
+        key = (session_key, driver_number)
+        if key in self._ids:
+            return self._ids[key]
+        if key in self._missing:
+            return None
+
+        driver_session_id = (
+            db.session.query(DriverSession.id)
+            .join(Session)
+            .join(Driver)
+            .filter(
+                Session.session_key == session_key,
+                Driver.driver_number == driver_number,
+            )
+            .scalar()
+        )
+        if driver_session_id:
+            self._ids[key] = driver_session_id
+        else:
+            current_app.logger.warning(
+                f"Could not find driver_session for {session_key}, {driver_number}"
+            )
+            self._missing.add(key)
+        return driver_session_id
+
+
+def _require_position_key():
+    """
+    Refuses to sync into a position table without its unique key on
+    (driver_session_id, date), as in a database created before the key and
+    not yet migrated: ON CONFLICT DO NOTHING would store every sample again.
+    """
+    inspector = inspect(db.session.connection())
+    keys = [
+        index["column_names"]
+        for index in inspector.get_indexes(Position.__tablename__)
+        if index["unique"]
+    ]
+    keys += [
+        constraint["column_names"]
+        for constraint in inspector.get_unique_constraints(Position.__tablename__)
+    ]
+    if {"driver_session_id", "date"} not in map(set, keys):
+        raise Exception(
+            "The position table has no unique key on (driver_session_id, date). "
+            "Run `flask db upgrade` before syncing."
+        )
+
 
+def _bulk_insert_ignore(model, rows, chunk_size=BULK_INSERT_CHUNK_SIZE):
+    """
+    Inserts rows in chunks with INSERT ... ON CONFLICT DO NOTHING.
+    Rows that collide with a unique constraint are skipped by the database.
+    Returns the number of rows actually inserted.
+    """
+    if db.session.get_bind().dialect.name == "postgresql":
+        insert = postgresql_insert
+    else:
+        insert = sqlite_insert
+
+    stmt = insert(model.__table__).on_conflict_do_nothing()
+    inserted = 0
+    with _db_write_lock():
+        for start in range(0, len(rows), chunk_size):
+            result = db.session.execute(stmt, rows[start : start + chunk_size])
+            inserted += max(result.rowcount, 0)
+        db.session.commit()
+    return inserted
 
-def _get_driver_session_id(cache, session_key, driver_number):
-    """Helper to get driver_session_id from cache or DB."""
-    cache_key = (session_key, driver_number)
-    if cache_key in cache:
-        return cache[cache_key]
 
-    driver_session_id = (
-        db.session.query(DriverSession.id)
-        .join(Session)
-        .join(Driver)
-        .filter(
-            Session.session_key == session_key,
-            Driver.driver_number == driver_number,
-        )
-        .scalar()
+def _log_throughput(label, received, inserted, started):
+    """Logs how many rows a bulk ingest wrote and at what rate."""
+    elapsed = time.perf_counter() - started
+    rate = inserted / elapsed if elapsed > 0 else float(inserted)
+    current_app.logger.info(
+        f"Ingested {label}: {inserted} new of {received} received "
+        f"in {elapsed:.2f}s ({rate:,.0f} rows/sec)"
     )
-    if driver_session_id:
-        cache[cache_key] = driver_session_id
-    return driver_session_id
 
 
-def _process_positions_batch(positions_data):
-    """Processes a batch of position data."""
-    logger = current_app.logger
-    cache = {}
+def _process_positions_batch(positions_data, resolver=None, decoder=None, changed=None):
+    """
+    Bulk inserts a batch of position data, skipping rows already stored.
+    Timestamps are decoded once per distinct value for the whole batch.
+    If rows were inserted, their driver session ids are added to ``changed``.
+    Returns the number of new rows.
+    """
+    if resolver is None:
+        resolver = DriverSessionResolver()
+    if decoder is None:
+        decoder = TimestampDecoder()
+    started = time.perf_counter()
+    matched = []
     for pos in positions_data:
         session_key = pos.get("session_key")
         driver_number = pos.get("driver_number")
         if not session_key or not driver_number:
             continue
 
-        driver_session_id = _get_driver_session_id(cache, session_key, driver_number)
+        driver_session_id = resolver.get(session_key, driver_number)
         if not driver_session_id:
-            logger.warning(
-                f"Could not find driver_session for {session_key}, " f"{driver_number}"
-            )
             continue
+        matched.append((driver_session_id, pos))
+
+    dates = decoder.decode_many([pos["date"] for _, pos in matched])
+    rows = {}
+    for (driver_session_id, pos), date in zip(matched, dates):
+        # Deduplicate in memory on the (driver_session_id, date) unique key
+        rows[(driver_session_id, date)] = {
+            "driver_session_id": driver_session_id,
+            "date": date,
+            "position": pos["position"],
+        }
+    rows = list(rows.values())
+    if _position_storage_mode() == "changes":
+        rows = _position_changes(rows)
+
+    inserted = _bulk_insert_ignore(Position, rows)
+    if inserted and changed is not None:
+        changed.update(row["driver_session_id"] for row in rows)
+    _log_throughput("positions", len(positions_data), inserted, started)
+    return inserted
+
+
+def _position_storage_mode():
+    mode = current_app.config["POSITION_STORAGE_MODE"]
+    if mode not in POSITION_STORAGE_MODES:
+        raise ValueError(f"Unknown position storage mode: {mode}")
+    return mode
+
+
+def _position_changes(rows):
+    """
+    Run-length encodes position rows: keeps a sample only if the driver's
+    position differs from their previous sample, including the last one
+    already stored before this batch.
+    """
+    if not rows:
+        return rows
+
+    rows = sorted(rows, key=lambda row: (row["driver_session_id"], row["date"]))
+    first_date = min(row["date"] for row in rows)
+    previous = _positions_before(
+        {row["driver_session_id"] for row in rows},
+        make_aware(first_date).astimezone(timezone.utc).replace(tzinfo=None),
+    )
 
-        date = make_aware(datetime.fromisoformat(pos["date"].replace("Z", "+00:00")))
-
-        # Check if position already exists to avoid duplicates in incremental sync
-        existing_position = Position.query.filter_by(
-            driver_session_id=driver_session_id, date=date, position=pos["position"]
-        ).first()
-
-        if not existing_position:
-            position = Position(
-                driver_session_id=driver_session_id,
-                date=date,
-                position=pos["position"],
+    changes = []
+    for row in rows:
+        driver_session_id = row["driver_session_id"]
+        if previous.get(driver_session_id) != row["position"]:
+            changes.append(row)
+            previous[driver_session_id] = row["position"]
+    return changes
+
+
+def _positions_before(driver_session_ids, before):
+    """
+    Returns each driver session's last stored position before a date, as
+    ``{driver_session_id: position}``.
+    """
+    ids = list(driver_session_ids)
+    previous = {}
+    for start in range(0, len(ids), IN_CLAUSE_CHUNK_SIZE):
+        chunk = ids[start : start + IN_CLAUSE_CHUNK_SIZE]
+        latest = (
+            select(
+                Position.driver_session_id,
+                func.max(Position.date).label("date"),
             )
-            db.session.add(position)
-    db.session.commit()
-
-
-def _process_laps_batch(laps_data):
-    """Processes a batch of lap data."""
-    logger = current_app.logger
-    cache = {}
+            .where(Position.driver_session_id.in_(chunk), Position.date < before)
+            .group_by(Position.driver_session_id)
+            .subquery()
+        )
+        previous.update(
+            db.session.execute(
+                select(Position.driver_session_id, Position.position).join(
+                    latest,
+                    and_(
+                        Position.driver_session_id == latest.c.driver_session_id,
+                        Position.date == latest.c.date,
+                    ),
+                )
+            ).all()
+        )
+    return previous
+
+
+def compact_positions(year=None):
+    """
+    Deletes stored position samples that repeat the driver's previous
+    position, leaving only the samples where it changes.
+    Returns the number of position rows before and after compaction.
+    """
+    scope = select(DriverSession.id)
+    if year is not None:
+        scope = scope.join(Session).where(Session.year == year)
+    in_scope = Position.driver_session_id.in_(scope)
+
+    def count_rows():
+        return db.session.scalar(select(func.count(Position.id)).where(in_scope))
+
+    before = count_rows()
+    previous = (
+        func.lag(Position.position)
+        .over(partition_by=Position.driver_session_id, order_by=Position.date)
+        .label("previous")
+    )
+    ranked = select(Position.id, Position.position, previous).where(in_scope).subquery()
+    repeated = select(ranked.c.id).where(ranked.c.position == ranked.c.previous)
+    with _db_write_lock():
+        db.session.execute(
+            delete(Position)
+            .where(Position.id.in_(repeated))
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+    return before, count_rows()
+
+
+def _process_laps_batch(laps_data, resolver=None, changed=None):
+    """
+    Bulk inserts a batch of lap data, skipping laps already stored.
+    If rows were inserted, their driver session ids are added to ``changed``.
+    Returns the number of new rows.
+    """
+    if resolver is None:
+        resolver = DriverSessionResolver()
+    started = time.perf_counter()
+    rows = {}
     for lap in laps_data:
         if not lap.get("lap_duration"):
             continue
@@ -374,52 +1172,99 @@ def _process_laps_batch(laps_data):
         if not session_key or not driver_number:
             continue
 
-        driver_session_id = _get_driver_session_id(cache, session_key, driver_number)
+        driver_session_id = resolver.get(session_key, driver_number)
         if not driver_session_id:
-            logger.warning(
-                f"Could not find driver_session for {session_key}, " f"{driver_number}"
-            )
             continue
 
-        # Check if lap already exists to avoid duplicates in incremental sync
-        existing_lap = Lap.query.filter_by(
-            driver_session_id=driver_session_id, lap_number=lap.get("lap_number", 0)
-        ).first()
+        # Deduplicate in memory on the (driver_session_id, lap_number) unique key
+        lap_number = lap.get("lap_number", 0)
+        rows[(driver_session_id, lap_number)] = {
+            "driver_session_id": driver_session_id,
+            "lap_number": lap_number,
+            "lap_time": lap.get("lap_duration"),
+            "is_fastest": False,
+        }
 
-        if not existing_lap:
-            new_lap = Lap(
-                driver_session_id=driver_session_id,
-                lap_number=lap.get("lap_number", 0),
-                lap_time=lap.get("lap_duration"),
-            )
-            db.session.add(new_lap)
-    db.session.commit()
+    inserted = _bulk_insert_ignore(Lap, list(rows.values()))
+    if inserted and changed is not None:
+        changed.update(driver_session_id for driver_session_id, _ in rows)
+    _log_throughput("laps", len(laps_data), inserted, started)
+    return inserted
 
 
-async def fetch_data_by_month(
-    session, endpoint, start_date, end_date, param_name="date"
-):
-    """Fetch data month by month to handle large datasets"""
-    all_data = []
-    current_date = make_aware(datetime.fromisoformat(start_date.replace("Z", "+00:00")))
-    final_date = make_aware(datetime.fromisoformat(end_date.replace("Z", "+00:00")))
+def _window_key(window_start, window_end):
+    """Returns a window's bounds as naive UTC datetimes, as the database stores them."""
+    return (
+        make_aware(window_start).astimezone(timezone.utc).replace(tzinfo=None),
+        make_aware(window_end).astimezone(timezone.utc).replace(tzinfo=None),
+    )
+
+
+def _month_windows(start_date, end_date):
+    """Splits an ISO date range into calendar-month sized windows."""
+    current_date = parse_timestamp(start_date)
+    final_date = parse_timestamp(end_date)
 
+    windows = []
     while current_date < final_date:
         next_date = current_date + relativedelta(months=1)
         if next_date > final_date:
             next_date = final_date
-
+        windows.append((current_date, next_date))
+        current_date = next_date
+    return windows
+
+
+async def stream_data_by_month(
+    session,
+    endpoint,
+    start_date,
+    end_date,
+    param_name="date",
+    limiter=None,
+    cache=None,
+    skip=None,
+):
+    """
+    Fetch data month by month to handle large datasets.
+    Up to ``limiter.max_in_flight`` months are fetched concurrently (one at a
+    time without a limiter). Yields a ``((start, end), records)`` tuple for
+    every month in date order, so each window is written after the ones
+    before it and callers never hold more than that many months of records
+    at a time. ``records`` is None when the fetch failed. Windows whose
+    ``_window_key`` is in ``skip`` are not fetched.
+    """
+    concurrency = limiter.max_in_flight if limiter else 1
+    skip = skip or set()
+
+    async def fetch_window(window_start, window_end):
         params = {
-            f"{param_name}>": current_date.isoformat(),
-            f"{param_name}<": next_date.isoformat(),
+            f"{param_name}>": window_start.isoformat(),
+            f"{param_name}<": window_end.isoformat(),
         }
-
-        month_str = current_date.strftime("%Y-%m")
+        month_str = window_start.strftime("%Y-%m")
         current_app.logger.info(f"Fetching {endpoint} for {month_str}")
-        month_data = await fetch_data_async(session, endpoint, params)
-        if month_data:
-            all_data.extend(month_data)
-        current_date = next_date
-        await asyncio.sleep(0.5)
+        data = await fetch_data_async(
+            session, endpoint, params, limiter=limiter, cache=cache
+        )
+        return (window_start, window_end), data
 
-    return all_data
+    windows = [
+        window
+        for window in _month_windows(start_date, end_date)
+        if _window_key(*window) not in skip
+    ]
+    # Later months are fetched while an earlier one is in flight but only
+    # yielded after it: run-length encoded positions compare each window
+    # with the samples already stored before it
+    pending = deque()
+    try:
+        for window_start, window_end in windows:
+            pending.append(asyncio.create_task(fetch_window(window_start, window_end)))
+            if len(pending) >= concurrency:
+                yield await pending.popleft()
+        while pending:
+            yield await pending.popleft()
+    finally:
+        for task in pending:
+            task.cancel()
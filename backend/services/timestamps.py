@@ -0,0 +1,56 @@
+from datetime import datetime, timezone
+
+# Largest number of distinct timestamps a TimestampDecoder keeps before it
+# starts over, so a long-lived decoder cannot grow without bound
+TIMESTAMP_CACHE_SIZE = 200000
+
+
+def parse_timestamp(value):
+    """
+    Parses an OpenF1 ISO 8601 timestamp into a UTC-aware datetime.
+    Accepts both the ``Z`` and ``+00:00`` suffixes; naive values are
+    assumed to be UTC.
+    """
+    dt = datetime.fromisoformat(value)
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+class TimestampDecoder:
+    """
+    Decodes OpenF1 timestamps, parsing each distinct string only once.
+    Every driver in a session reports at the same instants, so a window of
+    position data repeats the same few thousand timestamps many times over.
+    """
+
+    def __init__(self, max_size=TIMESTAMP_CACHE_SIZE):
+        self.max_size = max_size
+        self._cache = {}
+
+    def __len__(self):
+        return len(self._cache)
+
+    def decode(self, value):
+        """Returns the UTC-aware datetime for one timestamp string."""
+        dt = self._cache.get(value)
+        if dt is None:
+            if len(self._cache) >= self.max_size:
+                self._cache.clear()
+            dt = self._cache[value] = parse_timestamp(value)
+        return dt
+
+    def decode_many(self, values):
+        """
+        Decodes a batch of timestamp strings at once.
+        Returns the datetimes in input order; each distinct value is parsed
+        once no matter how often it repeats.
+        """
+        cache = self._cache
+        missing = set(values).difference(cache)
+        if len(cache) + len(missing) > self.max_size:
+            cache.clear()
+            missing = set(values)
+        for value in missing:
+            cache[value] = parse_timestamp(value)
+        return [cache[value] for value in values]
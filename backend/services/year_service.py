@@ -1,3 +1,10 @@
+import hashlib
+import json
+from datetime import datetime
+
+from flask import g, has_app_context, has_request_context
+
+from extensions import db
 from models import YearData
 
 
@@ -28,3 +35,70 @@ def get_available_years_with_details():
         years_data.append(year_info)
 
     return years_data
+
+
+def get_data_version(year=None):
+    """
+    Returns ``(etag, last_modified)`` for the data of a season, or of all
+    seasons when no year is given. Both come from the YearData bookkeeping
+    alone: its sync state, counts and data generation, which syncs and
+    every command that changes served data advance. They can be checked
+    before any stats query runs.
+    """
+    query = db.session.query(
+        YearData.year,
+        YearData.last_synced,
+        YearData.last_incremental_sync,
+        YearData.sync_status,
+        YearData.sync_progress,
+        YearData.sync_message,
+        YearData.drivers_count,
+        YearData.sessions_count,
+        YearData.data_generation,
+        YearData.data_changed_at,
+    )
+    if year:
+        query = query.filter(YearData.year == year)
+    rows = [tuple(row) for row in query.order_by(YearData.year)]
+
+    state = json.dumps([year, rows], default=str).encode("utf-8")
+    etag = hashlib.sha1(state).hexdigest()
+    changes = [change for row in rows for change in (row[1], row[-1]) if change]
+    last_modified = max(changes, default=None)
+    return etag, last_modified
+
+
+def get_current_data_version(year=None):
+    """
+    Returns ``get_data_version(year)``, read at most once per request and
+    season: the validators and every cached service call of a request
+    share it. ``forget_data_versions`` drops what was read.
+    """
+    if not has_request_context():
+        return get_data_version(year)
+    versions = g.setdefault("data_versions", {})
+    if year not in versions:
+        versions[year] = get_data_version(year)
+    return versions[year]
+
+
+def forget_data_versions(*args):
+    """Drops the data versions read by ``get_current_data_version``."""
+    if has_app_context():
+        g.pop("data_versions", None)
+
+
+def bump_data_generation(year):
+    """
+    Records that the served data of a season has changed, so the
+    validators built from it change too.
+    """
+    YearData.query.filter_by(year=year).update(
+        {
+            YearData.data_generation: YearData.data_generation + 1,
+            YearData.data_changed_at: datetime.utcnow(),
+        },
+        synchronize_session=False,
+    )
+    db.session.commit()
+    forget_data_versions()
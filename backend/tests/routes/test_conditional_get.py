@@ -0,0 +1,184 @@
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from extensions import db
+from models import YearData
+from services.api_cache import invalidate_year
+
+
+@pytest.fixture
+def synced_year(app):
+    """
+    Fixture that stores a synced season and removes it afterwards.
+    """
+    year_data = YearData(
+        year=2023,
+        sync_status="completed",
+        sync_progress=100,
+        last_synced=datetime(2024, 1, 2, 3, 4, 5),
+    )
+    db.session.add(year_data)
+    db.session.commit()
+    yield year_data
+    db.session.delete(year_data)
+    db.session.commit()
+
+
+def test_response_has_validators(client, synced_year):
+    """
+    Tests that season data responses carry an ETag and Last-Modified.
+    """
+    with patch(
+        "routes.constructors.constructor_service.get_constructor_standings_by_year"
+    ) as mock_get_standings:
+        mock_get_standings.return_value = [{"team_name": "Red Bull Racing"}]
+        response = client.get("/api/constructors/2023")
+
+    assert response.status_code == 200
+    assert response.headers["ETag"].startswith('W/"')
+    assert response.headers["Last-Modified"] == "Tue, 02 Jan 2024 03:04:05 GMT"
+
+
+def test_matching_etag_skips_the_view(client, synced_year):
+    """
+    Tests that a matching If-None-Match is answered with 304 before the
+    view queries anything.
+    """
+    with patch(
+        "routes.constructors.constructor_service.get_constructor_standings_by_year"
+    ) as mock_get_standings:
+        mock_get_standings.return_value = [{"team_name": "Red Bull Racing"}]
+        etag = client.get("/api/constructors/2023").headers["ETag"]
+        mock_get_standings.reset_mock()
+
+        response = client.get("/api/constructors/2023", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.data == b""
+    assert response.headers["ETag"] == etag
+    mock_get_standings.assert_not_called()
+
+
+def test_sync_changes_etag(client, synced_year):
+    """
+    Tests that the ETag of a season changes when its sync state does.
+    """
+    with patch("routes.drivers.driver_service.get_driver_stats") as mock_get_drivers:
+        mock_get_drivers.return_value = [{"driver_number": 1}]
+        etag = client.get("/api/drivers/?year=2023").headers["ETag"]
+
+        synced_year.last_synced = datetime(2024, 2, 1)
+        db.session.commit()
+        response = client.get(
+            "/api/drivers/?year=2023", headers={"If-None-Match": etag}
+        )
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_data_change_changes_validators(client, synced_year):
+    """
+    Tests that invalidating a season, as commands that change its data do,
+    changes its ETag and Last-Modified although its sync state is unchanged.
+    """
+    with patch("routes.drivers.driver_service.get_driver_stats") as mock_get_drivers:
+        mock_get_drivers.return_value = [{"driver_number": 1}]
+        etag = client.get("/api/drivers/?year=2023").headers["ETag"]
+
+        invalidate_year(2023)
+        response = client.get(
+            "/api/drivers/?year=2023",
+            headers={
+                "If-None-Match": etag,
+                "If-Modified-Since": "Tue, 02 Jan 2024 03:04:05 GMT",
+            },
+        )
+        modified = client.get(
+            "/api/drivers/?year=2023",
+            headers={"If-Modified-Since": "Tue, 02 Jan 2024 03:04:05 GMT"},
+        )
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert modified.status_code == 200
+
+
+def test_other_season_keeps_etag(client, synced_year):
+    """
+    Tests that syncing one season leaves the ETag of another unchanged.
+    """
+    other = YearData(
+        year=2022, sync_status="completed", last_synced=datetime(2023, 1, 1)
+    )
+    db.session.add(other)
+    db.session.commit()
+    with patch(
+        "routes.constructors.constructor_service.get_constructor_standings_by_year"
+    ) as mock_get_standings:
+        mock_get_standings.return_value = [{"team_name": "Ferrari"}]
+        etag = client.get("/api/constructors/2022").headers["ETag"]
+
+        synced_year.sync_status = "in_progress"
+        db.session.commit()
+        response = client.get("/api/constructors/2022", headers={"If-None-Match": etag})
+
+    db.session.delete(other)
+    db.session.commit()
+    assert response.status_code == 304
+
+
+def test_if_modified_since(client, synced_year):
+    """
+    Tests that If-Modified-Since at or after the last sync is answered
+    with 304.
+    """
+    with patch(
+        "routes.constructors.constructor_service.get_constructor_standings_by_year"
+    ) as mock_get_standings:
+        mock_get_standings.return_value = [{"team_name": "Red Bull Racing"}]
+        not_modified = client.get(
+            "/api/constructors/2023",
+            headers={"If-Modified-Since": "Tue, 02 Jan 2024 03:04:05 GMT"},
+        )
+        modified = client.get(
+            "/api/constructors/2023",
+            headers={"If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"},
+        )
+
+    assert not_modified.status_code == 304
+    assert modified.status_code == 200
+    mock_get_standings.assert_called_once_with(2023)
+
+
+def test_error_responses_have_no_validators(client, synced_year):
+    """
+    Tests that error responses are not given an ETag.
+    """
+    with patch(
+        "routes.constructors.constructor_service.get_constructor_standings_by_year"
+    ) as mock_get_standings:
+        mock_get_standings.return_value = []
+        response = client.get("/api/constructors/2023")
+
+    assert response.status_code == 404
+    assert "ETag" not in response.headers
+
+
+def test_sync_status_uses_content_etag(client, synced_year):
+    """
+    Tests that sync responses are validated by a hash of their body.
+    """
+    response = client.get("/api/sync/status/2023")
+    etag = response.headers["ETag"]
+
+    cached = client.get("/api/sync/status/2023", headers={"If-None-Match": etag})
+    synced_year.sync_progress = 50
+    db.session.commit()
+    changed = client.get("/api/sync/status/2023", headers={"If-None-Match": etag})
+
+    assert cached.status_code == 304
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
@@ -0,0 +1,66 @@
+import gzip
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import patch
+
+BUNDLE = SimpleNamespace(
+    etag="abc123",
+    content=gzip.compress(b'{"year":2023}'),
+    built_at=datetime(2024, 1, 2, 3, 4, 5),
+)
+
+
+def test_get_season_bundle(client):
+    """
+    Tests the /seasons/<year>/bundle endpoint without gzip support.
+    """
+    with patch("routes.seasons.bundle_service.get_season_bundle") as mock_get:
+        mock_get.return_value = BUNDLE
+        response = client.get("/api/seasons/2023/bundle")
+        assert response.status_code == 200
+        assert response.json == {"year": 2023}
+        assert response.headers["ETag"] == 'W/"abc123"'
+        assert response.headers["Last-Modified"] == "Tue, 02 Jan 2024 03:04:05 GMT"
+        assert "Content-Encoding" not in response.headers
+        mock_get.assert_called_once_with(2023)
+
+
+def test_get_season_bundle_gzip(client):
+    """
+    Tests that the /seasons/<year>/bundle endpoint serves the stored bytes
+    to clients accepting gzip.
+    """
+    with patch("routes.seasons.bundle_service.get_season_bundle") as mock_get:
+        mock_get.return_value = BUNDLE
+        response = client.get(
+            "/api/seasons/2023/bundle", headers={"Accept-Encoding": "gzip, br"}
+        )
+        assert response.status_code == 200
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.headers["Vary"] == "Accept-Encoding"
+        assert response.data == BUNDLE.content
+
+
+def test_get_season_bundle_not_modified(client):
+    """
+    Tests that the /seasons/<year>/bundle endpoint answers a matching
+    If-None-Match with 304 and no body.
+    """
+    with patch("routes.seasons.bundle_service.get_season_bundle") as mock_get:
+        mock_get.return_value = BUNDLE
+        response = client.get(
+            "/api/seasons/2023/bundle", headers={"If-None-Match": 'W/"abc123"'}
+        )
+        assert response.status_code == 304
+        assert response.data == b""
+
+
+def test_get_season_bundle_not_found(client):
+    """
+    Tests the /seasons/<year>/bundle endpoint for a season without data.
+    """
+    with patch("routes.seasons.bundle_service.get_season_bundle") as mock_get:
+        mock_get.return_value = None
+        response = client.get("/api/seasons/2019/bundle")
+        assert response.status_code == 404
+        assert response.json == {"error": "No data found for this season"}
@@ -1,5 +1,8 @@
+from datetime import datetime
 from unittest.mock import patch
 
+from services.position_timeline import unpack_columns
+
 
 def test_get_sessions(client):
     """
@@ -70,3 +73,143 @@ def test_get_sessions_internal_error(client):
         response = client.get("/api/sessions")
         assert response.status_code == 500
         assert response.json == {"error": "An internal error occurred"}
+
+
+def test_get_session_positions_page(client):
+    """
+    Tests the /sessions/<session_id>/positions endpoint with a page cursor.
+    """
+    with patch(
+        "routes.sessions.session_service.get_session_positions_page"
+    ) as mock_get_page:
+        mock_get_page.return_value = {
+            "driver_session": {},
+            "positions": [{"id": 2}],
+            "next_after": None,
+        }
+        response = client.get(
+            "/api/sessions/1/positions?after=2023-03-05T15:00:00&limit=50"
+        )
+        assert response.status_code == 200
+        assert response.json["positions"] == [{"id": 2}]
+        mock_get_page.assert_called_once_with(1, datetime(2023, 3, 5, 15), 50)
+
+
+def test_get_session_positions_bad_cursor(client):
+    """
+    Tests the /sessions/<session_id>/positions endpoint with an invalid cursor.
+    """
+    response = client.get("/api/sessions/1/positions?after=yesterday")
+    assert response.status_code == 400
+    assert response.json == {"error": "Invalid after cursor: yesterday"}
+
+
+def test_get_session_positions_ndjson(client):
+    """
+    Tests that the /sessions/<session_id>/positions endpoint streams one
+    position per line.
+    """
+    with patch(
+        "routes.sessions.session_service.stream_session_positions"
+    ) as mock_stream:
+        mock_stream.return_value = iter([{"id": 1}, {"id": 2}])
+        response = client.get("/api/sessions/1/positions?format=ndjson")
+        assert response.status_code == 200
+        assert response.mimetype == "application/x-ndjson"
+        assert response.is_streamed
+        assert response.data == b'{"id": 1}\n{"id": 2}\n'
+        mock_stream.assert_called_once_with(1, None)
+
+
+def test_get_session_positions_ndjson_not_found(client):
+    """
+    Tests that streaming the positions of a missing session returns 404.
+    """
+    with patch(
+        "routes.sessions.session_service.stream_session_positions"
+    ) as mock_stream:
+        mock_stream.return_value = None
+        response = client.get("/api/sessions/1/positions?format=ndjson")
+        assert response.status_code == 404
+
+
+def test_get_session_positions_columns(client):
+    """
+    Tests that the /sessions/<session_id>/positions endpoint returns
+    positions as columns.
+    """
+    columns = {
+        "driver_session": {},
+        "positions": {"id": [1, 2], "date": [1000, 2000], "position": [3, 2]},
+        "next_after": None,
+    }
+    with patch(
+        "routes.sessions.session_service.get_session_position_columns"
+    ) as mock_get_columns:
+        mock_get_columns.return_value = columns
+        response = client.get("/api/sessions/1/positions?format=columns")
+        assert response.status_code == 200
+        assert response.json == columns
+        mock_get_columns.assert_called_once_with(1, None, None)
+
+
+def test_get_session_positions_binary(client):
+    """
+    Tests that the /sessions/<session_id>/positions endpoint packs binary
+    positions and passes the next page cursor in a header.
+    """
+    with patch(
+        "routes.sessions.session_service.get_session_position_columns"
+    ) as mock_get_columns:
+        mock_get_columns.return_value = {
+            "driver_session": {},
+            "positions": {"id": [1, 2], "date": [1000, 2000], "position": [3, 2]},
+            "next_after": "1970-01-01T00:00:02",
+        }
+        response = client.get("/api/sessions/1/positions?format=binary&limit=2")
+        assert response.status_code == 200
+        assert response.mimetype == "application/vnd.f1stats.positions"
+        assert response.headers["X-Next-After"] == "1970-01-01T00:00:02"
+        assert unpack_columns(response.data) == (1, [1, 2], [1000, 2000], [3, 2])
+        mock_get_columns.assert_called_once_with(1, None, 2)
+
+
+def test_get_session_positions_unknown_format(client):
+    """
+    Tests that an unknown positions format is rejected.
+    """
+    response = client.get("/api/sessions/1/positions?format=xml")
+    assert response.status_code == 400
+    assert response.json == {"error": "Unknown format: xml"}
+
+
+def test_get_session_replay(client):
+    """
+    Tests the /sessions/<session_key>/replay endpoint.
+    """
+    with patch("routes.sessions.replay_service.get_session_replay") as mock_replay:
+        mock_replay.return_value = {"positions": [[1, 2]]}
+        response = client.get("/api/sessions/9158/replay?step=500ms")
+        assert response.status_code == 200
+        assert response.json == {"positions": [[1, 2]]}
+        mock_replay.assert_called_once_with(9158, 500)
+
+
+def test_get_session_replay_not_found(client):
+    """
+    Tests the /sessions/<session_key>/replay endpoint for an unknown session.
+    """
+    with patch("routes.sessions.replay_service.get_session_replay") as mock_replay:
+        mock_replay.return_value = None
+        response = client.get("/api/sessions/9158/replay")
+        assert response.status_code == 404
+        mock_replay.assert_called_once_with(9158, 1000)
+
+
+def test_get_session_replay_bad_step(client):
+    """
+    Tests the /sessions/<session_key>/replay endpoint with an invalid step.
+    """
+    response = client.get("/api/sessions/9158/replay?step=soon")
+    assert response.status_code == 400
+    assert response.json == {"error": "Invalid step: soon"}
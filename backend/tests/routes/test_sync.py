@@ -1,24 +1,41 @@
-import pytest
-import asyncio
-from unittest.mock import patch, MagicMock, AsyncMock
+from unittest.mock import patch, MagicMock
 
 
-@pytest.mark.asyncio
-async def test_sync_f1_data_route(client):
+def test_sync_f1_data_route(client):
     """
     Tests the /sync/data/<year> endpoint.
     """
-    with patch(
-        "routes.sync.run_sync_for_year", new_callable=AsyncMock
-    ) as mock_run_sync:
-        mock_run_sync.return_value = {"status": "success"}
+    with patch("routes.sync.job_service.enqueue_sync_job") as mock_enqueue:
+        mock_enqueue.return_value = {"id": 1, "year": 2023, "status": "queued"}
 
-        # Run the client call in a separate thread to avoid event loop conflicts
-        response = await asyncio.to_thread(client.post, "/api/sync/data/2023")
+        response = client.post("/api/sync/data/2023")
 
+        assert response.status_code == 202
+        assert response.json == {"id": 1, "year": 2023, "status": "queued"}
+        mock_enqueue.assert_called_once_with(2023)
+
+
+def test_get_sync_job(client):
+    """
+    Tests the /sync/jobs/<id> endpoint.
+    """
+    with patch("routes.sync.job_service.get_sync_job") as mock_get_job:
+        mock_get_job.return_value = {"id": 1, "status": "running", "progress": 40}
+        response = client.get("/api/sync/jobs/1")
         assert response.status_code == 200
-        assert response.json == {"status": "success"}
-        mock_run_sync.assert_called_once_with(2023)
+        assert response.json == {"id": 1, "status": "running", "progress": 40}
+        mock_get_job.assert_called_once_with(1)
+
+
+def test_get_sync_job_not_found(client):
+    """
+    Tests the /sync/jobs/<id> endpoint when the job does not exist.
+    """
+    with patch("routes.sync.job_service.get_sync_job") as mock_get_job:
+        mock_get_job.return_value = None
+        response = client.get("/api/sync/jobs/99")
+        assert response.status_code == 404
+        assert response.json == {"error": "Sync job not found"}
 
 
 def test_get_sync_status(client):
@@ -0,0 +1,158 @@
+import pytest
+
+from app import create_app
+from extensions import db
+from models import YearData
+from services.api_cache import cached_result
+from services.cache_backends import SQLiteCacheBackend
+from services import year_service
+from services.year_service import bump_data_generation
+
+
+@pytest.fixture
+def cached_app():
+    app = create_app(
+        {
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+            "API_CACHE_ENABLED": True,
+        }
+    )
+    with app.app_context():
+        db.create_all()
+        db.session.add_all([YearData(year=2022), YearData(year=2023)])
+        db.session.commit()
+    return app
+
+
+def test_cached_result_keys_on_arguments(cached_app):
+    """
+    Tests that service results are cached per argument set and invalidated
+    with their season.
+    """
+    calls = []
+
+    @cached_result
+    def get_standings(year, team_name=None):
+        calls.append((year, team_name))
+        return [{"year": year, "team_name": team_name}]
+
+    with cached_app.app_context():
+        assert get_standings(2023) == [{"year": 2023, "team_name": None}]
+        assert get_standings(year=2023) == [{"year": 2023, "team_name": None}]
+        get_standings(2023, "Ferrari")
+        assert len(calls) == 2
+
+        cached_app.extensions["api_cache"].bump(2023)
+        get_standings(2023)
+        assert len(calls) == 3
+
+    get_standings(2023)
+    assert len(calls) == 4
+
+
+def test_cache_follows_data_changes_from_other_processes(cached_app):
+    """
+    Tests that results stop matching when another process, such as a CLI
+    command, bumps a season's data generation in the database without
+    reaching this process's cache.
+    """
+    calls = []
+
+    @cached_result
+    def get_standings(year):
+        calls.append(year)
+        return len(calls)
+
+    with cached_app.app_context():
+        assert get_standings(2023) == 1
+        bump_data_generation(2023)
+        assert get_standings(2023) == 2
+        assert get_standings(2023) == 2
+        assert get_standings(2022) == 3
+
+
+def test_routes_store_one_entry_per_result(cached_app):
+    """
+    Tests that a request stores only the result of the service it calls,
+    not a second copy of the response built from it.
+    """
+    client = cached_app.test_client()
+    cache = cached_app.extensions["api_cache"]
+
+    client.get("/api/constructors/2023")
+    client.get("/api/constructors/2023")
+    client.get("/api/constructors/2022")
+
+    assert len(cache) == 2
+    assert all(key.startswith("result:") for key in cache._entries)
+
+
+def test_sqlite_backend_is_configurable(tmp_path):
+    """
+    Tests that the shared SQLite backend can be selected in config.
+    """
+    app = create_app(
+        {
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+            "API_CACHE_ENABLED": True,
+            "API_CACHE_BACKEND": "sqlite",
+            "API_CACHE_PATH": str(tmp_path / "api_cache.sqlite3"),
+        }
+    )
+    assert isinstance(app.extensions["api_cache"], SQLiteCacheBackend)
+
+
+def test_cache_is_off_under_testing_by_default():
+    """
+    Tests that test apps do not cache responses unless asked to.
+    """
+    app = create_app({"TESTING": True, "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:"})
+    assert "api_cache" not in app.extensions
+
+
+def test_request_reads_data_version_once(cached_app, mocker):
+    """
+    Tests that the validators and the cached services of a request share
+    one read of the season's data version.
+    """
+    get_data_version = mocker.spy(year_service, "get_data_version")
+    client = cached_app.test_client()
+
+    client.get("/api/constructors/2023")
+    client.get("/api/constructors/2023")
+
+    assert get_data_version.call_count == 2
+
+
+def test_shared_cache_follows_bumps_without_reading_versions(tmp_path, mocker):
+    """
+    Tests that a shared SQLite cache needs no data version read, and that
+    a bump from another process's backend on the same file invalidates it.
+    """
+    path = str(tmp_path / "api_cache.sqlite3")
+    app = create_app(
+        {
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+            "API_CACHE_ENABLED": True,
+            "API_CACHE_BACKEND": "sqlite",
+            "API_CACHE_PATH": path,
+        }
+    )
+    get_data_version = mocker.spy(year_service, "get_data_version")
+    calls = []
+
+    @cached_result
+    def get_standings(year):
+        calls.append(year)
+        return len(calls)
+
+    with app.app_context():
+        assert get_standings(2023) == 1
+        assert get_standings(2023) == 1
+        SQLiteCacheBackend(path, 1024).bump(2023)
+        assert get_standings(2023) == 2
+
+    assert get_data_version.call_count == 0
@@ -0,0 +1,126 @@
+import gzip
+import json
+from datetime import datetime
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from extensions import db
+from models import DriverStats, SeasonBundle, Session, YearData
+from services import bundle_service
+
+
+@pytest.fixture
+def season(app):
+    """
+    Fixture that seeds a 2023 session and standings, and cleans up afterwards.
+    """
+    with app.app_context():
+        db.session.add_all(
+            [
+                Session(
+                    session_key=9701,
+                    session_name="Race",
+                    session_type="Race",
+                    date_start=datetime(2023, 3, 5),
+                    meeting_key=9701,
+                    year=2023,
+                ),
+                DriverStats(
+                    driver_number=1, full_name="Max Verstappen", year=2023, position=1
+                ),
+            ]
+        )
+        db.session.commit()
+
+        yield
+
+        for model in (SeasonBundle, DriverStats, Session):
+            model.query.delete()
+        db.session.commit()
+
+
+def test_store_season_bundle(app, season):
+    """
+    Tests that a season's bundle holds each endpoint's data, compressed,
+    with an ETag of its content.
+    """
+    with app.app_context():
+        bundle = bundle_service.store_season_bundle(2023)
+
+        body = json.loads(gzip.decompress(bundle.content))
+        assert set(body) == {
+            "year",
+            "overview",
+            "drivers",
+            "constructors",
+            "sessions",
+            "years",
+        }
+        assert [d["driver_number"] for d in body["drivers"]] == [1]
+        assert [s["session_key"] for s in body["sessions"]] == [9701]
+        assert body["overview"]["total_sessions"] == 1
+        assert bundle.size == len(gzip.decompress(bundle.content))
+
+        rebuilt = bundle_service.store_season_bundle(2023)
+        assert rebuilt.etag == bundle.etag
+
+
+def test_store_season_bundle_keeps_other_seasons(app, season):
+    """
+    Tests that storing a bundle leaves the bundles of other seasons alone.
+    """
+    with app.app_context():
+        db.session.add(SeasonBundle(year=2022, etag="old", content=b"", size=0))
+        db.session.commit()
+
+        bundle_service.store_season_bundle(2023)
+
+        assert [b.year for b in SeasonBundle.query.order_by("year")] == [2022, 2023]
+
+
+def test_store_season_bundle_tolerates_concurrent_builds(app, season, mocker):
+    """
+    Tests that a bundle inserted by another request between the lookup and
+    the insert is returned instead of failing.
+    """
+    with app.app_context():
+        stored = bundle_service.store_season_bundle(2023)
+        mocker.patch.object(
+            db.session, "merge", side_effect=IntegrityError("", {}, Exception())
+        )
+
+        assert bundle_service.store_season_bundle(2023).etag == stored.etag
+
+
+def test_get_season_bundle(app, season):
+    """
+    Tests that a missing bundle is built on first request, and that
+    seasons without sessions have none.
+    """
+    with app.app_context():
+        assert bundle_service.get_season_bundle(2023).year == 2023
+        assert db.session.get(SeasonBundle, 2023)
+        assert bundle_service.get_season_bundle(2019) is None
+
+
+def test_get_season_bundle_rebuilds_stale_bundles(app, season, mocker):
+    """
+    Tests that a stored bundle is served until the data it was built from
+    changes: the season's data generation or the list of synced years.
+    """
+    with app.app_context():
+        bundle_service.get_season_bundle(2023)
+        spy = mocker.spy(bundle_service, "store_season_bundle")
+
+        bundle_service.get_season_bundle(2023)
+        spy.assert_not_called()
+
+        db.session.add(YearData(year=2022, last_synced=datetime(2024, 1, 1)))
+        db.session.commit()
+        bundle_service.get_season_bundle(2023)
+        bundle_service.get_season_bundle(2023)
+        assert spy.call_count == 1
+
+        YearData.query.delete()
+        db.session.commit()
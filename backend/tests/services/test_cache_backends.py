@@ -0,0 +1,92 @@
+import pytest
+
+from services.cache_backends import MemoryCacheBackend, SQLiteCacheBackend
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_backend(request, tmp_path):
+    """Fixture that builds cache backends of each kind."""
+
+    def make(max_bytes=1024):
+        if request.param == "memory":
+            return MemoryCacheBackend(max_bytes)
+        return SQLiteCacheBackend(str(tmp_path / "cache.sqlite3"), max_bytes)
+
+    return make
+
+
+def test_backend_evicts_to_stay_under_cap(make_backend):
+    """
+    Tests that backends evict the oldest entries to stay under their cap and
+    refuse values larger than it.
+    """
+    cache = make_backend(max_bytes=10)
+    cache.set("a", 2023, b"aaaa")
+    cache.set("b", 2023, b"bbbb")
+    cache.set("c", 2023, b"cccc")
+
+    assert cache.get("a", 2023) is None
+    assert cache.get("c", 2023) == b"cccc"
+
+    cache.set("huge", 2023, b"x" * 11)
+    assert cache.get("huge", 2023) is None
+
+
+def test_bump_invalidates_one_season(make_backend):
+    """
+    Tests that bumping a season drops its entries and the entries not tied
+    to a season, but keeps other seasons.
+    """
+    cache = make_backend()
+    for key, year in (("2022", 2022), ("2023", 2023), ("all", None)):
+        cache.set(key, year, b"{}")
+
+    cache.bump(2023)
+
+    assert cache.get("2022", 2022) == b"{}"
+    assert cache.get("2023", 2023) is None
+    assert cache.get("all", None) is None
+
+
+def test_set_skips_values_built_before_a_bump(make_backend):
+    """
+    Tests that a value built from data a sync has since replaced is not
+    stored.
+    """
+    cache = make_backend()
+    generation = cache.generation(2023)
+    cache.bump(2023)
+    cache.set("2023", 2023, b"{}", generation)
+    assert cache.get("2023", 2023) is None
+
+
+def test_memory_backend_is_lru():
+    """
+    Tests that reading an entry protects it from eviction.
+    """
+    cache = MemoryCacheBackend(max_bytes=10)
+    cache.set("a", 2023, b"aaaa")
+    cache.set("b", 2023, b"bbbb")
+    cache.get("a", 2023)
+    cache.set("c", 2023, b"cccc")
+
+    assert cache.get("a", 2023) == b"aaaa"
+    assert cache.get("b", 2023) is None
+    assert cache.size == 8
+
+
+def test_sqlite_backend_is_shared_between_workers(tmp_path):
+    """
+    Tests that workers opening the same cache file see each other's entries
+    and invalidations.
+    """
+    path = str(tmp_path / "shared.sqlite3")
+    first, second = SQLiteCacheBackend(path, 1024), SQLiteCacheBackend(path, 1024)
+
+    first.set("standings", 2023, b"[1, 2, 3]")
+    assert second.get("standings", 2023) == b"[1, 2, 3]"
+    assert len(second) == 1
+
+    second.bump(2023)
+    assert first.get("standings", 2023) is None
+    assert first.generation(2023) == 1
@@ -0,0 +1,171 @@
+import gzip
+import json
+import os
+from datetime import datetime
+
+import pytest
+
+from extensions import db
+from models import (
+    ConstructorStats,
+    Driver,
+    DriverSession,
+    DriverSessionStats,
+    DriverStats,
+    Position,
+    Session,
+    YearData,
+)
+from services import export_service, results_service, standings_service
+from services.api_cache import invalidate_year
+
+
+@pytest.fixture
+def synced_season(app):
+    """
+    Fixture that seeds a synced 2023 season with one race, two drivers and
+    their standings, and cleans up afterwards.
+    """
+    with app.app_context():
+        session = Session(
+            session_key=9801,
+            session_name="Race",
+            session_type="Race",
+            date_start=datetime(2023, 3, 5, 15),
+            meeting_key=9801,
+            year=2023,
+        )
+        drivers = [
+            Driver(driver_number=1, full_name="Max Verstappen", team_name="Red Bull"),
+            Driver(driver_number=16, full_name="Charles Leclerc", team_name="Ferrari"),
+        ]
+        year_data = YearData(
+            year=2023, sync_status="completed", last_synced=datetime(2024, 1, 2)
+        )
+        db.session.add_all([session, *drivers, year_data])
+        db.session.flush()
+        for place, driver in enumerate(drivers, start=1):
+            driver_session = DriverSession(driver_id=driver.id, session_id=session.id)
+            db.session.add(driver_session)
+            db.session.flush()
+            db.session.add(
+                Position(
+                    driver_session_id=driver_session.id,
+                    date=datetime(2023, 3, 5, 15),
+                    position=place,
+                )
+            )
+        db.session.commit()
+        results_service.derive_session_results([session.id])
+        standings_service.refresh_standings(2023)
+
+        yield
+
+        for model in (
+            ConstructorStats,
+            DriverStats,
+            DriverSessionStats,
+            Position,
+            DriverSession,
+            Session,
+            Driver,
+            YearData,
+        ):
+            model.query.delete()
+        db.session.commit()
+
+
+def _read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize(
+    "url, path",
+    [
+        ("/api/years/", "api/years/index.json"),
+        ("/api/drivers/?year=2023", "api/drivers/year=2023.json"),
+        (
+            "/api/drivers/sessions?year=2023&driver_number=1",
+            "api/drivers/sessions/driver_number=1&year=2023.json",
+        ),
+        (
+            "/api/constructors/Red%20Bull?year=2023",
+            "api/constructors/Red Bull/year=2023.json",
+        ),
+        ("/api/sessions/7/positions", "api/sessions/7/positions/index.json"),
+    ],
+)
+def test_url_to_path(url, path):
+    """
+    Tests that URLs map to files laid out like their path and query.
+    """
+    assert export_service.url_to_path(url) == path
+
+
+def test_url_to_path_rejects_parent_segments():
+    """
+    Tests that URLs that would leave the export directory are rejected.
+    """
+    with pytest.raises(ValueError):
+        export_service.url_to_path("/api/constructors/%2E%2E?year=2023")
+
+
+def test_export_static(app, client, synced_season, tmp_path):
+    """
+    Tests that every read endpoint of a synced season and the endpoints
+    spanning every season are written as their API responses, with gzip
+    copies.
+    """
+    with app.app_context():
+        summary = export_service.export_static(str(tmp_path))
+
+        assert summary["exported"] == [2023]
+        files = export_service.load_manifest(str(tmp_path))["seasons"]["2023"]["files"]
+        assert "api/drivers/sessions/driver_number=16&year=2023.json" in files
+        assert "api/constructors/Ferrari/year=2023.json" in files
+        assert len([f for f in files if f.endswith("/positions/index.json")]) == 2
+
+        for url in ("/api/drivers/?year=2023", "/api/constructors/2023", "/api/years/"):
+            target = tmp_path / export_service.url_to_path(url)
+            assert _read(target) == client.get(url).get_data()
+            assert gzip.decompress(_read(f"{target}.gz")) == _read(target)
+
+
+def test_export_static_is_incremental(app, synced_season, tmp_path):
+    """
+    Tests that unchanged seasons are skipped, that a data change or a new
+    sync renders the season again and drops files it no longer has, and
+    that seasons no longer synced are removed.
+    """
+    outdir = str(tmp_path)
+    with app.app_context():
+        export_service.export_static(outdir)
+        drivers_file = tmp_path / "api/drivers/year=2023.json"
+        mtime = os.stat(drivers_file).st_mtime_ns
+
+        summary = export_service.export_static(outdir)
+        assert (summary["exported"], summary["skipped"]) == ([], [2023])
+        assert os.stat(drivers_file).st_mtime_ns == mtime
+
+        invalidate_year(2023)
+        summary = export_service.export_static(outdir)
+        assert summary["exported"] == [2023]
+
+        ConstructorStats.query.filter_by(team_name="Ferrari").delete()
+        year_data = YearData.query.filter_by(year=2023).one()
+        year_data.last_synced = datetime(2024, 2, 1)
+        db.session.commit()
+        summary = export_service.export_static(outdir)
+        assert summary["exported"] == [2023]
+        assert not (tmp_path / "api/constructors/Ferrari/year=2023.json").exists()
+        assert (tmp_path / "api/constructors/Red Bull/year=2023.json").exists()
+
+        year_data = YearData.query.filter_by(year=2023).one()
+        year_data.last_synced = None
+        db.session.commit()
+        summary = export_service.export_static(outdir)
+        assert summary["removed"] == [2023]
+        assert not drivers_file.exists()
+        manifest = json.loads(_read(tmp_path / export_service.EXPORT_MANIFEST))
+        assert manifest["seasons"] == {}
@@ -0,0 +1,172 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from extensions import db
+from models import SyncJob, YearData
+from services import job_service
+
+
+@pytest.fixture
+def clean_jobs(app):
+    """
+    Fixture that removes sync jobs and year data created by a test.
+    """
+    yield
+    with app.app_context():
+        SyncJob.query.delete()
+        YearData.query.delete()
+        db.session.commit()
+
+
+def test_enqueue_sync_job(mocker, app, clean_jobs):
+    """
+    Tests that enqueueing stores a queued job and submits it to the pool
+    without running it inline.
+    """
+    mock_executor = mocker.MagicMock()
+    mocker.patch("services.job_service._get_executor", return_value=mock_executor)
+
+    with app.app_context():
+        job = job_service.enqueue_sync_job(2023)
+
+        assert job["status"] == "queued"
+        assert job["year"] == 2023
+        mock_executor.submit.assert_called_once_with(
+            job_service.run_sync_job, app, job["id"]
+        )
+
+
+def test_enqueue_sync_job_no_year():
+    """
+    Tests that enqueueing without a year raises a ValueError.
+    """
+    with pytest.raises(ValueError, match="Year parameter is required"):
+        job_service.enqueue_sync_job(None)
+
+
+def test_run_sync_job_records_progress_and_rows(mocker, app, clean_jobs):
+    """
+    Tests that a job records progress updates, row counts and timings.
+    """
+    seen = []
+
+    async def fake_sync(year, on_progress):
+        on_progress("Fetching sessions", 5)
+        seen.append(db.session.get(SyncJob, job_id).progress)
+        return {"message": "Sync for 2023 completed.", "rows": {"laps": 12}}
+
+    mocker.patch("services.job_service.run_sync_for_year", new=fake_sync)
+
+    with app.app_context():
+        job = SyncJob(year=2023, status="queued")
+        db.session.add(job)
+        db.session.commit()
+        job_id = job.id
+
+    job_service.run_sync_job(app, job_id)
+
+    with app.app_context():
+        job = job_service.get_sync_job(job_id)
+        assert seen == [5]
+        assert job["status"] == "completed"
+        assert job["progress"] == 100
+        assert job["row_counts"] == {"laps": 12}
+        assert job["duration_seconds"] >= 0
+
+
+def test_run_sync_job_records_errors(mocker, app, clean_jobs):
+    """
+    Tests that a failing sync marks the job as errored with its message.
+    """
+    mocker.patch(
+        "services.job_service.run_sync_for_year",
+        new=mocker.AsyncMock(side_effect=Exception("No sessions found for year 2023")),
+    )
+
+    with app.app_context():
+        job = SyncJob(year=2023, status="queued")
+        db.session.add(job)
+        db.session.commit()
+        job_id = job.id
+
+    job_service.run_sync_job(app, job_id)
+
+    with app.app_context():
+        job = job_service.get_sync_job(job_id)
+        assert job["status"] == "error"
+        assert job["message"] == "No sessions found for year 2023"
+        assert job["finished_at"] is not None
+
+
+def test_get_sync_job_not_found(app):
+    """
+    Tests that an unknown job id returns None.
+    """
+    with app.app_context():
+        assert job_service.get_sync_job(12345) is None
+
+
+def test_run_sync_job_records_incomplete_syncs(mocker, app, clean_jobs):
+    """
+    Tests that a sync that left windows unfetched marks the job incomplete.
+    """
+    mocker.patch(
+        "services.job_service.run_sync_for_year",
+        new=mocker.AsyncMock(
+            return_value={"status": "incomplete", "message": "2 windows failed"}
+        ),
+    )
+
+    with app.app_context():
+        job = SyncJob(year=2023, status="queued")
+        db.session.add(job)
+        db.session.commit()
+        job_id = job.id
+
+    job_service.run_sync_job(app, job_id)
+
+    with app.app_context():
+        job = job_service.get_sync_job(job_id)
+        assert job["status"] == "incomplete"
+        assert job["message"] == "2 windows failed"
+
+
+def test_get_sync_job_fails_orphaned_jobs(app, clean_jobs):
+    """
+    Tests that jobs left queued or running by a process that died are
+    reported as failed, while a job whose sync is still beating is not.
+    """
+    long_ago = datetime.utcnow() - timedelta(hours=1)
+    with app.app_context():
+        orphaned = SyncJob(
+            year=2022, status="running", created_at=long_ago, started_at=long_ago
+        )
+        lost = SyncJob(year=2021, status="queued", created_at=long_ago)
+        live = SyncJob(
+            year=2023, status="running", created_at=long_ago, started_at=long_ago
+        )
+        db.session.add_all(
+            [
+                orphaned,
+                lost,
+                live,
+                YearData(year=2022, sync_status="in_progress", sync_heartbeat=long_ago),
+                YearData(
+                    year=2023,
+                    sync_status="in_progress",
+                    sync_heartbeat=datetime.utcnow(),
+                ),
+            ]
+        )
+        db.session.commit()
+
+        assert job_service.get_sync_job(orphaned.id)["status"] == "error"
+        assert job_service.get_sync_job(live.id)["status"] == "running"
+        # A sync is still running, so the queued job may be waiting for it
+        assert job_service.get_sync_job(lost.id)["status"] == "queued"
+
+        YearData.query.filter_by(year=2023).delete()
+        db.session.commit()
+        assert job_service.get_sync_job(lost.id)["status"] == "error"
+        assert "interrupted" in job_service.get_sync_job(lost.id)["message"]
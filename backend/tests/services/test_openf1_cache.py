@@ -0,0 +1,95 @@
+import os
+
+import pytest
+
+from services.openf1_cache import ResponseCache
+
+
+class _FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_cache_round_trip(tmp_path):
+    """
+    Tests that a stored response is served back and stored compressed.
+    """
+    cache = ResponseCache(str(tmp_path))
+    params = {"session_key": 9000}
+    cache.set("drivers", params, [{"driver_number": 44}])
+
+    assert cache.get("drivers", params) == (True, [{"driver_number": 44}])
+    key = ResponseCache.make_key("drivers", params)
+    assert os.path.exists(tmp_path / "drivers" / f"{key}.json.gz")
+
+
+def test_cache_key_ignores_param_order():
+    """
+    Tests that the content address does not depend on param order.
+    """
+    assert ResponseCache.make_key("laps", {"a": 1, "b": 2}) == ResponseCache.make_key(
+        "laps", {"b": 2, "a": 1}
+    )
+    assert ResponseCache.make_key("laps", {"a": 1}) != ResponseCache.make_key(
+        "position", {"a": 1}
+    )
+
+
+def test_cache_miss(tmp_path):
+    """
+    Tests that an unknown entry is reported as a miss.
+    """
+    cache = ResponseCache(str(tmp_path))
+    assert cache.get("sessions", {"year": 2023}) == (False, None)
+
+
+def test_cache_ttl_expires_entries(tmp_path):
+    """
+    Tests that entries older than their endpoint's TTL are misses while
+    endpoints without a TTL never expire.
+    """
+    params = {"year": 2025}
+    writer = ResponseCache(str(tmp_path))
+    writer.set("sessions", params, [1])
+    writer.set("drivers", params, [2])
+    mtime = os.path.getmtime(tmp_path / "sessions")
+
+    clock = _FakeClock(mtime + 3600 + 60)
+    cache = ResponseCache(str(tmp_path), ttl={"sessions": 60}, clock=clock)
+
+    assert cache.get("sessions", params) == (False, None)
+    assert cache.get("drivers", params) == (True, [2])
+
+
+def test_replay_mode_ignores_ttl_and_never_writes(tmp_path):
+    """
+    Tests that replay mode serves stale entries and does not store anything.
+    """
+    ResponseCache(str(tmp_path)).set("laps", {"a": 1}, [1])
+    clock = _FakeClock(10**12)
+    cache = ResponseCache(str(tmp_path), mode="replay", ttl={"laps": 1}, clock=clock)
+
+    assert cache.get("laps", {"a": 1}) == (True, [1])
+    cache.set("laps", {"a": 2}, [2])
+    assert cache.get("laps", {"a": 2}) == (False, None)
+
+
+def test_off_mode_disables_cache(tmp_path):
+    """
+    Tests that the cache neither reads nor writes when turned off.
+    """
+    cache = ResponseCache(str(tmp_path), mode="off")
+    cache.set("laps", {"a": 1}, [1])
+    assert cache.get("laps", {"a": 1}) == (False, None)
+    assert not os.listdir(tmp_path)
+
+
+def test_unknown_mode():
+    """
+    Tests that an unknown cache mode raises a ValueError.
+    """
+    with pytest.raises(ValueError, match="Unknown cache mode: sometimes"):
+        ResponseCache("unused", mode="sometimes")
@@ -1,92 +1,100 @@
-from services import overview_service
-from models import Session
 from datetime import datetime
 
+import pytest
+
+from extensions import db
+from models import Driver, DriverSession, SeasonSummary, Session, YearData
+from services import overview_service
+
 
-def test_get_stats_summary(mocker, app):
+@pytest.fixture
+def seasons(app):
+    """
+    Fixture that seeds sessions in 2022 and 2023, where one 2022 driver is
+    no longer active, and cleans up afterwards.
+    """
+    with app.app_context():
+        drivers = [
+            Driver(driver_number=1, full_name="Max Verstappen", is_active=True),
+            Driver(driver_number=44, full_name="Lewis Hamilton", is_active=True),
+            Driver(driver_number=5, full_name="Sebastian Vettel", is_active=False),
+            Driver(driver_number=99, full_name="Reserve Driver", is_active=False),
+        ]
+        sessions = [
+            Session(
+                session_key=key,
+                session_name=name,
+                session_type="Race",
+                location=location,
+                date_start=date_start,
+                meeting_key=key,
+                year=date_start.year,
+            )
+            for key, name, location, date_start in (
+                (9501, "Race", "Sakhir", datetime(2022, 3, 20)),
+                (9601, "Sprint", "Baku", datetime(2023, 4, 29)),
+                (9602, "Race", "Miami", datetime(2023, 5, 7)),
+            )
+        ]
+        db.session.add_all([*drivers, *sessions, YearData(year=2022)])
+        db.session.flush()
+        entries = {9501: (1, 44, 5), 9601: (1, 44), 9602: (1,)}
+        by_number = {driver.driver_number: driver for driver in drivers}
+        for session in sessions:
+            for number in entries[session.session_key]:
+                db.session.add(
+                    DriverSession(driver_id=by_number[number].id, session_id=session.id)
+                )
+        db.session.commit()
+
+        yield
+
+        for model in (SeasonSummary, DriverSession, Session, Driver, YearData):
+            model.query.delete()
+        db.session.commit()
+
+
+def test_get_stats_summary(app, seasons):
     """
     Tests that the get_stats_summary function returns a summary of stats.
     """
     with app.app_context():
-        mock_driver_query = mocker.patch("services.overview_service.Driver.query")
-        mock_driver_query.count.return_value = 10
-
-        mock_session_query = mocker.patch("services.overview_service.Session.query")
-        mock_session_query.count.return_value = 20
-
-        mock_latest_session = mocker.MagicMock(spec=Session)
-        mock_latest_session.session_name = "Test Grand Prix"
-        mock_latest_session.location = "Test Location"
-        mock_latest_session.date_start = datetime(2023, 1, 1)
-        mock_query_chain = mock_session_query.order_by.return_value
-        mock_query_chain.first.return_value = mock_latest_session
-
-        mock_active_drivers_query = mocker.patch(
-            "services.overview_service.db.session.query"
-        )
-        mock_active_chain = mock_active_drivers_query.return_value.join.return_value
-        mock_active_chain.distinct.return_value.count.return_value = 5
-
         summary = overview_service.get_stats_summary()
 
-        assert summary["total_drivers"] == 10
-        assert summary["total_sessions"] == 20
-        assert summary["active_drivers"] == 5
-        assert summary["latest_session"]["name"] == "Test Grand Prix"
-        assert summary["year"] is None
+        assert summary == {
+            "total_drivers": 4,
+            "active_drivers": 3,
+            "total_sessions": 3,
+            "latest_session": {
+                "name": "Race",
+                "location": "Miami",
+                "date": "2023-05-07T00:00:00",
+            },
+            "year": None,
+        }
 
 
-def test_get_stats_summary_with_year(mocker, app):
+def test_get_stats_summary_with_year(app, seasons):
     """
     Tests that the get_stats_summary function returns a summary of stats
-    for a specific year.
+    for a specific year, counting only active drivers.
     """
     with app.app_context():
-        mock_drivers_query = mocker.patch("services.overview_service.db.session.query")
-        mock_driver_chain = mock_drivers_query.return_value.join.return_value
-        mock_driver_chain = mock_driver_chain.join.return_value.filter.return_value
-        mock_driver_chain.distinct.return_value.count.return_value = 2
-
-        mock_session_query = mocker.patch("services.overview_service.Session.query")
-        mock_session_query.filter.return_value.count.return_value = 5
-
-        mock_latest_session = mocker.MagicMock(spec=Session)
-        mock_latest_session.session_name = "Test Grand Prix 2023"
-        mock_latest_session.location = "Test Location 2023"
-        mock_latest_session.date_start = datetime(2023, 1, 1)
-        mock_session_chain = mock_session_query.filter.return_value
-        mock_session_chain.order_by.return_value.first.return_value = (
-            mock_latest_session
-        )
-
-        summary = overview_service.get_stats_summary(year=2023)
+        summary = overview_service.get_stats_summary(year=2022)
 
         assert summary["total_drivers"] == 2
-        assert summary["total_sessions"] == 5
         assert summary["active_drivers"] == 2
-        assert summary["latest_session"]["name"] == "Test Grand Prix 2023"
-        assert summary["year"] == 2023
+        assert summary["total_sessions"] == 1
+        assert summary["latest_session"]["location"] == "Sakhir"
+        assert summary["year"] == 2022
 
 
-def test_get_stats_summary_no_latest_session(mocker, app):
+def test_get_stats_summary_no_latest_session(app):
     """
     Tests that the get_stats_summary function handles the case where there is
     no latest session.
     """
     with app.app_context():
-        mock_driver_query = mocker.patch("services.overview_service.Driver.query")
-        mock_driver_query.count.return_value = 0
-
-        mock_session_query = mocker.patch("services.overview_service.Session.query")
-        mock_session_query.count.return_value = 0
-        mock_session_query.order_by.return_value.first.return_value = None
-
-        mock_active_drivers_query = mocker.patch(
-            "services.overview_service.db.session.query"
-        )
-        mock_active_chain = mock_active_drivers_query.return_value.join.return_value
-        mock_active_chain.distinct.return_value.count.return_value = 0
-
         summary = overview_service.get_stats_summary()
 
         assert summary["total_drivers"] == 0
@@ -94,3 +102,39 @@ def test_get_stats_summary_no_latest_session(mocker, app):
         assert summary["active_drivers"] == 0
         assert summary["latest_session"] is None
         assert summary["year"] is None
+
+
+def test_refresh_season_summary(mocker, app, seasons):
+    """
+    Tests that refreshing a season stores its summary and that of all
+    seasons, fills in the YearData counts, and that stored summaries are
+    served without aggregating again.
+    """
+    with app.app_context():
+        expected = {
+            2022: overview_service.get_stats_summary(2022),
+            None: overview_service.get_stats_summary(),
+        }
+
+        refreshed = overview_service.refresh_season_summary(2022)
+
+        assert refreshed == expected[2022]
+        year_data = YearData.query.filter_by(year=2022).one()
+        assert (year_data.drivers_count, year_data.sessions_count) == (3, 1)
+
+        compute = mocker.spy(overview_service, "_compute_summary")
+        assert overview_service.get_stats_summary(2022) == expected[2022]
+        assert overview_service.get_stats_summary() == expected[None]
+        compute.assert_not_called()
+
+
+def test_refresh_all_season_summaries(app, seasons):
+    """
+    Tests that every season with sessions gets a stored summary.
+    """
+    with app.app_context():
+        refreshed = overview_service.refresh_all_season_summaries()
+
+        assert sorted(refreshed) == [2022, 2023]
+        assert refreshed[2023]["total_sessions"] == 2
+        assert db.session.get(SeasonSummary, overview_service.ALL_SEASONS)
@@ -0,0 +1,202 @@
+from datetime import datetime
+
+import pytest
+
+from extensions import db
+from models import Driver, Session, DriverSession, Position, PositionTimeline
+from services import position_timeline, session_service
+
+
+@pytest.fixture
+def driver_session(app):
+    """
+    Fixture that seeds a driver session with repeated position samples and
+    cleans up afterwards.
+    """
+    with app.app_context():
+        driver = Driver(driver_number=16, full_name="Charles Leclerc")
+        session = Session(
+            session_key=9200,
+            session_name="Race",
+            session_type="Race",
+            date_start=datetime(2023, 3, 5),
+            meeting_key=1,
+            year=2023,
+        )
+        db.session.add_all([driver, session])
+        db.session.flush()
+        driver_session = DriverSession(driver_id=driver.id, session_id=session.id)
+        db.session.add(driver_session)
+        db.session.flush()
+        samples = [
+            (datetime(2023, 3, 5, 15, 0, 0, 250000), 4),
+            (datetime(2023, 3, 5, 15, 0, 4), 4),
+            (datetime(2023, 3, 5, 15, 12, 30), 3),
+            (datetime(2023, 3, 5, 16, 45, 1, 1000), 1),
+        ]
+        db.session.add_all(
+            [
+                Position(driver_session_id=driver_session.id, date=date, position=p)
+                for date, p in samples
+            ]
+        )
+        db.session.commit()
+
+        yield driver_session.id
+
+        for model in (PositionTimeline, Position, DriverSession, Session, Driver):
+            model.query.delete()
+        db.session.commit()
+
+
+def test_timeline_returns_same_positions(app, driver_session):
+    """
+    Tests that a session read from its packed timeline matches the answer
+    built from Position rows.
+    """
+    with app.app_context():
+        from_rows = session_service.get_session_positions(driver_session)
+
+        assert position_timeline.build_position_timelines([driver_session]) == 1
+        timeline = PositionTimeline.query.one()
+        assert timeline.sample_count == 3
+        assert len(timeline.offsets) == 12
+        assert len(timeline.positions) == 3
+
+        from_timeline = session_service.get_session_positions(driver_session)
+        assert from_timeline == from_rows
+        assert [p["position"] for p in from_timeline["positions"]] == [4, 3, 1]
+
+
+def test_build_position_timelines_replaces_existing(app, driver_session):
+    """
+    Tests that rebuilding a timeline picks up newly stored positions.
+    """
+    with app.app_context():
+        position_timeline.build_position_timelines([driver_session])
+        db.session.add(
+            Position(
+                driver_session_id=driver_session,
+                date=datetime(2023, 3, 5, 17),
+                position=2,
+            )
+        )
+        db.session.commit()
+
+        assert position_timeline.build_position_timelines([driver_session]) == 1
+        assert PositionTimeline.query.one().sample_count == 4
+
+
+def test_encode_timeline_rejects_lossy_samples():
+    """
+    Tests that samples which cannot be packed losslessly are not encoded.
+    """
+    sample = Position(id=1, date=datetime(2023, 3, 5, 15, 0, 0, 123456), position=1)
+    assert position_timeline.encode_timeline([sample]) is None
+
+    sample = Position(id=1, date=datetime(2023, 3, 5, 15), position=300)
+    assert position_timeline.encode_timeline([sample]) is None
+
+    assert position_timeline.encode_timeline([]) is None
+
+
+@pytest.mark.parametrize("with_timeline", [False, True])
+def test_position_pages_match_full_answer(app, driver_session, with_timeline):
+    """
+    Tests that following the page cursors returns the same positions as a
+    single request, with repeats collapsed across page boundaries.
+    """
+    with app.app_context():
+        if with_timeline:
+            position_timeline.build_position_timelines([driver_session])
+        expected = session_service.get_session_positions(driver_session)["positions"]
+
+        pages, after = [], None
+        while True:
+            page = session_service.get_session_positions_page(
+                driver_session, after, limit=1
+            )
+            pages.extend(page["positions"])
+            if not page["next_after"]:
+                break
+            after = session_service.parse_position_cursor(page["next_after"])
+
+        assert pages == expected
+        assert len(pages) == 3
+
+
+def test_stream_session_positions(app, driver_session):
+    """
+    Tests that streamed positions start after the cursor and that a missing
+    driver session gives None.
+    """
+    with app.app_context():
+        after = session_service.parse_position_cursor("2023-03-05T15:00:04Z")
+        positions = session_service.stream_session_positions(driver_session, after)
+
+        assert [p["position"] for p in positions] == [3, 1]
+        assert session_service.stream_session_positions(driver_session + 1) is None
+
+
+def test_position_page_rejects_bad_arguments(app, driver_session):
+    """
+    Tests that invalid page limits and cursors raise a ValueError.
+    """
+    with app.app_context():
+        with pytest.raises(ValueError, match="limit"):
+            session_service.get_session_positions_page(driver_session, limit=0)
+        with pytest.raises(ValueError, match="Invalid after cursor"):
+            session_service.parse_position_cursor("yesterday")
+
+
+@pytest.mark.parametrize("with_timeline", [False, True])
+def test_position_columns_match_rows(app, driver_session, with_timeline):
+    """
+    Tests that the columnar positions hold the same samples as the row
+    answer, with dates in ms since the epoch, and page like it.
+    """
+    with app.app_context():
+        if with_timeline:
+            position_timeline.build_position_timelines([driver_session])
+        rows = session_service.get_session_positions(driver_session)["positions"]
+
+        columns = session_service.get_session_position_columns(driver_session)
+        assert columns["positions"] == {
+            "id": [row["id"] for row in rows],
+            "date": [
+                position_timeline.to_epoch_ms(datetime.fromisoformat(row["date"]))
+                for row in rows
+            ],
+            "position": [4, 3, 1],
+        }
+        assert columns["next_after"] is None
+
+        page = session_service.get_session_position_columns(driver_session, limit=2)
+        assert page["positions"]["position"] == [4, 3]
+        after = session_service.parse_position_cursor(page["next_after"])
+        rest = session_service.get_session_position_columns(
+            driver_session, after, limit=2
+        )
+        assert rest["positions"]["position"] == [1]
+        assert rest["next_after"] is None
+
+
+def test_pack_columns_round_trip():
+    """
+    Tests that the binary positions format reads back the packed columns
+    and rejects values that do not fit.
+    """
+    ids, times, positions = (
+        [7, 8, 9],
+        [1678028400250, 1678029150000, 1678034701001],
+        [4, 3, 1],
+    )
+    data = position_timeline.pack_columns(12, ids, times, positions)
+
+    assert len(data) == 20 + 9 * len(ids)
+    assert position_timeline.unpack_columns(data) == (12, ids, times, positions)
+    assert position_timeline.unpack_columns(
+        position_timeline.pack_columns(12, [], [], [])
+    ) == (12, [], [], [])
+    with pytest.raises(ValueError):
+        position_timeline.pack_columns(12, [1], [0], [300])
@@ -0,0 +1,118 @@
+import asyncio
+
+import pytest
+
+from services.rate_limiter import RateLimiter, SharedTokenBucket, parse_retry_after
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def fake_time(mocker):
+    """
+    Fixture that replaces asyncio.sleep in the limiter with a fake clock that
+    advances instantly.
+    """
+    clock = _FakeClock()
+
+    async def fake_sleep(seconds):
+        clock.now += seconds
+
+    mocker.patch("services.rate_limiter.asyncio.sleep", new=fake_sleep)
+    return clock
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_spaces_requests(fake_time):
+    """
+    Tests that once the burst is spent, requests are spaced at the
+    configured rate.
+    """
+    limiter = RateLimiter(rate=2, max_in_flight=1, burst=1, clock=fake_time)
+    starts = []
+    for _ in range(3):
+        async with limiter.slot():
+            starts.append(fake_time.now)
+
+    assert starts == [0.0, 0.5, 1.0]
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_pause_blocks_all_callers(fake_time):
+    """
+    Tests that a pause delays every caller until it has elapsed.
+    """
+    limiter = RateLimiter(rate=4, max_in_flight=4, clock=fake_time)
+    limiter.pause(30)
+
+    async def request():
+        async with limiter.slot():
+            return fake_time.now
+
+    starts = await asyncio.gather(request(), request())
+
+    assert all(start >= 30 for start in starts)
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_limits_in_flight():
+    """
+    Tests that no more than max_in_flight requests hold a slot at once.
+    """
+    limiter = RateLimiter(rate=1000, max_in_flight=2, burst=1000)
+    in_flight = 0
+    peak = 0
+
+    async def request():
+        nonlocal in_flight, peak
+        async with limiter.slot():
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+    await asyncio.gather(*(request() for _ in range(6)))
+
+    assert peak == 2
+
+
+def test_rate_limiter_rejects_invalid_settings():
+    """
+    Tests that a non-positive rate or in-flight limit raises a ValueError.
+    """
+    with pytest.raises(ValueError, match="rate must be positive"):
+        RateLimiter(rate=0, max_in_flight=1)
+    with pytest.raises(ValueError, match="max_in_flight must be at least 1"):
+        RateLimiter(rate=1, max_in_flight=0)
+
+
+def test_parse_retry_after():
+    """
+    Tests parsing of delta-seconds, HTTP-date and malformed Retry-After values.
+    """
+    assert parse_retry_after("5") == 5.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_shared_token_bucket_spends_one_budget():
+    """
+    Tests that the shared bucket hands out tokens at its rate and that a
+    pause applies to every taker.
+    """
+    bucket = SharedTokenBucket(rate=2, capacity=1)
+    now = bucket.clock()
+
+    assert bucket.take(now) == 0
+    assert bucket.take(now) == 0.5
+    assert bucket.take(now + 0.5) == 0
+
+    bucket.pause(10, now + 1)
+    assert bucket.take(now + 2) == 9
@@ -0,0 +1,131 @@
+from datetime import datetime
+
+import pytest
+
+from extensions import db
+from models import Driver, Session, DriverSession, Position, PositionTimeline
+from services import position_timeline, replay_service
+
+START = datetime(2023, 3, 5, 15)
+
+
+@pytest.fixture
+def race(app):
+    """
+    Fixture that seeds a session with two drivers, one of them read from a
+    packed timeline, and cleans up afterwards.
+    """
+    with app.app_context():
+        session = Session(
+            session_key=9300,
+            session_name="Race",
+            session_type="Race",
+            date_start=START,
+            date_end=datetime(2023, 3, 5, 15, 0, 4),
+            meeting_key=1,
+            year=2023,
+        )
+        drivers = [
+            Driver(driver_number=1, full_name="Max Verstappen"),
+            Driver(driver_number=16, full_name="Charles Leclerc"),
+        ]
+        db.session.add_all([session, *drivers])
+        db.session.flush()
+        driver_sessions = [
+            DriverSession(driver_id=driver.id, session_id=session.id)
+            for driver in drivers
+        ]
+        db.session.add_all(driver_sessions)
+        db.session.flush()
+
+        samples = {
+            driver_sessions[0]: [(0, 2), (2500, 1)],
+            driver_sessions[1]: [(1000, 1), (2500, 2), (4000, 2)],
+        }
+        for driver_session, driver_samples in samples.items():
+            db.session.add_all(
+                [
+                    Position(
+                        driver_session_id=driver_session.id,
+                        date=position_timeline.from_epoch_ms(
+                            position_timeline.to_epoch_ms(START) + ms
+                        ),
+                        position=position,
+                    )
+                    for ms, position in driver_samples
+                ]
+            )
+        db.session.commit()
+        position_timeline.build_position_timelines([driver_sessions[1].id])
+
+        yield session.session_key
+
+        for model in (PositionTimeline, Position, DriverSession, Session, Driver):
+            model.query.delete()
+        db.session.commit()
+
+
+def test_get_session_replay(app, race):
+    """
+    Tests that the replay holds every driver's forward-filled position at
+    each step, whether read from Position rows or a packed timeline.
+    """
+    with app.app_context():
+        replay = replay_service.get_session_replay(race, step_ms=1000)
+
+        assert [d["driver_number"] for d in replay["drivers"]] == [1, 16]
+        assert replay["start_ms"] == position_timeline.to_epoch_ms(START)
+        assert replay["step_ms"] == 1000
+        assert replay["positions"] == [
+            [2, None],
+            [2, 1],
+            [2, 1],
+            [1, 2],
+            [1, 2],
+        ]
+
+
+def test_get_session_replay_errors(app, race):
+    """
+    Tests that unknown sessions give None and oversized replays are
+    rejected.
+    """
+    with app.app_context():
+        assert replay_service.get_session_replay(1) is None
+
+        replay_service.REPLAY_MAX_FRAMES, limit = 3, replay_service.REPLAY_MAX_FRAMES
+        try:
+            with pytest.raises(ValueError, match="step too small"):
+                replay_service.get_session_replay(race, step_ms=1000)
+        finally:
+            replay_service.REPLAY_MAX_FRAMES = limit
+
+
+def test_forward_fill():
+    """
+    Tests that forward filling keeps the last value until the next sample
+    and leaves frames before the first sample empty.
+    """
+    filled = replay_service.forward_fill([150, 300, 310], ["a", "b", "c"], 0, 100, 6)
+    assert filled == [None, None, "a", "b", "c", "c"]
+    assert replay_service.forward_fill([], [], 0, 100, 2) == [None, None]
+
+
+@pytest.mark.parametrize(
+    "value, step_ms",
+    [(None, 1000), ("1s", 1000), ("500ms", 500), ("2", 2000), ("0.5s", 500)],
+)
+def test_parse_step(value, step_ms):
+    """
+    Tests that replay steps are parsed into milliseconds.
+    """
+    assert replay_service.parse_step(value) == step_ms
+
+
+@pytest.mark.parametrize("value", ["fast", "1h", "10ms"])
+def test_parse_step_rejects_invalid(value):
+    """
+    Tests that malformed or too small replay steps raise a ValueError.
+    """
+    with pytest.raises(ValueError):
+        replay_service.parse_step(value)
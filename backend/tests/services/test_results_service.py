@@ -0,0 +1,121 @@
+from datetime import datetime
+
+import pytest
+
+from extensions import db
+from models import Driver, Session, DriverSession, Position, Lap
+from services import results_service
+
+
+@pytest.fixture
+def race(app):
+    """
+    Fixture that seeds one session with two drivers, their positions and
+    laps, and cleans up afterwards. Yields the session and driver session ids.
+    """
+    with app.app_context():
+        session = Session(
+            session_key=9100,
+            session_name="Race",
+            session_type="Race",
+            date_start=datetime(2023, 3, 5),
+            meeting_key=1,
+            year=2023,
+        )
+        drivers = [
+            Driver(driver_number=1, full_name="Max Verstappen"),
+            Driver(driver_number=44, full_name="Lewis Hamilton"),
+        ]
+        db.session.add_all([session, *drivers])
+        db.session.flush()
+        driver_sessions = [
+            DriverSession(driver_id=driver.id, session_id=session.id)
+            for driver in drivers
+        ]
+        db.session.add_all(driver_sessions)
+        db.session.flush()
+        max_id, lewis_id = [ds.id for ds in driver_sessions]
+
+        db.session.add_all(
+            [
+                Position(
+                    driver_session_id=max_id, date=datetime(2023, 3, 5, 15), position=2
+                ),
+                Position(
+                    driver_session_id=max_id, date=datetime(2023, 3, 5, 17), position=1
+                ),
+                Position(
+                    driver_session_id=lewis_id,
+                    date=datetime(2023, 3, 5, 15),
+                    position=1,
+                ),
+                Position(
+                    driver_session_id=lewis_id,
+                    date=datetime(2023, 3, 5, 17),
+                    position=2,
+                ),
+                Lap(driver_session_id=max_id, lap_number=1, lap_time=92.5),
+                Lap(driver_session_id=max_id, lap_number=2, lap_time=91.0),
+                Lap(driver_session_id=lewis_id, lap_number=1, lap_time=90.8),
+                Lap(driver_session_id=lewis_id, lap_number=2, lap_time=93.1),
+            ]
+        )
+        db.session.commit()
+
+        yield session.id, max_id, lewis_id
+
+        for model in (Position, Lap, DriverSession, Session, Driver):
+            model.query.delete()
+        db.session.commit()
+
+
+def test_derive_session_results(app, race):
+    """
+    Tests that final positions come from the last position record and the
+    fastest lap is marked on both the lap and its driver session.
+    """
+    session_id, max_id, lewis_id = race
+    with app.app_context():
+        assert results_service.derive_session_results({session_id}) == 1
+
+        max_result = db.session.get(DriverSession, max_id)
+        lewis_result = db.session.get(DriverSession, lewis_id)
+        assert max_result.final_position == 1
+        assert lewis_result.final_position == 2
+        assert max_result.fastest_lap is False
+        assert lewis_result.fastest_lap is True
+
+        fastest = Lap.query.filter_by(is_fastest=True).all()
+        assert [(lap.driver_session_id, lap.lap_number) for lap in fastest] == [
+            (lewis_id, 1)
+        ]
+
+
+def test_derive_session_results_moves_fastest_lap(app, race):
+    """
+    Tests that re-deriving after a quicker lap arrives moves the fastest lap.
+    """
+    session_id, max_id, lewis_id = race
+    with app.app_context():
+        results_service.derive_session_results({session_id})
+        db.session.add(Lap(driver_session_id=max_id, lap_number=3, lap_time=89.9))
+        db.session.commit()
+
+        results_service.derive_session_results({session_id})
+
+        assert db.session.get(DriverSession, max_id).fastest_lap is True
+        assert db.session.get(DriverSession, lewis_id).fastest_lap is False
+        assert Lap.query.filter_by(is_fastest=True).count() == 1
+
+
+def test_sessions_for_driver_sessions(app, race):
+    """
+    Tests that driver session ids are mapped to their distinct sessions.
+    """
+    session_id, max_id, lewis_id = race
+    with app.app_context():
+        assert results_service.sessions_for_driver_sessions([max_id, lewis_id]) == {
+            session_id
+        }
+        assert results_service.sessions_for_driver_sessions([]) == set()
+        assert results_service.sessions_for_year(2023) == {session_id}
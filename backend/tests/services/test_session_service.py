@@ -92,3 +92,32 @@ def test_get_session_positions_no_session_id():
     """
     with pytest.raises(ValueError, match="session_id parameter is required"):
         session_service.get_session_positions(session_id=None)
+
+
+def test_get_session_positions_collapses_repeats(mocker, app):
+    """
+    Tests that repeated samples are collapsed, so fully stored and compacted
+    sessions give the same answer.
+    """
+    with app.app_context():
+        mock_get = mocker.patch("services.session_service.db.session.get")
+        mock_get.return_value.to_dict.return_value = {"id": 1}
+
+        full, compacted = [], []
+        for second, position in enumerate([3, 3, 2, 2, 2, 1]):
+            sample = mocker.MagicMock(position=position)
+            sample.to_dict.return_value = {"second": second, "position": position}
+            full.append(sample)
+            if second in (0, 2, 5):
+                compacted.append(sample)
+
+        mock_position_query = mocker.patch("services.session_service.Position.query")
+        mock_all = mock_position_query.filter_by.return_value.order_by.return_value.all
+
+        mock_all.return_value = full
+        from_full = session_service.get_session_positions(session_id=1)
+        mock_all.return_value = compacted
+        from_compacted = session_service.get_session_positions(session_id=1)
+
+        assert from_full == from_compacted
+        assert [p["second"] for p in from_full["positions"]] == [0, 2, 5]
@@ -0,0 +1,153 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import text
+
+from extensions import db
+from models import (
+    ConstructorStats,
+    Driver,
+    DriverSession,
+    DriverSessionStats,
+    DriverStats,
+    Session,
+)
+from services import constructor_service, driver_service, standings_service
+
+
+@pytest.fixture
+def season(app):
+    """
+    Fixture that seeds two classified races in 2023 and one in 2022, and
+    cleans up afterwards.
+    """
+    with app.app_context():
+        drivers = [
+            Driver(driver_number=1, full_name="Max Verstappen", team_name="Red Bull"),
+            Driver(driver_number=11, full_name="Sergio Perez", team_name="Red Bull"),
+            Driver(driver_number=44, full_name="Lewis Hamilton", team_name="Mercedes"),
+        ]
+        sessions = [
+            Session(
+                session_key=key,
+                session_name="Race",
+                session_type="Race",
+                date_start=datetime(year, 3, day),
+                meeting_key=key,
+                year=year,
+            )
+            for key, year, day in ((9301, 2023, 5), (9302, 2023, 19), (9201, 2022, 20))
+        ]
+        db.session.add_all([*drivers, *sessions])
+        db.session.flush()
+        results = {
+            9301: {1: 1, 11: 2, 44: 3},
+            9302: {1: 2, 11: 3, 44: 1},
+            9201: {1: 3, 11: 2, 44: 1},
+        }
+        by_number = {d.driver_number: d for d in drivers}
+        for session in sessions:
+            for number, position in results[session.session_key].items():
+                db.session.add(
+                    DriverSession(
+                        driver_id=by_number[number].id,
+                        session_id=session.id,
+                        final_position=position,
+                        fastest_lap=number == 44,
+                    )
+                )
+        db.session.commit()
+
+        yield
+
+        for model in (
+            ConstructorStats,
+            DriverStats,
+            DriverSessionStats,
+            DriverSession,
+            Session,
+            Driver,
+        ):
+            model.query.delete()
+        db.session.commit()
+
+
+def test_refresh_standings(app, season):
+    """
+    Tests that a season's standings are computed from its driver sessions.
+    """
+    with app.app_context():
+        assert standings_service.refresh_standings(2023) == 3
+
+        assert DriverSessionStats.query.filter_by(year=2023).count() == 6
+        drivers = DriverStats.query.filter_by(year=2023).order_by("position").all()
+        assert [(d.driver_number, d.points, d.position) for d in drivers] == [
+            (1, 43, 1),
+            (44, 40, 2),
+            (11, 33, 3),
+        ]
+        assert drivers[0].wins == 1
+        assert drivers[1].fastest_laps == 2
+        assert drivers[2].podiums == 2
+
+        constructors = ConstructorStats.query.order_by("position").all()
+        assert [(c.team_name, c.points, c.position) for c in constructors] == [
+            ("Red Bull", 76, 1),
+            ("Mercedes", 40, 2),
+        ]
+
+
+def test_refresh_standings_only_touches_one_season(app, season):
+    """
+    Tests that refreshing a season replaces its rows and leaves others alone.
+    """
+    with app.app_context():
+        assert standings_service.refresh_all_standings() == {2022: 3, 2023: 3}
+        assert standings_service.refresh_standings(2023) == 3
+
+        assert DriverStats.query.filter_by(year=2022).count() == 3
+        assert DriverStats.query.filter_by(year=2023).count() == 3
+        assert DriverSessionStats.query.count() == 9
+
+
+def test_standings_are_ranked_per_season(app, season):
+    """
+    Tests that positions restart at 1 in every season and are served in
+    order by the year-filtered reads.
+    """
+    with app.app_context():
+        standings_service.refresh_all_standings()
+
+        drivers_2022 = driver_service.get_driver_stats(2022)
+        assert [(d["driver_number"], d["position"]) for d in drivers_2022] == [
+            (44, 1),
+            (11, 2),
+            (1, 3),
+        ]
+        constructors = constructor_service.get_constructor_standings_by_year(2022)
+        assert [(c["team_name"], c["position"]) for c in constructors] == [
+            ("Red Bull", 1),
+            ("Mercedes", 2),
+        ]
+
+
+@pytest.mark.parametrize(
+    "model, index",
+    [
+        (DriverStats, "ix_driver_stats_year_position"),
+        (ConstructorStats, "ix_constructor_stats_year_position"),
+    ],
+)
+def test_year_standings_use_year_position_index(app, model, index):
+    """
+    Tests that year-filtered standings are read through the (year, position)
+    index instead of scanning and sorting every season.
+    """
+    with app.app_context():
+        query = model.query.filter_by(year=2023).order_by(model.position)
+        sql = query.statement.compile(db.engine, compile_kwargs={"literal_binds": True})
+        plan = " ".join(
+            row[-1] for row in db.session.execute(text(f"EXPLAIN QUERY PLAN {sql}"))
+        )
+        assert index in plan
+        assert "TEMP B-TREE" not in plan
@@ -0,0 +1,976 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import text
+
+from app import create_app
+from extensions import db
+from models import (
+    Driver,
+    Session,
+    DriverSession,
+    Position,
+    Lap,
+    SyncCheckpoint,
+    YearData,
+)
+from services import sync_service
+from services.openf1_cache import ResponseCache
+from services.rate_limiter import RateLimiter
+
+
+@pytest.fixture
+def driver_session(app):
+    """
+    Fixture that seeds a single driver session and cleans up the ingest
+    tables afterwards.
+    """
+    with app.app_context():
+        driver = Driver(driver_number=44, full_name="Lewis Hamilton")
+        session = Session(
+            session_key=9000,
+            session_name="Race",
+            session_type="Race",
+            date_start=datetime(2023, 3, 5),
+            meeting_key=1,
+            year=2023,
+        )
+        db.session.add_all([driver, session])
+        db.session.flush()
+        driver_session = DriverSession(driver_id=driver.id, session_id=session.id)
+        db.session.add(driver_session)
+        db.session.commit()
+
+        yield driver_session.id
+
+        for model in (Position, Lap, DriverSession, Session, Driver):
+            model.query.delete()
+        db.session.commit()
+
+
+def _position(date, position, driver_number=44, session_key=9000):
+    return {
+        "session_key": session_key,
+        "driver_number": driver_number,
+        "date": date,
+        "position": position,
+    }
+
+
+def test_process_positions_batch_deduplicates(app, driver_session):
+    """
+    Tests that duplicate position samples are collapsed in memory and that
+    re-ingesting the same window inserts nothing.
+    """
+    positions = [
+        _position("2023-03-05T15:00:00Z", 3),
+        _position("2023-03-05T15:00:00Z", 3),
+        _position("2023-03-05T15:00:05Z", 2),
+    ]
+    with app.app_context():
+        assert sync_service._process_positions_batch(positions) == 2
+        assert sync_service._process_positions_batch(positions) == 0
+        assert Position.query.filter_by(driver_session_id=driver_session).count() == 2
+
+
+def test_process_positions_batch_keeps_only_changes(app, driver_session):
+    """
+    Tests that the changes ingest mode stores only samples where the position
+    changes, including across batches.
+    """
+    first = [
+        _position("2023-03-05T15:00:00Z", 3),
+        _position("2023-03-05T15:00:05Z", 3),
+        _position("2023-03-05T15:00:10Z", 2),
+    ]
+    second = [
+        _position("2023-03-05T15:00:15Z", 2),
+        _position("2023-03-05T15:00:20Z", 1),
+    ]
+    with app.app_context():
+        assert sync_service._process_positions_batch(first) == 2
+        assert sync_service._process_positions_batch(second) == 1
+        assert sync_service._process_positions_batch(first) == 0
+
+        stored = Position.query.order_by(Position.date).all()
+        assert [(p.date.second, p.position) for p in stored] == [
+            (0, 3),
+            (10, 2),
+            (20, 1),
+        ]
+
+
+def test_process_positions_batch_full_mode(app, driver_session, monkeypatch):
+    """
+    Tests that the full ingest mode stores every sample.
+    """
+    positions = [
+        _position("2023-03-05T15:00:00Z", 3),
+        _position("2023-03-05T15:00:05Z", 3),
+    ]
+    monkeypatch.setitem(app.config, "POSITION_STORAGE_MODE", "full")
+    with app.app_context():
+        assert sync_service._process_positions_batch(positions) == 2
+
+
+def test_compact_positions(app, driver_session):
+    """
+    Tests that compaction removes repeated samples and reports row counts.
+    """
+    samples = [3, 3, 3, 2, 2, 3]
+    with app.app_context():
+        db.session.add_all(
+            [
+                Position(
+                    driver_session_id=driver_session,
+                    date=datetime(2023, 3, 5, 15, 0, second),
+                    position=position,
+                )
+                for second, position in enumerate(samples)
+            ]
+        )
+        db.session.commit()
+
+        assert sync_service.compact_positions(2022) == (0, 0)
+        assert sync_service.compact_positions(2023) == (6, 3)
+        assert sync_service.compact_positions() == (3, 3)
+
+        stored = Position.query.order_by(Position.date).all()
+        assert [(p.date.second, p.position) for p in stored] == [
+            (0, 3),
+            (3, 2),
+            (5, 3),
+        ]
+
+
+def test_process_positions_batch_skips_unknown_driver(app, driver_session):
+    """
+    Tests that samples without a matching driver session are not inserted.
+    """
+    positions = [_position("2023-03-05T15:00:00Z", 1, driver_number=1)]
+    with app.app_context():
+        assert sync_service._process_positions_batch(positions) == 0
+        assert Position.query.count() == 0
+
+
+def test_process_laps_batch(app, driver_session):
+    """
+    Tests that laps are bulk inserted once per lap number and laps without a
+    duration are ignored.
+    """
+    laps = [
+        {
+            "session_key": 9000,
+            "driver_number": 44,
+            "lap_number": 1,
+            "lap_duration": 95.1,
+        },
+        {
+            "session_key": 9000,
+            "driver_number": 44,
+            "lap_number": 2,
+            "lap_duration": 93.4,
+        },
+        {"session_key": 9000, "driver_number": 44, "lap_number": 3},
+    ]
+    with app.app_context():
+        assert sync_service._process_laps_batch(laps) == 2
+        assert sync_service._process_laps_batch(laps) == 0
+        lap_times = [
+            lap.lap_time
+            for lap in Lap.query.filter_by(driver_session_id=driver_session)
+            .order_by(Lap.lap_number)
+            .all()
+        ]
+        assert lap_times == [95.1, 93.4]
+
+
+def test_bulk_insert_ignore_chunks(app, driver_session):
+    """
+    Tests that rows are written across several chunks.
+    """
+    rows = [
+        {
+            "driver_session_id": driver_session,
+            "date": datetime(2023, 3, 5, 15, 0, second),
+            "position": 1,
+        }
+        for second in range(10)
+    ]
+    with app.app_context():
+        assert sync_service._bulk_insert_ignore(Position, rows, chunk_size=3) == 10
+        assert Position.query.count() == 10
+
+
+def test_require_position_key(app, tmp_path):
+    """
+    Tests that syncing is refused into a position table without its
+    unique key, where resyncs would store every sample again.
+    """
+    with app.app_context():
+        sync_service._require_position_key()
+
+    legacy = create_app(
+        {"TESTING": True, "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'l.db'}"}
+    )
+    with legacy.app_context():
+        db.session.execute(
+            text(
+                "CREATE TABLE position (id INTEGER PRIMARY KEY, "
+                "driver_session_id INTEGER NOT NULL, date DATETIME NOT NULL, "
+                "position INTEGER NOT NULL)"
+            )
+        )
+        with pytest.raises(Exception, match="flask db upgrade"):
+            sync_service._require_position_key()
+
+
+@pytest.mark.asyncio
+async def test_stream_data_by_month_yields_windows(app, mocker):
+    """
+    Tests that month windows are yielded one at a time with their bounds,
+    including empty and failed months.
+    """
+    mock_fetch = mocker.patch(
+        "services.sync_service.fetch_data_async",
+        new=mocker.AsyncMock(side_effect=[[{"n": 1}], None, [{"n": 2}, {"n": 3}]]),
+    )
+    with app.app_context():
+        windows = [
+            (window[0].strftime("%Y-%m-%d"), window[1].strftime("%Y-%m-%d"), data)
+            async for window, data in sync_service.stream_data_by_month(
+                None, "position", "2023-01-01T00:00:00Z", "2023-03-15T00:00:00Z"
+            )
+        ]
+
+    assert windows == [
+        ("2023-01-01", "2023-02-01", [{"n": 1}]),
+        ("2023-02-01", "2023-03-01", None),
+        ("2023-03-01", "2023-03-15", [{"n": 2}, {"n": 3}]),
+    ]
+    assert mock_fetch.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_run_pipeline_applies_backpressure(app):
+    """
+    Tests that producers cannot run more than the queue size ahead of the
+    writer and that every window reaches the writer.
+    """
+    queue = asyncio.Queue(maxsize=1)
+    max_depth = 0
+
+    async def producer():
+        for i in range(5):
+            await queue.put(("position", str(i), [i]))
+
+    async def consumer():
+        nonlocal max_depth
+        seen = []
+        while True:
+            max_depth = max(max_depth, queue.qsize())
+            item = await queue.get()
+            if item is None:
+                return seen
+            seen.extend(item[2])
+            await asyncio.sleep(0)
+
+    with app.app_context():
+        seen = await sync_service._run_pipeline(queue, [producer()], consumer())
+
+    assert seen == [0, 1, 2, 3, 4]
+    assert max_depth <= 1
+
+
+@pytest.mark.asyncio
+async def test_run_pipeline_cancels_producers_on_writer_error(app):
+    """
+    Tests that a failing writer cancels producers blocked on a full queue.
+    """
+    queue = asyncio.Queue(maxsize=1)
+
+    async def producer():
+        while True:
+            await queue.put(("position", "2023-01", [1]))
+
+    async def consumer():
+        await queue.get()
+        raise RuntimeError("database is locked")
+
+    with app.app_context():
+        with pytest.raises(RuntimeError, match="database is locked"):
+            await sync_service._run_pipeline(queue, [producer()], consumer())
+
+
+class _FakeResponse:
+    def __init__(self, status, payload=None, headers=None):
+        self.status = status
+        self.headers = headers or {}
+        self._payload = payload
+
+    async def json(self):
+        return self._payload
+
+    async def text(self):
+        return str(self._payload)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+@pytest.mark.asyncio
+async def test_fetch_data_async_pauses_limiter_on_429(app, mocker):
+    """
+    Tests that a 429 pauses the shared limiter for the Retry-After duration
+    before the request is retried.
+    """
+    session = mocker.MagicMock()
+    session.get.side_effect = [
+        _FakeResponse(429, headers={"Retry-After": "7"}),
+        _FakeResponse(200, payload=[{"ok": True}]),
+    ]
+    limiter = RateLimiter(rate=100, max_in_flight=2)
+    mock_pause = mocker.patch.object(limiter, "pause")
+
+    with app.app_context():
+        data = await sync_service.fetch_data_async(
+            session, "drivers", {"session_key": 1}, limiter=limiter
+        )
+
+    assert data == [{"ok": True}]
+    mock_pause.assert_called_once_with(7.0)
+    assert session.get.call_count == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("status, expected", [(404, []), (500, None)])
+async def test_fetch_data_async_errors(app, mocker, status, expected):
+    """
+    Tests that a 404, OpenF1's answer to a query without results, is an
+    empty result, while other errors are a failed fetch.
+    """
+    session = mocker.MagicMock()
+    session.get.return_value = _FakeResponse(status, payload={"detail": "x"})
+
+    with app.app_context():
+        data = await sync_service.fetch_data_async(session, "laps", {})
+
+    assert data == expected
+
+
+@pytest.mark.asyncio
+async def test_stream_data_by_month_fetches_concurrently(app, mocker):
+    """
+    Tests that month windows are fetched concurrently up to the limiter's
+    in-flight limit.
+    """
+    in_flight = 0
+    peak = 0
+
+    async def fake_fetch(session, endpoint, params, limiter=None, cache=None):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return [params]
+
+    mocker.patch("services.sync_service.fetch_data_async", new=fake_fetch)
+    limiter = RateLimiter(rate=1000, max_in_flight=3)
+
+    with app.app_context():
+        months = [
+            window[0].strftime("%Y-%m")
+            async for window, _ in sync_service.stream_data_by_month(
+                None,
+                "laps",
+                "2023-01-01T00:00:00Z",
+                "2023-07-01T00:00:00Z",
+                "date_start",
+                limiter,
+            )
+        ]
+
+    assert sorted(months) == [f"2023-0{m}" for m in range(1, 7)]
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_windows_finishing_out_of_order_keep_position_changes(
+    app, mocker, driver_session
+):
+    """
+    Tests that when a later month is fetched before an earlier one, the
+    windows are still written in date order, so the first sample of the
+    later month is compared with the earlier month's last position rather
+    than an older stored one.
+    """
+    fetches = {
+        "2023-01": [_position("2023-01-20T15:00:00Z", 2)],
+        "2023-02": [_position("2023-02-05T15:00:00Z", 1)],
+    }
+
+    async def fake_fetch(session, endpoint, params, limiter=None, cache=None):
+        month = params["date>"][:7]
+        # January answers last
+        await asyncio.sleep(0.05 if month == "2023-01" else 0)
+        return fetches[month]
+
+    mocker.patch("services.sync_service.fetch_data_async", new=fake_fetch)
+    limiter = RateLimiter(rate=1000, max_in_flight=2)
+
+    with app.app_context():
+        db.session.add(
+            Position(
+                driver_session_id=driver_session,
+                date=datetime(2023, 1, 1, 15),
+                position=1,
+            )
+        )
+        db.session.commit()
+        queue = asyncio.Queue()
+        resolver = sync_service.DriverSessionResolver().load(2023)
+        await sync_service._run_pipeline(
+            queue,
+            [
+                sync_service._produce_windows(
+                    queue,
+                    None,
+                    "position",
+                    "2023-01-01T00:00:00Z",
+                    "2023-03-01T00:00:00Z",
+                    "date",
+                    limiter,
+                )
+            ],
+            sync_service._write_windows(queue, resolver),
+        )
+
+        stored = Position.query.order_by(Position.date).all()
+        assert [(p.date.month, p.position) for p in stored] == [(1, 1), (1, 2), (2, 1)]
+
+
+@pytest.mark.asyncio
+async def test_fetch_data_async_uses_response_cache(app, mocker, tmp_path):
+    """
+    Tests that a response is fetched once, then served from the cache.
+    """
+    session = mocker.MagicMock()
+    session.get.return_value = _FakeResponse(200, payload=[{"year": 2023}])
+    cache = ResponseCache(str(tmp_path))
+
+    with app.app_context():
+        first = await sync_service.fetch_data_async(
+            session, "sessions", {"year": 2023}, cache=cache
+        )
+        second = await sync_service.fetch_data_async(
+            session, "sessions", {"year": 2023}, cache=cache
+        )
+
+    assert first == second == [{"year": 2023}]
+    session.get.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_fetch_data_async_replay_miss_skips_network(app, mocker, tmp_path):
+    """
+    Tests that a replay-mode cache miss returns None without a request.
+    """
+    session = mocker.MagicMock()
+    cache = ResponseCache(str(tmp_path), mode="replay")
+
+    with app.app_context():
+        data = await sync_service.fetch_data_async(
+            session, "sessions", {"year": 2023}, cache=cache
+        )
+
+    assert data is None
+    session.get.assert_not_called()
+
+
+def test_driver_session_resolver_loads_season(app, driver_session, mocker):
+    """
+    Tests that the resolver preloads every driver session of a season and
+    answers lookups without further queries.
+    """
+    with app.app_context():
+        resolver = sync_service.DriverSessionResolver().load(2023)
+        spy = mocker.spy(db.session, "query")
+        assert len(resolver) == 1
+        assert resolver.get(9000, 44) == driver_session
+        spy.assert_not_called()
+
+
+def test_driver_session_resolver_remembers_misses(app, driver_session, mocker):
+    """
+    Tests that an unknown pair is looked up once and then remembered.
+    """
+    with app.app_context():
+        resolver = sync_service.DriverSessionResolver()
+        spy = mocker.spy(db.session, "query")
+        assert resolver.get(9000, 1) is None
+        assert resolver.get(9000, 1) is None
+        assert spy.call_count == 1
+
+        resolver.add(9000, 1, 123)
+        assert resolver.get(9000, 1) == 123
+
+
+def test_process_driver_sessions_registers_with_resolver(app, driver_session):
+    """
+    Tests that new driver sessions are added to the shared resolver.
+    """
+    with app.app_context():
+        db.session.add(Driver(driver_number=1, full_name="Max Verstappen"))
+        db.session.commit()
+        resolver = sync_service.DriverSessionResolver()
+
+        sync_service._process_driver_sessions(
+            [
+                {"session_key": 9000, "driver_number": 1},
+                {"session_key": 9000, "driver_number": 44},
+            ],
+            resolver,
+        )
+
+        new_id = DriverSession.query.filter(DriverSession.id != driver_session).one()
+        assert resolver.get(9000, 1) == new_id.id
+        assert resolver.get(9000, 44) == driver_session
+
+
+def test_process_drivers_reports_upsert_counts(app, driver_session, mocker):
+    """
+    Tests that drivers are inserted, updated or left unchanged and that
+    unchanged rows issue no UPDATE.
+    """
+    drivers = [
+        {"driver_number": 44, "full_name": "Lewis Hamilton", "team_name": "Ferrari"},
+        {"driver_number": 1, "full_name": "Max Verstappen", "team_name": "Red Bull"},
+        {"driver_number": 1, "country_code": "NED"},
+    ]
+    with app.app_context():
+        counts = sync_service._process_drivers(drivers)
+        assert counts == {"inserted": 1, "updated": 1, "unchanged": 0}
+        assert Driver.query.filter_by(driver_number=44).one().team_name == "Ferrari"
+        assert Driver.query.filter_by(driver_number=1).one().country_code == "NED"
+
+        spy = mocker.spy(sync_service, "update")
+        counts = sync_service._process_drivers(drivers)
+        assert counts == {"inserted": 0, "updated": 0, "unchanged": 2}
+        spy.assert_not_called()
+
+
+def test_process_sessions_is_idempotent(app, driver_session):
+    """
+    Tests that re-processing identical session data changes nothing, even
+    though stored datetimes come back naive.
+    """
+    sessions = [
+        {
+            "session_key": 9000,
+            "session_name": "Race",
+            "session_type": "Race",
+            "date_start": "2023-03-05T00:00:00+00:00",
+            "meeting_key": 1,
+            "location": None,
+        },
+        {
+            "session_key": 9001,
+            "session_name": "Qualifying",
+            "session_type": "Qualifying",
+            "date_start": "2023-03-04T15:00:00Z",
+            "date_end": "2023-03-04T16:00:00Z",
+            "meeting_key": 1,
+            "location": "Sakhir",
+        },
+    ]
+    with app.app_context():
+        counts = sync_service._process_sessions(sessions, 2023)
+        assert counts == {"inserted": 1, "updated": 0, "unchanged": 1}
+        counts = sync_service._process_sessions(sessions, 2023)
+        assert counts == {"inserted": 0, "updated": 0, "unchanged": 2}
+        stored = Session.query.filter_by(session_key=9001).one()
+        assert stored.location == "Sakhir"
+        assert stored.date_end == datetime(2023, 3, 4, 16)
+
+
+def test_process_sessions_fills_date_end(app, driver_session):
+    """
+    Tests that sessions stored without an end time get OpenF1's when
+    their data is processed again.
+    """
+    sessions = [
+        {
+            "session_key": 9000,
+            "session_name": "Race",
+            "session_type": "Race",
+            "date_start": "2023-03-05T00:00:00+00:00",
+            "date_end": "2023-03-05T02:00:00+00:00",
+            "meeting_key": 1,
+            "location": None,
+        }
+    ]
+    with app.app_context():
+        assert Session.query.filter_by(session_key=9000).one().date_end is None
+        counts = sync_service._process_sessions(sessions, 2023)
+        assert counts == {"inserted": 0, "updated": 1, "unchanged": 0}
+        stored = Session.query.filter_by(session_key=9000).one()
+        assert stored.date_end == datetime(2023, 3, 5, 2)
+
+
+def test_sync_progress_updates_year_data(app, mocker):
+    """
+    Tests that progress updates are written to YearData and forwarded to
+    the callback, and that window progress spans the given range.
+    """
+    with app.app_context():
+        year_data = YearData(year=2023)
+        db.session.add(year_data)
+        db.session.commit()
+        on_update = mocker.MagicMock()
+        progress = sync_service.SyncProgress(year_data, on_update)
+
+        progress.update("Fetching sessions", 5)
+        advance = progress.windows("Syncing positions and laps", 4, 20, 60)
+        advance()
+        advance()
+
+        assert year_data.sync_progress == 40
+        assert year_data.sync_message == "Syncing positions and laps"
+        on_update.assert_any_call("Fetching sessions", 5)
+        on_update.assert_called_with("Syncing positions and laps", 40)
+
+        db.session.delete(year_data)
+        db.session.commit()
+
+
+@pytest.mark.asyncio
+async def test_write_windows_checkpoints_fetched_windows(app, driver_session):
+    """
+    Tests that written windows are checkpointed with their row count and
+    payload hash, while failed fetches are not and are reported instead.
+    """
+    january = (datetime(2023, 1, 1, tzinfo=timezone.utc), datetime(2023, 2, 1))
+    february = (datetime(2023, 2, 1), datetime(2023, 3, 1))
+    queue = asyncio.Queue()
+    await queue.put(("position", january, [_position("2023-01-05T15:00:00Z", 1)]))
+    await queue.put(("laps", february, None))
+    await queue.put(None)
+
+    with app.app_context():
+        failed = []
+        inserted = await sync_service._write_windows(
+            queue, sync_service.DriverSessionResolver(), year=2023, failed=failed
+        )
+        checkpoints = SyncCheckpoint.query.all()
+
+        assert inserted == {"position": 1, "laps": 0}
+        assert failed == [("laps", february)]
+        assert len(checkpoints) == 1
+        assert checkpoints[0].endpoint == "position"
+        assert checkpoints[0].window_start == datetime(2023, 1, 1)
+        assert checkpoints[0].row_count == 1
+        assert len(checkpoints[0].payload_hash) == 64
+        assert sync_service._load_checkpoints(2023)["position"] == {
+            (datetime(2023, 1, 1), datetime(2023, 2, 1))
+        }
+
+        assert sync_service.clear_checkpoints(2023) == 1
+        assert SyncCheckpoint.query.count() == 0
+
+
+@pytest.mark.asyncio
+async def test_write_windows_tracks_changed_driver_sessions(app, driver_session):
+    """
+    Tests that only windows which inserted rows mark driver sessions changed.
+    """
+    window = (datetime(2023, 3, 1), datetime(2023, 4, 1))
+    positions = [_position("2023-03-05T15:00:00Z", 1)]
+
+    with app.app_context():
+        for expected in ({driver_session}, set()):
+            queue = asyncio.Queue()
+            await queue.put(("position", window, positions))
+            await queue.put(None)
+            changed = set()
+            await sync_service._write_windows(
+                queue, sync_service.DriverSessionResolver(), changed=changed
+            )
+            assert changed == expected
+
+
+def test_derive_results_for_changed_sessions(app, driver_session):
+    """
+    Tests that results are derived for the sessions of changed driver sessions.
+    """
+    with app.app_context():
+        db.session.add_all(
+            [
+                Position(
+                    driver_session_id=driver_session,
+                    date=datetime(2023, 3, 5, 15),
+                    position=3,
+                ),
+                Lap(driver_session_id=driver_session, lap_number=1, lap_time=90.1),
+            ]
+        )
+        db.session.commit()
+
+        assert sync_service._derive_results(set()) == 0
+        assert sync_service._derive_results({driver_session}) == 1
+
+        result = db.session.get(DriverSession, driver_session)
+        assert result.final_position == 3
+        assert result.fastest_lap is True
+
+
+@pytest.mark.asyncio
+async def test_stream_data_by_month_skips_checkpointed_windows(app, mocker):
+    """
+    Tests that checkpointed windows are not fetched again.
+    """
+    mock_fetch = mocker.patch(
+        "services.sync_service.fetch_data_async",
+        new=mocker.AsyncMock(return_value=[]),
+    )
+    skip = {(datetime(2023, 1, 1), datetime(2023, 2, 1))}
+    with app.app_context():
+        months = [
+            window[0].strftime("%Y-%m")
+            async for window, _ in sync_service.stream_data_by_month(
+                None,
+                "laps",
+                "2023-01-01T00:00:00Z",
+                "2023-03-01T00:00:00Z",
+                "date_start",
+                skip=skip,
+            )
+        ]
+
+    assert months == ["2023-02"]
+    assert mock_fetch.await_count == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("fails", [False, True])
+async def test_run_sync_for_year_invalidates_api_cache(app, mocker, fails):
+    """
+    Tests that a finished sync invalidates the season's cached responses,
+    whether or not it succeeded.
+    """
+    mocker.patch(
+        "services.sync_service._fetch_and_process_data",
+        new=mocker.AsyncMock(
+            return_value={}, side_effect=Exception("boom") if fails else None
+        ),
+    )
+    mocker.patch("services.sync_service.clear_checkpoints")
+    mock_invalidate = mocker.patch("services.sync_service.invalidate_year")
+
+    with app.app_context():
+        if fails:
+            with pytest.raises(Exception, match="boom"):
+                await sync_service.run_sync_for_year(2019)
+        else:
+            await sync_service.run_sync_for_year(2019)
+        YearData.query.filter_by(year=2019).delete()
+        db.session.commit()
+
+    mock_invalidate.assert_called_once_with(2019)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("bundle_fails", [False, True])
+async def test_run_sync_for_year_stores_bundle(app, mocker, bundle_fails):
+    """
+    Tests that a successful sync prebuilds the season bundle once its cached
+    responses are invalidated, and still completes if that fails.
+    """
+    mocker.patch(
+        "services.sync_service._fetch_and_process_data",
+        new=mocker.AsyncMock(return_value={}),
+    )
+    mocker.patch("services.sync_service.clear_checkpoints")
+    calls = mocker.Mock()
+    calls.store.side_effect = Exception("boom") if bundle_fails else None
+    mocker.patch("services.sync_service.invalidate_year", new=calls.invalidate)
+    mocker.patch("services.sync_service.store_season_bundle", new=calls.store)
+
+    with app.app_context():
+        result = await sync_service.run_sync_for_year(2019)
+        year_data = YearData.query.filter_by(year=2019).one()
+        assert year_data.sync_status == "completed"
+        db.session.delete(year_data)
+        db.session.commit()
+
+    assert result["success"]
+    assert calls.mock_calls == [mocker.call.invalidate(2019), mocker.call.store(2019)]
+
+
+@pytest.mark.asyncio
+async def test_run_sync_for_year_with_failed_windows(app, mocker):
+    """
+    Tests that a sync with windows that could not be fetched is marked
+    incomplete and keeps its checkpoints and incremental start, so the next
+    sync fetches only the missing windows.
+    """
+    mocker.patch(
+        "services.sync_service._fetch_and_process_data",
+        new=mocker.AsyncMock(return_value={"failed_windows": 2}),
+    )
+    mock_clear = mocker.patch("services.sync_service.clear_checkpoints")
+    mocker.patch("services.sync_service.invalidate_year")
+    mocker.patch("services.sync_service.store_season_bundle")
+    last_incremental_sync = datetime(2019, 6, 1)
+
+    with app.app_context():
+        db.session.add(YearData(year=2019, last_incremental_sync=last_incremental_sync))
+        db.session.commit()
+
+        result = await sync_service.run_sync_for_year(2019)
+        year_data = YearData.query.filter_by(year=2019).one()
+        assert year_data.sync_status == "incomplete"
+        assert "2 windows" in year_data.sync_message
+        assert year_data.last_incremental_sync == last_incremental_sync
+        db.session.delete(year_data)
+        db.session.commit()
+
+    assert not result["success"]
+    assert result["status"] == "incomplete"
+    mock_clear.assert_not_called()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("heartbeat", [None, datetime(2020, 1, 1)])
+async def test_run_sync_for_year_resumes_interrupted_sync(app, mocker, heartbeat):
+    """
+    Tests that a sync left in progress by a process that died is resumed by
+    the next sync, which fetches only the windows without a checkpoint.
+    """
+    fetched = []
+
+    async def fake_fetch(session, endpoint, params, limiter=None, cache=None):
+        if endpoint == "sessions":
+            return [
+                {
+                    "session_key": 9901,
+                    "session_name": "Race",
+                    "session_type": "Race",
+                    "date_start": "2019-03-17T05:10:00Z",
+                    "meeting_key": 1,
+                }
+            ]
+        if endpoint == "drivers":
+            return [{"driver_number": 44, "full_name": "Lewis Hamilton"}]
+        fetched.append((endpoint, params))
+        return []
+
+    mocker.patch("services.sync_service.fetch_data_async", new=fake_fetch)
+    mocker.patch("services.sync_service.invalidate_year")
+    mocker.patch("services.sync_service.store_season_bundle")
+    windows = sync_service._month_windows(
+        "2019-01-01T00:00:00+00:00", "2019-12-31T23:59:59+00:00"
+    )
+
+    with app.app_context():
+        db.session.add(
+            YearData(year=2019, sync_status="in_progress", sync_heartbeat=heartbeat)
+        )
+        for endpoint in ("position", "laps"):
+            for window in windows[:-1]:
+                sync_service._record_checkpoint(2019, endpoint, window, [])
+
+        result = await sync_service.run_sync_for_year(2019)
+
+        assert result["status"] == "completed"
+        assert SyncCheckpoint.query.count() == 0
+        YearData.query.filter_by(year=2019).delete()
+        db.session.commit()
+        for model in (DriverSession, Session, Driver):
+            model.query.delete()
+        db.session.commit()
+
+    assert sorted(endpoint for endpoint, _ in fetched) == ["laps", "position"]
+    assert {next(iter(params.values()))[:7] for _, params in fetched} == {"2019-12"}
+
+
+@pytest.mark.asyncio
+async def test_run_sync_for_year_rejects_live_sync(app):
+    """
+    Tests that a sync still beating is not started a second time.
+    """
+    with app.app_context():
+        db.session.add(
+            YearData(
+                year=2019, sync_status="in_progress", sync_heartbeat=datetime.utcnow()
+            )
+        )
+        db.session.commit()
+
+        with pytest.raises(Exception, match="already in progress"):
+            await sync_service.run_sync_for_year(2019)
+
+        YearData.query.filter_by(year=2019).delete()
+        db.session.commit()
+
+
+@pytest.mark.asyncio
+async def test_replayed_season_with_empty_windows_completes(
+    app, mocker, monkeypatch, tmp_path
+):
+    """
+    Tests that a season synced with months OpenF1 has no data for, which it
+    answers with a 404, can be synced again from the replay cache alone.
+    """
+
+    def respond(url, params=None):
+        endpoint = url.rsplit("/", 1)[-1]
+        if endpoint == "sessions":
+            return _FakeResponse(
+                200,
+                payload=[
+                    {
+                        "session_key": 9902,
+                        "session_name": "Race",
+                        "session_type": "Race",
+                        "date_start": "2019-03-17T05:10:00Z",
+                        "meeting_key": 1,
+                    }
+                ],
+            )
+        if endpoint == "drivers":
+            return _FakeResponse(
+                200, payload=[{"driver_number": 44, "full_name": "Lewis Hamilton"}]
+            )
+        return _FakeResponse(404, payload={"detail": "No results found."})
+
+    session = mocker.MagicMock()
+    session.get.side_effect = respond
+    client = mocker.MagicMock()
+    client.__aenter__ = mocker.AsyncMock(return_value=session)
+    client.__aexit__ = mocker.AsyncMock(return_value=False)
+    mocker.patch("services.sync_service.aiohttp.ClientSession", return_value=client)
+    mocker.patch("services.sync_service.invalidate_year")
+    mocker.patch("services.sync_service.store_season_bundle")
+    monkeypatch.setitem(app.config, "OPENF1_CACHE_DIR", str(tmp_path))
+    monkeypatch.setitem(app.config, "OPENF1_REQUESTS_PER_SECOND", 1000)
+
+    with app.app_context():
+        monkeypatch.setitem(app.config, "OPENF1_CACHE_MODE", "readwrite")
+        first = await sync_service.run_sync_for_year(2019)
+        requests = session.get.call_count
+
+        monkeypatch.setitem(app.config, "OPENF1_CACHE_MODE", "replay")
+        replayed = await sync_service.run_sync_for_year(2019)
+
+        YearData.query.filter_by(year=2019).delete()
+        for model in (DriverSession, Session, Driver):
+            model.query.delete()
+        db.session.commit()
+
+    assert first["status"] == replayed["status"] == "completed"
+    assert session.get.call_count == requests
@@ -0,0 +1,55 @@
+from datetime import datetime, timezone
+
+from benchmarks.timestamps import decode_batched, decode_per_record, make_window
+from services.timestamps import TimestampDecoder, parse_timestamp
+
+
+def test_parse_timestamp_normalizes_to_utc():
+    """
+    Tests that both UTC suffixes and naive values parse to the same instant.
+    """
+    expected = datetime(2023, 3, 5, 15, 0, 0, 123000, tzinfo=timezone.utc)
+    assert parse_timestamp("2023-03-05T15:00:00.123Z") == expected
+    assert parse_timestamp("2023-03-05T15:00:00.123+00:00") == expected
+    assert parse_timestamp("2023-03-05T15:00:00.123") == expected
+    assert parse_timestamp("2023-03-05T15:00:00.123").tzinfo is not None
+
+
+def test_decode_many_parses_each_value_once(mocker):
+    """
+    Tests that repeated timestamps are parsed once and returned in order.
+    """
+    parse = mocker.patch(
+        "services.timestamps.parse_timestamp", side_effect=parse_timestamp
+    )
+    decoder = TimestampDecoder()
+    values = ["2023-03-05T15:00:01Z", "2023-03-05T15:00:00Z"] * 3
+
+    decoded = decoder.decode_many(values)
+
+    assert [dt.second for dt in decoded] == [1, 0] * 3
+    assert parse.call_count == 2
+    assert decoder.decode("2023-03-05T15:00:00Z") is decoded[1]
+    assert parse.call_count == 2
+
+
+def test_decoder_is_bounded():
+    """
+    Tests that the decoder starts over instead of growing past its limit.
+    """
+    decoder = TimestampDecoder(max_size=2)
+    decoder.decode_many(["2023-03-05T15:00:00Z", "2023-03-05T15:00:01Z"])
+    decoder.decode("2023-03-05T15:00:02Z")
+    assert len(decoder) == 1
+
+    decoded = decoder.decode_many(["2023-03-05T15:00:03Z", "2023-03-05T15:00:04Z"])
+    assert [dt.second for dt in decoded] == [3, 4]
+    assert len(decoder) == 2
+
+
+def test_benchmark_paths_agree():
+    """
+    Tests that the benchmarked decoder matches the per-record parse.
+    """
+    values = make_window(drivers=3, samples=50)
+    assert decode_batched(values) == decode_per_record(values)
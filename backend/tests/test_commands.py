@@ -0,0 +1,232 @@
+from concurrent.futures import Future
+
+from commands import f1_cli, _format_summary_line
+
+
+class _InlineExecutor:
+    """Stands in for ProcessPoolExecutor and runs submissions inline."""
+
+    def __init__(self, *args, **kwargs):
+        self.kwargs = kwargs
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+
+def _summary(year, status="completed", **extra):
+    return {
+        "year": year,
+        "status": status,
+        "seconds": 2.0,
+        "rows": {"positions": 300, "laps": 100},
+        **extra,
+    }
+
+
+def test_backfill_command(mocker, app):
+    """
+    Tests that backfill syncs every year in the range and prints a summary.
+    """
+    mocker.patch("commands.ProcessPoolExecutor", new=_InlineExecutor)
+    mock_backfill_year = mocker.patch(
+        "commands._backfill_year", side_effect=lambda year: _summary(year)
+    )
+    runner = app.test_cli_runner()
+
+    result = runner.invoke(
+        f1_cli, ["backfill", "--from", "2023", "--to", "2025", "--workers", "2"]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert [c.args[0] for c in mock_backfill_year.call_args_list] == [2023, 2024, 2025]
+    assert "Backfilling 2023-2025 with 2 workers..." in result.output
+    assert "200 rows/sec" in result.output
+
+
+def test_backfill_command_reports_failures(mocker, app):
+    """
+    Tests that backfill exits with an error naming the seasons that failed.
+    """
+    mocker.patch("commands.ProcessPoolExecutor", new=_InlineExecutor)
+    mocker.patch(
+        "commands._backfill_year",
+        side_effect=lambda year: _summary(year, "error", error="boom", rows={}),
+    )
+    runner = app.test_cli_runner()
+
+    result = runner.invoke(f1_cli, ["backfill", "--from", "2024", "--to", "2024"])
+
+    assert result.exit_code == 1
+    assert "Sync failed for: 2024" in result.output
+
+
+def test_backfill_command_rejects_reversed_range(app):
+    """
+    Tests that backfill rejects a range that ends before it starts.
+    """
+    runner = app.test_cli_runner()
+    result = runner.invoke(f1_cli, ["backfill", "--from", "2025", "--to", "2018"])
+    assert result.exit_code == 2
+    assert "--from must not be after --to" in result.output
+
+
+def test_derive_results_command(mocker, app):
+    """
+    Tests that derive-results derives every session of the season, then
+    refreshes its standings and rebuilds its bundle.
+    """
+    mocker.patch("commands.sessions_for_year", return_value={1, 2})
+    mock_derive = mocker.patch("commands.derive_session_results", return_value=2)
+    mock_refresh = mocker.patch("commands.refresh_standings", return_value=20)
+    mock_invalidate = mocker.patch("commands.invalidate_year")
+    mock_store = mocker.patch("commands.store_season_bundle")
+    runner = app.test_cli_runner()
+
+    result = runner.invoke(f1_cli, ["derive-results", "--year", "2023"])
+
+    assert result.exit_code == 0, result.output
+    mock_derive.assert_called_once_with({1, 2})
+    mock_refresh.assert_called_once_with(2023)
+    mock_invalidate.assert_called_once_with(2023)
+    mock_store.assert_called_once_with(2023)
+    assert "Derived results for 2 sessions in 2023" in result.output
+    assert "2023: 20 drivers in the standings" in result.output
+
+
+def test_compact_positions_command(mocker, app):
+    """
+    Tests that compact-positions reports rows before and after compaction.
+    """
+    mock_compact = mocker.patch("commands.compact_positions", return_value=(1200, 300))
+    runner = app.test_cli_runner()
+
+    result = runner.invoke(f1_cli, ["compact-positions", "--year", "2023"])
+
+    assert result.exit_code == 0, result.output
+    mock_compact.assert_called_once_with(2023)
+    assert "Position rows for 2023: 1,200 before, 300 after" in result.output
+    assert "Removed 900 rows (75.0%)" in result.output
+
+
+def test_build_timelines_command(mocker, app):
+    """
+    Tests that build-timelines rebuilds timelines and reports how many.
+    """
+    mock_build = mocker.patch("commands.build_position_timelines", return_value=0)
+    runner = app.test_cli_runner()
+
+    result = runner.invoke(f1_cli, ["build-timelines", "--year", "2023"])
+
+    assert result.exit_code == 0, result.output
+    mock_build.assert_called_once()
+    assert "Built 0 position timelines" in result.output
+
+
+def test_refresh_standings_command(mocker, app):
+    """
+    Tests that refresh-standings rebuilds every season when no year is
+    given and invalidates each of them.
+    """
+    mocker.patch("commands.refresh_all_standings", return_value={2022: 20, 2023: 22})
+    mocker.patch("commands.db.session.query").return_value = [(2022,), (2023,)]
+    mock_invalidate = mocker.patch("commands.invalidate_year")
+    runner = app.test_cli_runner()
+
+    result = runner.invoke(f1_cli, ["refresh-standings"])
+
+    assert result.exit_code == 0, result.output
+    assert mock_invalidate.call_args_list == [mocker.call(2022), mocker.call(2023)]
+    assert "2022: 20 drivers in the standings" in result.output
+    assert "2023: 22 drivers in the standings" in result.output
+
+
+def test_format_summary_line():
+    """
+    Tests the per-year throughput line.
+    """
+    line = _format_summary_line(_summary(2023))
+    assert line.startswith("2023  completed")
+    assert "300 positions" in line
+    assert "100 laps" in line
+    assert "200 rows/sec" in line
+
+
+def test_refresh_overview_command(mocker, app):
+    """
+    Tests that refresh-overview rebuilds only the given season.
+    """
+    mock_refresh = mocker.patch(
+        "commands.refresh_season_summary",
+        return_value={"total_sessions": 24, "total_drivers": 20},
+    )
+    runner = app.test_cli_runner()
+
+    result = runner.invoke(f1_cli, ["refresh-overview", "--year", "2023"])
+
+    assert result.exit_code == 0, result.output
+    mock_refresh.assert_called_once_with(2023)
+    assert "2023: 24 sessions, 20 drivers" in result.output
+
+
+def test_refresh_sessions_command(mocker, app):
+    """
+    Tests that refresh-sessions re-fetches the given season's sessions and
+    invalidates it.
+    """
+    mock_refresh = mocker.patch(
+        "commands.refresh_sessions",
+        new=mocker.AsyncMock(return_value={"inserted": 0, "updated": 22}),
+    )
+    mock_invalidate = mocker.patch("commands.invalidate_year")
+    runner = app.test_cli_runner()
+
+    result = runner.invoke(f1_cli, ["refresh-sessions", "--year", "2023"])
+
+    assert result.exit_code == 0, result.output
+    mock_refresh.assert_awaited_once_with(2023)
+    mock_invalidate.assert_called_once_with(2023)
+    assert "2023: 22 sessions updated, 0 added" in result.output
+
+
+def test_export_static_command(mocker, app, tmp_path):
+    """
+    Tests that export-static reports the seasons it rendered and skipped.
+    """
+    mock_export = mocker.patch(
+        "commands.export_static",
+        return_value={"exported": [2024], "skipped": [2023], "removed": [], "files": 9},
+    )
+    runner = app.test_cli_runner()
+
+    result = runner.invoke(f1_cli, ["export-static", str(tmp_path)])
+
+    assert result.exit_code == 0, result.output
+    mock_export.assert_called_once_with(str(tmp_path), force=False)
+    assert "Exported: 2024" in result.output
+    assert "Skipped: 2023" in result.output
+    assert f"Wrote 9 files to {tmp_path}" in result.output
+
+
+def test_export_static_command_warns_without_brotli(mocker, app, tmp_path):
+    """
+    Tests that export-static warns when it cannot write brotli copies.
+    """
+    mocker.patch(
+        "commands.export_static",
+        return_value={"exported": [], "skipped": [], "removed": [], "files": 0},
+    )
+    mocker.patch("commands.export_encodings", return_value=["gzip"])
+    runner = app.test_cli_runner()
+
+    result = runner.invoke(f1_cli, ["export-static", str(tmp_path)])
+
+    assert result.exit_code == 0, result.output
+    assert "brotli package is not installed" in result.stderr
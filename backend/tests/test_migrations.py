@@ -0,0 +1,90 @@
+import os
+
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from flask_migrate import upgrade
+from sqlalchemy import create_engine, inspect, text
+
+from app import create_app
+from extensions import db
+from models import Driver
+
+MIGRATIONS = os.path.join(os.path.dirname(os.path.dirname(__file__)), "migrations")
+
+
+def _upgrade(uri):
+    """Runs every migration on a database and returns the app bound to it."""
+    app = create_app({"TESTING": True, "SQLALCHEMY_DATABASE_URI": uri})
+    with app.app_context():
+        upgrade(directory=MIGRATIONS)
+    return app
+
+
+def _schema_diff(app):
+    with app.app_context(), db.engine.connect() as connection:
+        return compare_metadata(MigrationContext.configure(connection), db.metadata)
+
+
+def test_migrations_build_the_model_schema(tmp_path):
+    """
+    Tests that upgrading an empty database builds the schema of the models.
+    """
+    app = _upgrade(f"sqlite:///{tmp_path / 'fresh.db'}")
+
+    assert _schema_diff(app) == []
+
+
+def test_migrations_upgrade_a_create_all_database(tmp_path):
+    """
+    Tests that a database created by create_all before migrations, with
+    the standings as views, is brought to the schema of the models.
+    """
+    uri = f"sqlite:///{tmp_path / 'legacy.db'}"
+    engine = create_engine(uri)
+    Driver.__table__.create(engine)
+    with engine.begin() as connection:
+        connection.execute(
+            text("INSERT INTO driver (driver_number, full_name) VALUES (1, 'Max')")
+        )
+        connection.execute(text("CREATE VIEW driver_stats AS SELECT id FROM driver"))
+    engine.dispose()
+
+    app = _upgrade(uri)
+
+    assert _schema_diff(app) == []
+    with app.app_context():
+        assert inspect(db.engine).get_view_names() == []
+        assert db.session.execute(text("SELECT count(*) FROM driver")).scalar() == 1
+
+
+def test_migrations_remove_duplicate_positions(tmp_path):
+    """
+    Tests that position samples stored twice before the unique key existed
+    are reduced to one before the key is created.
+    """
+    uri = f"sqlite:///{tmp_path / 'duplicates.db'}"
+    engine = create_engine(uri)
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "CREATE TABLE position (id INTEGER NOT NULL PRIMARY KEY, "
+                "driver_session_id INTEGER NOT NULL "
+                "REFERENCES driver_session (id), date DATETIME NOT NULL, "
+                "position INTEGER NOT NULL)"
+            )
+        )
+        connection.execute(
+            text(
+                "INSERT INTO position (driver_session_id, date, position) VALUES "
+                "(1, '2023-03-05 15:00:00', 2), (1, '2023-03-05 15:00:00', 2), "
+                "(1, '2023-03-05 15:00:01', 1), (2, '2023-03-05 15:00:00', 3)"
+            )
+        )
+    engine.dispose()
+
+    app = _upgrade(uri)
+
+    with app.app_context():
+        rows = db.session.execute(text("SELECT id FROM position ORDER BY id"))
+        assert [row.id for row in rows] == [1, 3, 4]
+        assert _schema_diff(app) == []
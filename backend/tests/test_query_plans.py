@@ -0,0 +1,256 @@
+import re
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from extensions import db
+from models import (
+    ConstructorStats,
+    Driver,
+    DriverSession,
+    DriverSessionStats,
+    DriverStats,
+    Lap,
+    Position,
+    PositionTimeline,
+    SeasonBundle,
+    SeasonSummary,
+    Session,
+    YearData,
+)
+from services import (
+    bundle_service,
+    constructor_service,
+    driver_service,
+    export_service,
+    overview_service,
+    position_timeline,
+    replay_service,
+    results_service,
+    session_service,
+    standings_service,
+    sync_service,
+    year_service,
+)
+
+# A plan step reading every row of a table, directly or in index order,
+# rather than searching an index
+FULL_SCAN = re.compile(r"^SCAN (\w+)(?: USING (?:COVERING )?INDEX \w+)?$")
+
+# A table named in a FROM or JOIN clause, with its alias if it has one
+TABLE_REFERENCE = re.compile(r"\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?", re.I)
+
+START = datetime(2023, 3, 5, 15)
+
+
+@pytest.fixture(scope="module")
+def seeded(app):
+    """
+    Fixture that seeds two seasons of sessions, positions and laps, with
+    standings and one packed timeline, and cleans up afterwards.
+    """
+    with app.app_context():
+        drivers = [
+            Driver(driver_number=number, full_name=f"Driver {number}", is_active=True)
+            for number in (1, 11, 44)
+        ]
+        sessions = [
+            Session(
+                session_key=key,
+                session_name="Race",
+                session_type="Race",
+                date_start=START.replace(year=year),
+                meeting_key=key,
+                year=year,
+            )
+            for key, year in ((9401, 2023), (9402, 2022))
+        ]
+        db.session.add_all([*drivers, *sessions, YearData(year=2023)])
+        db.session.flush()
+        driver_sessions = [
+            DriverSession(driver_id=driver.id, session_id=session.id)
+            for driver in drivers
+            for session in sessions
+        ]
+        db.session.add_all(driver_sessions)
+        db.session.flush()
+        for place, driver_session in enumerate(driver_sessions):
+            db.session.add_all(
+                [
+                    Position(
+                        driver_session_id=driver_session.id,
+                        date=START + timedelta(seconds=second),
+                        position=(place + second) % 3 + 1,
+                    )
+                    for second in range(5)
+                ]
+                + [
+                    Lap(
+                        driver_session_id=driver_session.id,
+                        lap_number=lap,
+                        lap_time=90.0 + place + lap,
+                    )
+                    for lap in (1, 2)
+                ]
+            )
+        db.session.commit()
+        for session in sessions:
+            results_service.derive_session_results([session.id])
+            standings_service.refresh_standings(session.year)
+        position_timeline.build_position_timelines([driver_sessions[0].id])
+
+        yield [driver_session.id for driver_session in driver_sessions]
+
+        for model in (
+            ConstructorStats,
+            DriverStats,
+            DriverSessionStats,
+            SeasonBundle,
+            SeasonSummary,
+            PositionTimeline,
+            Lap,
+            Position,
+            DriverSession,
+            Session,
+            Driver,
+            YearData,
+        ):
+            model.query.delete()
+        db.session.commit()
+
+
+def _capture_statements(call):
+    """Runs a call and returns the statements it sent, with their parameters."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not executemany:
+            statements.append((statement, parameters))
+
+    engine = db.engine
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        call()
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    return statements
+
+
+def _full_scans(statement, parameters):
+    """
+    Returns the tables a statement's query plan reads in full. Scans of
+    subqueries are left out, as they read rows already narrowed down.
+    """
+    tables = {name: name for name in db.metadata.tables}
+    for table, alias in TABLE_REFERENCE.findall(statement):
+        if table in db.metadata.tables and alias:
+            tables.setdefault(alias, table)
+
+    plan = db.session.connection().exec_driver_sql(
+        f"EXPLAIN QUERY PLAN {statement}", parameters
+    )
+    scans = {match[1] for row in plan if (match := FULL_SCAN.match(row[-1]))}
+    return {tables[name] for name in scans if name in tables}
+
+
+# Service calls and the tables each may read in full: only calls that
+# return every row of a table by design are allowed any full scan
+SERVICE_CALLS = {
+    "drivers": (lambda ids: driver_service.get_driver_stats(2023), set()),
+    "driver": (lambda ids: driver_service.get_driver_stats(2023, 1), set()),
+    "driver sessions": (
+        lambda ids: driver_service.get_driver_session_stats(2023, 1),
+        set(),
+    ),
+    "driver session": (
+        lambda ids: driver_service.get_driver_session_stats_by_session(
+            2023, 1, session_name="Race"
+        ),
+        set(),
+    ),
+    "constructors": (
+        lambda ids: constructor_service.get_constructors_by_year(2023),
+        set(),
+    ),
+    "constructor": (
+        lambda ids: constructor_service.get_constructor_details(2023, "Red Bull"),
+        set(),
+    ),
+    "constructor standings": (
+        lambda ids: constructor_service.get_constructor_standings_by_year(2023),
+        set(),
+    ),
+    "season sessions": (lambda ids: session_service.get_all_sessions(2023), set()),
+    "all sessions": (lambda ids: session_service.get_all_sessions(), {"session"}),
+    "positions from timeline": (
+        lambda ids: session_service.get_session_positions(ids[0]),
+        set(),
+    ),
+    "positions from rows": (
+        lambda ids: session_service.get_session_positions(ids[1]),
+        set(),
+    ),
+    "position page": (
+        lambda ids: session_service.get_session_positions_page(
+            ids[1], START + timedelta(seconds=1), 2
+        ),
+        set(),
+    ),
+    "position columns": (
+        lambda ids: session_service.get_session_position_columns(ids[1]),
+        set(),
+    ),
+    "replay": (lambda ids: replay_service.get_session_replay(9401), set()),
+    "season overview": (lambda ids: overview_service.get_stats_summary(2023), set()),
+    "overview": (
+        lambda ids: overview_service.get_stats_summary(),
+        {"driver", "session", "driver_session"},
+    ),
+    "refresh overview": (
+        lambda ids: overview_service.refresh_season_summary(2023),
+        {"driver", "session", "driver_session"},
+    ),
+    "stored overview": (lambda ids: overview_service.get_stats_summary(2023), set()),
+    "season bundle": (
+        lambda ids: bundle_service.store_season_bundle(2023),
+        {"year_data"},
+    ),
+    "season export": (lambda ids: export_service.season_urls(2023), set()),
+    "years": (
+        lambda ids: year_service.get_available_years_with_details(),
+        {"year_data"},
+    ),
+    "season version": (lambda ids: year_service.get_data_version(2023), set()),
+    "derive results": (
+        lambda ids: results_service.derive_session_results(
+            results_service.sessions_for_year(2023)
+        ),
+        set(),
+    ),
+    "refresh standings": (lambda ids: standings_service.refresh_standings(2023), set()),
+    "driver session resolver": (
+        lambda ids: sync_service.DriverSessionResolver().load(2023),
+        set(),
+    ),
+    "build timelines": (
+        lambda ids: position_timeline.build_position_timelines(ids[:2]),
+        set(),
+    ),
+}
+
+
+@pytest.mark.parametrize("name", SERVICE_CALLS)
+def test_service_queries_use_indexes(app, seeded, name):
+    """
+    Tests that no query a service call sends reads a whole table, other than
+    those the call returns in full.
+    """
+    call, allowed = SERVICE_CALLS[name]
+    with app.app_context():
+        statements = _capture_statements(lambda: call(seeded))
+
+        assert statements
+        for statement, parameters in statements:
+            if statement.lstrip().upper().startswith(("SELECT", "WITH", "UPDATE")):
+                assert _full_scans(statement, parameters) <= allowed, statement
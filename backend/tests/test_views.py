@@ -0,0 +1,26 @@
+from sqlalchemy import create_engine, inspect, text
+
+from app import create_app
+from extensions import db
+
+
+def test_create_all_replaces_legacy_views(tmp_path):
+    """
+    Tests that create_all drops the old standings views and creates the
+    standings tables in their place.
+    """
+    uri = f"sqlite:///{tmp_path / 'legacy.db'}"
+    engine = create_engine(uri)
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE driver (id INTEGER PRIMARY KEY)"))
+        connection.execute(text("CREATE VIEW driver_stats AS SELECT id FROM driver"))
+    engine.dispose()
+
+    app = create_app({"TESTING": True, "SQLALCHEMY_DATABASE_URI": uri})
+    with app.app_context():
+        db.create_all()
+        inspector = inspect(db.engine)
+
+        assert inspector.get_view_names() == []
+        assert "driver_stats" in inspector.get_table_names()
+        assert "position" in [c["name"] for c in inspector.get_columns("driver_stats")]
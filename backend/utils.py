@@ -1,3 +1,10 @@
+from datetime import timezone
+
+from flask import current_app, g, request
+
+from services.year_service import get_current_data_version
+
+
 def add_cors_headers(bp):
     @bp.after_request
     def after_request(response):
@@ -9,3 +16,60 @@ def add_cors_headers(bp):
         return response
 
     return bp
+
+
+def add_conditional_get(bp, versioned=True):
+    """
+    Adds ETag and Last-Modified validators to a blueprint's GET responses.
+
+    With ``versioned``, validators come from the sync state of the season
+    in the ``year`` URL variable or query arg, so a matching
+    If-None-Match or If-Modified-Since is answered with 304 before the
+    view runs any query. Otherwise the ETag is a hash of the response
+    body, which only saves bandwidth.
+    """
+
+    @bp.before_request
+    def check_validators():
+        if request.method not in ("GET", "HEAD") or not versioned:
+            return None
+
+        view_args = request.view_args or {}
+        year = view_args.get("year", request.args.get("year", type=int))
+        etag, last_modified = get_current_data_version(year)
+        if last_modified:
+            last_modified = last_modified.replace(tzinfo=timezone.utc, microsecond=0)
+        g.data_version = (etag, last_modified)
+
+        if request.if_none_match:
+            not_modified = request.if_none_match.contains_weak(etag)
+        else:
+            since = request.if_modified_since
+            not_modified = bool(since and last_modified and last_modified <= since)
+        if not_modified:
+            return current_app.response_class(status=304)
+        return None
+
+    @bp.after_request
+    def add_validators(response):
+        version = g.pop("data_version", None)
+        if version:
+            if response.status_code in (200, 304):
+                _set_validators(response, *version)
+            return response
+        if (
+            request.method in ("GET", "HEAD")
+            and response.status_code == 200
+            and not response.is_streamed
+        ):
+            response.add_etag(weak=True)
+            response.make_conditional(request)
+        return response
+
+    return bp
+
+
+def _set_validators(response, etag, last_modified):
+    response.set_etag(etag, weak=True)
+    if last_modified:
+        response.last_modified = last_modified
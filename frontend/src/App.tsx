@@ -45,7 +45,8 @@ const App: React.FC = () => {
         }
 
         if (shouldSync) {
-          await F1DataService.syncData(currentYear);
+          const job = await F1DataService.syncData(currentYear);
+          await F1DataService.waitForSyncJob(job.id);
           // Refresh years after sync
           const updatedYears = await F1DataService.getAvailableYears();
           setAvailableYears(updatedYears);
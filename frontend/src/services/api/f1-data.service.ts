@@ -3,7 +3,7 @@ import {
   Driver,
   Session,
   Overview,
-  SyncResult,
+  SyncJob,
   SyncStatus,
   Constructor,
   DriverSession,
@@ -55,12 +55,40 @@ export class F1DataService extends BaseApiService {
     return this.request(`${API_CONFIG.ENDPOINTS.CONSTRUCTORS}${params}`);
   }
 
-  static async syncData(year: number): Promise<SyncResult> {
+  static async syncData(year: number): Promise<SyncJob> {
     return this.request(`${API_CONFIG.ENDPOINTS.SYNC}/data/${year}`, {
       method: 'POST',
     });
   }
 
+  static async getSyncJob(jobId: number): Promise<SyncJob> {
+    return this.request(`${API_CONFIG.ENDPOINTS.SYNC}/jobs/${jobId}`);
+  }
+
+  static async waitForSyncJob(
+    jobId: number,
+    pollIntervalMs = 2000,
+    stalledAfterMs = 20 * 60 * 1000
+  ): Promise<SyncJob> {
+    // Gives up on a job whose phase and progress stop changing, in case
+    // the server never reports it finished
+    let job = await this.getSyncJob(jobId);
+    let lastState = '';
+    let lastChange = Date.now();
+    while (job.status === 'queued' || job.status === 'running') {
+      const state = `${job.status}:${job.phase}:${job.progress}`;
+      if (state !== lastState) {
+        lastState = state;
+        lastChange = Date.now();
+      } else if (Date.now() - lastChange > stalledAfterMs) {
+        throw new Error(`Sync job ${jobId} stopped making progress`);
+      }
+      await new Promise((resolve) => setTimeout(resolve, pollIntervalMs));
+      job = await this.getSyncJob(jobId);
+    }
+    return job;
+  }
+
   static async getSyncStatus(year: number): Promise<SyncStatus> {
     return this.request(`${API_CONFIG.ENDPOINTS.SYNC}/status/${year}`);
   }
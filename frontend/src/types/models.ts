@@ -79,7 +79,7 @@ export interface SyncResponse {
 }
 
 export interface SyncStatus {
-  status: 'not_started' | 'in_progress' | 'completed' | 'error';
+  status: 'not_started' | 'in_progress' | 'completed' | 'incomplete' | 'error';
   progress: number;
   message: string;
   last_synced: string | null;
@@ -97,9 +97,16 @@ export interface Overview {
   } | null;
 }
 
-export interface SyncResult {
-  cached: boolean;
-  drivers_processed: number;
-  sessions_processed: number;
-  status: 'not_started' | 'in_progress' | 'completed' | 'error';
+export interface SyncJob {
+  id: number;
+  year: number;
+  status: 'queued' | 'running' | 'completed' | 'incomplete' | 'error';
+  phase: string | null;
+  progress: number;
+  message: string | null;
+  row_counts: Record<string, unknown> | null;
+  created_at: string | null;
+  started_at: string | null;
+  finished_at: string | null;
+  duration_seconds: number | null;
 }